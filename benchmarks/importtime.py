@@ -0,0 +1,98 @@
+#!/usr/bin/env -S uv run
+import json
+import subprocess
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+
+BUDGET = Path(__file__).parent / 'importtime.json'
+
+STATEMENTS = [
+    'import cfdi',
+    'import cfdi.v40.catalogos',
+    'from cfdi.v40 import CFDI40',
+    'from cfdi import parse_cfdi',
+    'import cfdi.v40.pdf',
+]
+
+
+def import_times(
+    statement: str,
+    /,
+) -> dict[str, int]:
+    """
+    Runs `statement` in a fresh interpreter with `-X importtime`, returns the cumulative microseconds of every
+    top level import.
+    """
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _, cumulative, name = line.split('|')
+        if not cumulative.strip().isdigit():
+            continue
+        # nested imports are indented
+        if name.startswith('  '):
+            continue
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def measure(
+    statement: str,
+    /,
+    *,
+    repeat: int,
+) -> int:
+    startup = import_times('pass')
+    totals = []
+    for _ in range(repeat):
+        times = import_times(statement)
+        totals.append(
+            sum(value for name, value in times.items() if name not in startup)
+        )
+    return min(totals)
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    parser.add_argument(
+        '-u',
+        '--update',
+        action='store_true',
+        help='record the current times, plus headroom, as the new budget',
+    )
+    parser.add_argument('--headroom', type=float, default=1.5)
+    args = parser.parse_args()
+
+    budget: dict[str, int] = json.loads(BUDGET.read_text()) if BUDGET.exists() else {}
+    results = {
+        statement: measure(statement, repeat=args.repeat) for statement in STATEMENTS
+    }
+
+    over_budget = False
+    print(f'{"statement":<32}{"time":>12}{"budget":>12}')
+    for statement, value in results.items():
+        limit = budget.get(statement)
+        status = ''
+        if limit is not None and value > limit:
+            status = '  OVER BUDGET'
+            over_budget = True
+        limit_text = f'{limit / 1000:.1f}ms' if limit is not None else '-'
+        print(f'{statement:<32}{value / 1000:>10.1f}ms{limit_text:>12}{status}')
+
+    if args.update:
+        budget = {
+            statement: int(value * args.headroom)
+            for statement, value in results.items()
+        }
+        BUDGET.write_text(json.dumps(budget, indent=2) + '\n')
+    elif over_budget:
+        sys.exit(1)
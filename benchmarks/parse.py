@@ -0,0 +1,55 @@
+#!/usr/bin/env -S uv run
+from argparse import ArgumentParser
+from pathlib import Path
+from timeit import Timer
+
+from pydantic import ValidationError
+
+from cfdi import parse_cfdi
+from cfdi.utils import get_cfdi_version
+from cfdi.v40 import CFDI40
+
+SAMPLES = Path(__file__).parent.parent / 'tests' / 'samples' / 'v40'
+
+
+def parse_cfdi_twice(
+    xml: bytes,
+    /,
+) -> CFDI40 | None:
+    # previous ingestion path: the version check and the model parse the same bytes
+    match get_cfdi_version(xml):
+        case '4.0':
+            return CFDI40.from_xml(xml)
+
+
+def measure(
+    func,
+    xml: bytes,
+    /,
+    *,
+    number: int,
+    repeat: int,
+) -> float:
+    timer = Timer(lambda: func(xml))
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument('-n', '--number', type=int, default=200)
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f'{"sample":<20}{"two parses":>14}{"single parse":>14}{"speedup":>10}')
+    for sample in sorted(SAMPLES.glob('*.xml')):
+        xml = sample.read_bytes()
+        try:
+            parse_cfdi(xml)
+        except ValidationError:
+            print(f'{sample.name:<20}{"invalid, skipped":>38}')
+            continue
+        before = measure(parse_cfdi_twice, xml, number=args.number, repeat=args.repeat)
+        after = measure(parse_cfdi, xml, number=args.number, repeat=args.repeat)
+        print(
+            f'{sample.name:<20}{before * 1e6:>12.1f}us{after * 1e6:>12.1f}us{before / after:>9.2f}x'
+        )
@@ -0,0 +1,251 @@
+#!/usr/bin/env -S uv run
+import json
+import platform
+import sys
+from argparse import ArgumentParser
+from collections.abc import Callable
+from pathlib import Path
+from timeit import Timer
+
+from lxml import etree
+
+from cfdi import parse_cfdi
+from cfdi.corpus import enlarge
+from cfdi.utils import get_cfdi_version
+from cfdi.v40 import CFDI40, catalogos
+from cfdi.v40.cadena import cadena_original_from_xml, cadena_original_from_xslt
+from cfdi.v40.descriptions import MappingDescriptionProvider
+
+SAMPLE = Path(__file__).parent.parent / 'tests' / 'samples' / 'v40' / 'uber.xml'
+
+type Case = Callable[[bytes], Callable[[], object]]
+
+
+def get_corpus(
+    *,
+    sizes: list[int],
+) -> dict[str, bytes]:
+    """
+    Offline, deterministic corpus: the stamped sample enlarged to every number of conceptos in `sizes`.
+    """
+    xml = SAMPLE.read_bytes()
+    # the sample has a single concepto
+    return {
+        f'uber-{size}': etree.tostring(enlarge(xml, times=size - 1)) for size in sizes
+    }
+
+
+def get_model(
+    xml: bytes,
+    /,
+) -> CFDI40:
+    cfdi = parse_cfdi(xml)
+    assert cfdi is not None
+    return cfdi
+
+
+def bench_get_cfdi_version(
+    xml: bytes,
+    /,
+) -> Callable[[], object]:
+    return lambda: get_cfdi_version(xml)
+
+
+def bench_parse_cfdi(
+    xml: bytes,
+    /,
+) -> Callable[[], object]:
+    return lambda: parse_cfdi(xml)
+
+
+def bench_parse_cfdi_trusted(
+    xml: bytes,
+    /,
+) -> Callable[[], object]:
+    return lambda: parse_cfdi(xml, trusted=True)
+
+
+def bench_to_xml(
+    xml: bytes,
+    /,
+) -> Callable[[], object]:
+    cfdi = get_model(xml)
+    return lambda: cfdi.to_xml()
+
+
+def bench_cadena_original_tfd(
+    xml: bytes,
+    /,
+) -> Callable[[], object]:
+    cfdi = get_model(xml)
+    assert cfdi.complemento and cfdi.complemento.timbre_fiscal_digital
+    tfd = cfdi.complemento.timbre_fiscal_digital
+    return lambda: tfd.cadena_original
+
+
+def bench_cadena_original(
+    xml: bytes,
+    /,
+) -> Callable[[], object]:
+    tree = etree.fromstring(xml)
+    return lambda: cadena_original_from_xml(tree)
+
+
+def bench_cadena_original_model(
+    xml: bytes,
+    /,
+) -> Callable[[], object]:
+    cfdi = get_model(xml)
+    return lambda: cfdi.cadena_original
+
+
+def bench_cadena_original_xslt(
+    xml: bytes,
+    /,
+) -> Callable[[], object]:
+    # the reference the native builders are measured against
+    tree = etree.fromstring(xml)
+    return lambda: cadena_original_from_xslt(tree)
+
+
+def bench_catalogos(
+    xml: bytes,
+    /,
+) -> Callable[[], object]:
+    # every catalog key found in the document, as the validation builds them
+    cfdi = get_model(xml)
+    values = [
+        (catalogos.TipoDeComprobante, str(cfdi.tipo_de_comprobante)),
+        (catalogos.Moneda, str(cfdi.moneda)),
+        (catalogos.RegimenFiscal, str(cfdi.emisor.regimen_fiscal)),
+        (catalogos.UsoCFDI, str(cfdi.receptor.uso_cfdi)),
+    ]
+    for concepto in cfdi.conceptos:
+        values.append((catalogos.ClaveUnidad, str(concepto.clave_unidad)))
+        values.append((catalogos.ObjetoImp, str(concepto.objeto_imp)))
+        if concepto.impuestos is not None:
+            for traslado in concepto.impuestos.traslados:
+                values.append((catalogos.Impuesto, str(traslado.impuesto)))
+                values.append((catalogos.TipoFactor, str(traslado.tipo_factor)))
+    return lambda: [catalogo(value) for catalogo, value in values]
+
+
+def bench_generate_pdf(
+    xml: bytes,
+    /,
+) -> Callable[[], object]:
+    from cfdi.sinks import BufferSink
+    from cfdi.v40.pdf import generate_pdf, get_catalog_keys
+
+    # local stand-in of the catalog table
+    cfdi = get_model(xml)
+    provider = MappingDescriptionProvider(
+        {key: f'{key[0]} {key[1]}' for key in get_catalog_keys(cfdi)},
+    )
+    return lambda: generate_pdf(cfdi, BufferSink(), provider=provider)
+
+
+CASES: dict[str, Case] = {
+    'get_cfdi_version': bench_get_cfdi_version,
+    'parse_cfdi': bench_parse_cfdi,
+    'parse_cfdi_trusted': bench_parse_cfdi_trusted,
+    'to_xml': bench_to_xml,
+    'cadena_original_tfd': bench_cadena_original_tfd,
+    'cadena_original': bench_cadena_original,
+    'cadena_original_model': bench_cadena_original_model,
+    'cadena_original_xslt': bench_cadena_original_xslt,
+    'catalogos': bench_catalogos,
+    'generate_pdf': bench_generate_pdf,
+}
+
+
+def measure(
+    func: Callable[[], object],
+    /,
+    *,
+    repeat: int,
+    min_time: float,
+) -> tuple[float, int]:
+    """
+    Returns the best time per call over `repeat` rounds, each round lasting at least `min_time` seconds.
+    """
+    timer = Timer(func)
+    number, elapsed = timer.autorange()
+    # scale the calls per round to the requested duration
+    number = max(1, int(number * min_time / max(elapsed, 1e-9)))
+    return min(timer.repeat(repeat=repeat, number=number)) / number, number
+
+
+def compare(
+    results: dict[str, float],
+    baseline: dict[str, float],
+    /,
+    *,
+    threshold: float,
+) -> bool:
+    """
+    Prints the ratio of every result against the baseline, returns whether any of them regressed past `threshold`.
+    """
+    regressed = False
+    print(f'{"benchmark":<40}{"baseline":>12}{"current":>12}{"ratio":>9}')
+    for name, value in results.items():
+        before = baseline.get(name)
+        if before is None:
+            print(f'{name:<40}{"-":>12}{value * 1e6:>10.1f}us')
+            continue
+        ratio = value / before
+        status = ''
+        if ratio > threshold:
+            status = '  REGRESSION'
+            regressed = True
+        print(
+            f'{name:<40}{before * 1e6:>10.1f}us{value * 1e6:>10.1f}us{ratio:>8.2f}x{status}'
+        )
+    return regressed
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument(
+        '-k', '--cases', nargs='+', choices=list(CASES), default=list(CASES)
+    )
+    parser.add_argument('-s', '--sizes', type=int, nargs='+', default=[1, 100, 1000])
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    parser.add_argument('-t', '--min-time', type=float, default=0.2)
+    parser.add_argument('-o', '--output', type=Path, help='save the results as json')
+    parser.add_argument(
+        '-c', '--compare', type=Path, help='json results to compare against'
+    )
+    parser.add_argument(
+        '--threshold',
+        type=float,
+        default=1.2,
+        help='slowdown ratio reported as a regression',
+    )
+    args = parser.parse_args()
+
+    corpus = get_corpus(sizes=args.sizes)
+    results: dict[str, float] = {}
+    print(f'{"benchmark":<40}{"time":>12}{"calls":>10}')
+    for case in args.cases:
+        for document, xml in corpus.items():
+            name = f'{case}[{document}]'
+            value, number = measure(
+                CASES[case](xml), repeat=args.repeat, min_time=args.min_time
+            )
+            results[name] = value
+            print(f'{name:<40}{value * 1e6:>10.1f}us{number:>10}')
+
+    if args.output:
+        report = {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'results': results,
+        }
+        args.output.write_text(json.dumps(report, indent=2) + '\n')
+
+    if args.compare:
+        print()
+        baseline = json.loads(args.compare.read_text())['results']
+        if compare(results, baseline, threshold=args.threshold):
+            sys.exit(1)
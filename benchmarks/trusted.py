@@ -0,0 +1,48 @@
+#!/usr/bin/env -S uv run
+from argparse import ArgumentParser
+from collections.abc import Callable
+from pathlib import Path
+from timeit import Timer
+
+from lxml import etree
+
+from cfdi import parse_cfdi
+from cfdi.corpus import enlarge
+
+SAMPLE = Path(__file__).parent.parent / 'tests' / 'samples' / 'v40' / 'uber.xml'
+
+
+def bench_parse_cfdi(
+    xml: bytes,
+    /,
+    *,
+    trusted: bool,
+) -> Callable[[], object]:
+    return lambda: parse_cfdi(xml, trusted=trusted)
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument(
+        '-c', '--conceptos', type=int, nargs='+', default=[1, 100, 1000, 5000]
+    )
+    parser.add_argument('-r', '--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f'{"conceptos":>10}{"validated":>14}{"trusted":>14}{"speedup":>10}')
+    for conceptos in args.conceptos:
+        # the sample has a single concepto
+        xml = etree.tostring(enlarge(SAMPLE.read_bytes(), times=conceptos - 1))
+        assert parse_cfdi(xml, trusted=True) == parse_cfdi(xml)
+        number = max(1, 2000 // conceptos)
+        validated = (
+            min(Timer(bench_parse_cfdi(xml, trusted=False)).repeat(args.repeat, number))
+            / number
+        )
+        trusted = (
+            min(Timer(bench_parse_cfdi(xml, trusted=True)).repeat(args.repeat, number))
+            / number
+        )
+        print(
+            f'{conceptos:>10}{validated * 1e3:>12.2f}ms{trusted * 1e3:>12.2f}ms{validated / trusted:>9.2f}x'
+        )
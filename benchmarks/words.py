@@ -0,0 +1,51 @@
+#!/usr/bin/env -S uv run
+from argparse import ArgumentParser
+from decimal import Decimal
+from random import Random
+from timeit import Timer
+
+from num2words import num2words
+
+from cfdi.words import amount_to_words
+
+
+def format_with_num2words(
+    decimal: Decimal,
+    /,
+) -> str:
+    # the previous implementation of `cfdi.v40.pdf.format_as_words`
+    pesos, centavos = divmod(decimal, 1)
+    pesos_as_words = num2words(pesos, lang='es').upper()
+    centavos = int(centavos * 100)
+    return f'{pesos_as_words} PESOS CON {centavos:02d}/100 MXN'
+
+
+if __name__ == '__main__':
+    parser = ArgumentParser()
+    parser.add_argument('-n', '--amounts', type=int, default=10_000)
+    parser.add_argument('-d', '--distinct', type=int, default=500)
+    parser.add_argument('-r', '--repeat', type=int, default=3)
+    parser.add_argument('-s', '--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    # invoices share totals, subscriptions and fixed fees
+    random = Random(args.seed)
+    distinct = [
+        Decimal(random.randrange(1, 10_000_000)) / 100 for _ in range(args.distinct)
+    ]
+    amounts = [random.choice(distinct) for _ in range(args.amounts)]
+
+    uncached = amount_to_words.__wrapped__
+    cases = {
+        'num2words': lambda: [format_with_num2words(amount) for amount in amounts],
+        'uncached': lambda: [uncached(amount, 'MXN') for amount in amounts],
+        'cached': lambda: [amount_to_words(amount, 'MXN') for amount in amounts],
+    }
+
+    print(f'{"formatter":>10}{"per amount":>14}{"speedup":>10}')
+    baseline = None
+    for name, case in cases.items():
+        amount_to_words.cache_clear()
+        elapsed = min(Timer(case).repeat(args.repeat, 1)) / args.amounts
+        baseline = baseline or elapsed
+        print(f'{name:>10}{elapsed * 1e6:>12.2f}us{baseline / elapsed:>9.2f}x')
@@ -1,5 +1,6 @@
 #!/usr/bin/env -S uv run
 import ast
+import sqlite3
 from argparse import ArgumentParser, ArgumentTypeError
 from pathlib import Path
 from typing import Any, Callable, Generator, TypedDict
@@ -8,9 +9,8 @@ import astor
 from boto3 import resource
 from openpyxl import Workbook, load_workbook
 
-from cfdi.v40.pdf import Catalogo
-
-dynamodb = resource('dynamodb')
+from cfdi.corpus import write_corpus
+from cfdi.v40.descriptions import CATALOGOS_FILE, Catalogo
 
 
 class CreateEnum(TypedDict):
@@ -515,8 +515,7 @@ def create_enums(
     package_init.touch(exist_ok=True)
 
     workbook = load_workbook(workbook_file)
-    enums: list[str] = []
-    imports: list[ast.stmt] = []
+    modules: dict[str, str] = {}
     for enum in ENUMS:
         enum_values = extract_data(
             min_row=enum['min_row'],
@@ -534,28 +533,59 @@ def create_enums(
             enum_value_as_name=enum['enum_value_as_name'],
         )
 
-        imprt = ast.ImportFrom(
-            module=enum['module_name'],
-            names=[
-                ast.alias(
-                    name=enum['enum_name'],
-                ),
-            ],
-            level=1,
-        )
-
         module_path = catalogos_module / f'{enum["module_name"]}.py'
         with open(module_path, 'w') as f:
             f.write(source_code)
 
-        enums.append(enum['enum_name'])
-        imports.append(imprt)
+        modules[enum['enum_name']] = enum['module_name']
 
-    # import enums
-    init_module = ast.Module(body=imports)
-    init_source_code = astor.to_source(init_module)
+    # import enums lazily
     with open(catalogos_module / '__init__.py', 'w', encoding='utf-8') as f:
-        f.write(init_source_code)
+        f.write(create_catalogos_init(modules))
+
+
+def create_catalogos_init(
+    modules: dict[str, str],
+    /,
+) -> str:
+    type_checking_imports = ''.join(
+        f'    from .{module_name} import {enum_name}\n'
+        for enum_name, module_name in modules.items()
+    )
+    modules_map = ''.join(
+        f"    '{enum_name}': '{module_name}',\n"
+        for enum_name, module_name in modules.items()
+    )
+    names = ''.join(f"    '{enum_name}',\n" for enum_name in modules)
+    return (
+        'from importlib import import_module as _import_module\n'
+        'from typing import TYPE_CHECKING as _TYPE_CHECKING\n'
+        '\n'
+        'if _TYPE_CHECKING:\n'
+        f'{type_checking_imports}'
+        '\n'
+        '_MODULES = {\n'
+        f'{modules_map}'
+        '}\n'
+        '\n'
+        '__all__ = [\n'
+        f'{names}'
+        ']\n'
+        '\n'
+        '\n'
+        'def __getattr__(\n'
+        '    name: str,\n'
+        '    /,\n'
+        ') -> type:\n'
+        '    # catalogs are only imported when first used, some of them are huge\n'
+        '    try:\n'
+        '        module = _MODULES[name]\n'
+        '    except KeyError:\n'
+        "        raise AttributeError(f'module {__name__!r} has no attribute {name!r}') from None\n"
+        "    value = getattr(_import_module(f'.{module}', __name__), name)\n"
+        '    globals()[name] = value\n'
+        '    return value\n'
+    )
 
 
 def extract_codigos_postales(
@@ -615,13 +645,9 @@ def extract_municipios(
     )
 
 
-def create_database(
-    workbook_file: Path,
-    table_name: str,
-):
-    table = dynamodb.Table(table_name)
-    workbook = load_workbook(workbook_file)
-
+def extract_database_items(
+    workbook: Workbook,
+) -> Generator[dict[str, str | None]]:
     for entry in DATABASE:
         values = extract_data(
             min_row=entry['min_row'],
@@ -629,13 +655,24 @@ def create_database(
             workbook=workbook,
             worksheet=entry['worksheet'],
         )
-        data = (dict(zip(entry['keys'], v)) for v in values)
-        with table.batch_writer() as batch:
-            for item in data:
-                item['pk'] = entry['pk']
-                if entry['formatter'] is not None:
-                    item['sk'] = entry['formatter'](item['sk'])
-                batch.put_item(Item=item)
+        for value in values:
+            item = dict(zip(entry['keys'], value))
+            item['pk'] = entry['pk']
+            if entry['formatter'] is not None:
+                item['sk'] = entry['formatter'](item['sk'])
+            yield item
+
+
+def create_database(
+    workbook_file: Path,
+    table_name: str,
+):
+    table = resource('dynamodb').Table(table_name)
+    workbook = load_workbook(workbook_file)
+
+    with table.batch_writer() as batch:
+        for item in extract_database_items(workbook):
+            batch.put_item(Item=item)
 
     # too heavy
     # postal_code_keys = (
@@ -714,6 +751,36 @@ def create_database(
     #             batch.put_item(Item=item)
 
 
+def create_catalog(
+    workbook_file: Path,
+    output: Path,
+):
+    workbook = load_workbook(workbook_file)
+
+    output.unlink(missing_ok=True)
+    connection = sqlite3.connect(output)
+    with connection:
+        connection.execute(
+            'CREATE TABLE catalogos ('
+            'pk TEXT NOT NULL, '
+            'sk TEXT NOT NULL, '
+            'name TEXT NOT NULL, '
+            'PRIMARY KEY (pk, sk)'
+            ') WITHOUT ROWID'
+        )
+        connection.executemany(
+            'INSERT OR REPLACE INTO catalogos (pk, sk, name) VALUES (?, ?, ?)',
+            (
+                (item['pk'], item['sk'], item['name'])
+                for item in extract_database_items(workbook)
+                if item['name'] is not None
+            ),
+        )
+    # compact the file, it is shipped with the package
+    connection.execute('VACUUM')
+    connection.close()
+
+
 def file(
     filename: str,
 ) -> Path:
@@ -745,6 +812,17 @@ if __name__ == '__main__':
     dynamodb_parser.add_argument('-w', '--workbook', type=file, required=True)
     dynamodb_parser.add_argument('-t', '--table-name', type=str, required=True)
 
+    catalog_parser = action.add_parser('generate-catalog')
+    catalog_parser.add_argument('-w', '--workbook', type=file, required=True)
+    catalog_parser.add_argument('-o', '--output', type=Path, default=CATALOGOS_FILE)
+
+    corpus_parser = action.add_parser('generate-corpus')
+    corpus_parser.add_argument('-o', '--output', type=Path, required=True)
+    corpus_parser.add_argument('-n', '--documents', type=int, required=True)
+    corpus_parser.add_argument('-s', '--seed', type=int, default=0)
+    corpus_parser.add_argument('-c', '--conceptos', type=int, nargs=2, default=[1, 10])
+    corpus_parser.add_argument('-j', '--workers', type=int, default=None)
+
     args = parser.parse_args()
 
     match args.action:
@@ -758,3 +836,16 @@ if __name__ == '__main__':
                 workbook_file=args.workbook,
                 table_name=args.table_name,
             )
+        case 'generate-catalog':
+            create_catalog(
+                workbook_file=args.workbook,
+                output=args.output,
+            )
+        case 'generate-corpus':
+            write_corpus(
+                args.output,
+                args.documents,
+                seed=args.seed,
+                conceptos=tuple(args.conceptos),
+                workers=args.workers,
+            )
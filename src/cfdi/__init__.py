@@ -1,5 +1,44 @@
+from importlib import import_module as _import_module
 from pathlib import Path as _Path
+from typing import TYPE_CHECKING as _TYPE_CHECKING
 
-from .utils import parse_cfdi
+if _TYPE_CHECKING:
+    from .bulk import ParseError, parse_many, parse_zip
+    from .pool import TaskError
+    from .utils import CFDIHeader, parse_cfdi, scan_cfdi
 
 _PACKAGE_ROOT = _Path(__file__).parent
+
+_MODULES = {
+    'ParseError': 'bulk',
+    'TaskError': 'pool',
+    'parse_many': 'bulk',
+    'parse_zip': 'bulk',
+    'CFDIHeader': 'utils',
+    'parse_cfdi': 'utils',
+    'scan_cfdi': 'utils',
+}
+
+__all__ = [
+    'ParseError',
+    'TaskError',
+    'parse_many',
+    'parse_zip',
+    'CFDIHeader',
+    'parse_cfdi',
+    'scan_cfdi',
+]
+
+
+def __getattr__(
+    name: str,
+    /,
+):
+    # the models are only imported when first used
+    try:
+        module = _MODULES[name]
+    except KeyError:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}') from None
+    value = getattr(_import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
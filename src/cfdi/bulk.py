@@ -0,0 +1,95 @@
+from collections.abc import Iterable, Iterator
+from functools import partial
+from pathlib import Path
+from typing import IO
+from zipfile import ZipFile
+
+from cfdi.pool import TaskError, flatten_error, pool_map
+from cfdi.utils import parse_cfdi
+from cfdi.v40 import CFDI40
+
+# the error of a document that could not be parsed
+ParseError = TaskError
+
+
+def parse_or_error(
+    xml: bytes | Path,
+    /,
+    *,
+    trusted: bool = False,
+) -> CFDI40 | None | ParseError:
+    try:
+        return parse_cfdi(xml, trusted=trusted)
+    except Exception as e:
+        return flatten_error(e)
+
+
+def parse_keyed[K](
+    item: tuple[K, bytes | Path],
+    /,
+    *,
+    trusted: bool = False,
+) -> tuple[K, CFDI40 | None | ParseError]:
+    key, xml = item
+    return key, parse_or_error(xml, trusted=trusted)
+
+
+def parse_many(
+    xmls: Iterable[bytes | Path],
+    /,
+    *,
+    workers: int | None = None,
+    chunksize: int = 1,
+    ordered: bool = True,
+    trusted: bool = False,
+) -> Iterator[tuple[int, CFDI40 | None | ParseError]]:
+    """
+    Parses many documents with `parse_cfdi` over a process pool.
+
+    Yields `(index, result)` pairs, where `index` is the position of the document in `xmls` and `result` is the
+    parsed `CFDI40`, `None` for documents that are not a CFDI v4.0, or a `ParseError`. Errors are returned, never
+    raised. Paths are read by the workers, so only the path is sent across processes. `trusted` is forwarded to
+    `parse_cfdi`.
+    """
+    return pool_map(
+        partial(parse_keyed, trusted=trusted),
+        enumerate(xmls),
+        workers=workers,
+        chunksize=chunksize,
+        ordered=ordered,
+    )
+
+
+def read_zip_members(
+    file: str | Path | IO[bytes],
+    /,
+) -> Iterator[tuple[str, bytes]]:
+    with ZipFile(file) as package:
+        for member in package.infolist():
+            if member.is_dir() or not member.filename.lower().endswith('.xml'):
+                continue
+            yield member.filename, package.read(member)
+
+
+def parse_zip(
+    file: str | Path | IO[bytes],
+    /,
+    *,
+    workers: int | None = 1,
+    chunksize: int = 1,
+    ordered: bool = True,
+    trusted: bool = False,
+) -> Iterator[tuple[str, CFDI40 | None | ParseError]]:
+    """
+    Parses the XML members of a ZIP package, such as the SAT "descarga masiva" packages, without extracting them.
+
+    Members are decompressed one at a time straight from the archive and yielded as `(member_name, result)` pairs,
+    with the same results as `parse_many`. Pass `workers` other than 1 to parse members over a process pool.
+    """
+    return pool_map(
+        partial(parse_keyed, trusted=trusted),
+        read_zip_members(file),
+        workers=workers,
+        chunksize=chunksize,
+        ordered=ordered,
+    )
@@ -0,0 +1,467 @@
+from base64 import b64encode
+from collections.abc import Iterator
+from copy import deepcopy
+from datetime import datetime, timedelta
+from decimal import ROUND_HALF_UP, Decimal
+from enum import StrEnum
+from functools import cache, partial
+from itertools import count
+from pathlib import Path
+from random import Random
+from string import ascii_uppercase, digits
+from uuid import UUID
+
+from lxml import etree
+
+from cfdi.pool import pool_map
+from cfdi.sinks import FileSink
+from cfdi.v40 import catalogos
+
+CFDI_NAMESPACE = 'http://www.sat.gob.mx/cfd/4'
+TFD_NAMESPACE = 'http://www.sat.gob.mx/TimbreFiscalDigital'
+XSI_NAMESPACE = 'http://www.w3.org/2001/XMLSchema-instance'
+
+CENTAVO = Decimal('0.01')
+
+# a few real keys of c_ClaveProdServ, which is not bundled as an enum
+PRODUCTOS = (
+    ('43211503', 'Computadora portátil'),
+    ('43211708', 'Teclado'),
+    ('44121618', 'Tijeras'),
+    ('50202306', 'Refresco'),
+    ('53101602', 'Camisa'),
+    ('56101504', 'Silla'),
+    ('72101507', 'Servicio de mantenimiento de edificios'),
+    ('78101802', 'Servicio de transporte de carga por carretera'),
+    ('80141706', 'Tasa de servicio de uso de plataforma'),
+    ('81112101', 'Proveedores de servicios de aplicación'),
+    ('84111506', 'Servicios de facturación'),
+    ('90101501', 'Restaurantes'),
+)
+
+NOMBRES = (
+    'COMERCIALIZADORA DEL NORTE',
+    'SERVICIOS INTEGRALES DEL BAJIO',
+    'DISTRIBUIDORA PENINSULAR',
+    'TRANSPORTES DEL PACIFICO',
+    'MARIA GUADALUPE HERNANDEZ LOPEZ',
+    'JUAN CARLOS MARTINEZ GARCIA',
+    'ANA SOFIA RAMIREZ TORRES',
+    'PUBLICO EN GENERAL',
+)
+
+# (impuesto, tipo factor, tasa o cuota), None when exempt
+TRASLADOS = (
+    ('002', 'Tasa', Decimal('0.160000')),
+    ('002', 'Tasa', Decimal('0.080000')),
+    ('002', 'Tasa', Decimal('0.000000')),
+    ('002', 'Exento', None),
+)
+
+IEPS = ('003', 'Tasa', Decimal('0.080000'))
+
+RETENCIONES = (
+    ('001', 'Tasa', Decimal('0.100000')),
+    ('002', 'Tasa', Decimal('0.106667')),
+)
+
+
+@cache
+def get_keys(
+    catalogo: type[StrEnum],
+    /,
+) -> tuple[str, ...]:
+    return tuple(member.value for member in catalogo)
+
+
+def qname(
+    name: str,
+    /,
+) -> str:
+    return f'{{{CFDI_NAMESPACE}}}{name}'
+
+
+def format_amount(
+    amount: Decimal,
+    /,
+) -> str:
+    return str(amount.quantize(CENTAVO, rounding=ROUND_HALF_UP))
+
+
+def get_rfc(
+    random: Random,
+    fecha: datetime,
+    /,
+    *,
+    moral: bool,
+) -> str:
+    nacimiento = fecha - timedelta(days=random.randint(20 * 365, 60 * 365))
+    letras = ''.join(random.choices(ascii_uppercase, k=3 if moral else 4))
+    homoclave = ''.join(random.choices(ascii_uppercase + digits, k=2)) + random.choice(
+        digits
+    )
+    return f'{letras}{nacimiento:%y%m%d}{homoclave}'
+
+
+def get_sello(
+    random: Random,
+    /,
+) -> str:
+    # same length as a sello made with a 2048 bits key
+    return b64encode(random.randbytes(256)).decode()
+
+
+def get_uuid(
+    random: Random,
+    /,
+) -> str:
+    return str(UUID(int=random.getrandbits(128), version=4)).upper()
+
+
+def add_impuesto(
+    totales: dict[tuple[str, str, Decimal | None], list[Decimal]],
+    parent: etree._Element,
+    tag: str,
+    impuesto: tuple[str, str, Decimal | None],
+    base: Decimal,
+    /,
+) -> None:
+    clave, tipo_factor, tasa_o_cuota = impuesto
+    node = etree.SubElement(parent, qname(tag))
+    node.set('Base', format_amount(base))
+    node.set('Impuesto', clave)
+    node.set('TipoFactor', tipo_factor)
+    importe = Decimal(0)
+    if tasa_o_cuota is not None:
+        importe = (base * tasa_o_cuota).quantize(CENTAVO, rounding=ROUND_HALF_UP)
+        node.set('TasaOCuota', f'{tasa_o_cuota:.6f}')
+        node.set('Importe', format_amount(importe))
+    suma = totales.setdefault(impuesto, [Decimal(0), Decimal(0)])
+    suma[0] += base
+    suma[1] += importe
+
+
+def add_informacion_aduanera(
+    random: Random,
+    parent: etree._Element,
+    fecha: datetime,
+    /,
+) -> None:
+    aduana = random.choice(get_keys(catalogos.Aduana))
+    patente = random.randint(1000, 9999)
+    numero = random.randint(0, 9_999_999)
+    etree.SubElement(parent, qname('InformacionAduanera')).set(
+        'NumeroPedimento',
+        f'{fecha:%y}  {aduana}  {patente}  {numero:07d}',
+    )
+
+
+def add_concepto(
+    random: Random,
+    parent: etree._Element,
+    fecha: datetime,
+    traslados: dict[tuple[str, str, Decimal | None], list[Decimal]],
+    retenciones: dict[tuple[str, str, Decimal | None], list[Decimal]],
+    /,
+) -> tuple[Decimal, Decimal]:
+    clave_prod_serv, descripcion = random.choice(PRODUCTOS)
+    cantidad = Decimal(random.randint(1, 20))
+    valor_unitario = Decimal(random.randint(100, 500_000)) / 100
+    importe = cantidad * valor_unitario
+    descuento = Decimal(0)
+    if random.random() < 0.1:
+        descuento = (importe * Decimal(random.randint(1, 30)) / 100).quantize(
+            CENTAVO,
+            rounding=ROUND_HALF_UP,
+        )
+    objeto_imp = '02' if random.random() < 0.85 else '01'
+
+    concepto = etree.SubElement(parent, qname('Concepto'))
+    concepto.set('ClaveProdServ', clave_prod_serv)
+    concepto.set('NoIdentificacion', f'SKU-{random.randint(1, 99_999):05d}')
+    concepto.set('Cantidad', str(cantidad))
+    concepto.set('ClaveUnidad', random.choice(get_keys(catalogos.ClaveUnidad)))
+    concepto.set('Descripcion', descripcion)
+    concepto.set('ValorUnitario', format_amount(valor_unitario))
+    concepto.set('Importe', format_amount(importe))
+    if descuento:
+        concepto.set('Descuento', format_amount(descuento))
+    concepto.set('ObjetoImp', objeto_imp)
+
+    if objeto_imp == '02':
+        base = importe - descuento
+        impuestos = etree.SubElement(concepto, qname('Impuestos'))
+        node = etree.SubElement(impuestos, qname('Traslados'))
+        add_impuesto(traslados, node, 'Traslado', random.choice(TRASLADOS), base)
+        if random.random() < 0.1:
+            add_impuesto(traslados, node, 'Traslado', IEPS, base)
+        if random.random() < 0.15:
+            node = etree.SubElement(impuestos, qname('Retenciones'))
+            for retencion in RETENCIONES:
+                add_impuesto(retenciones, node, 'Retencion', retencion, base)
+
+    if random.random() < 0.1:
+        for _ in range(random.randint(1, 2)):
+            add_informacion_aduanera(random, concepto, fecha)
+
+    if random.random() < 0.1:
+        for _ in range(random.randint(1, 3)):
+            clave_prod_serv, descripcion = random.choice(PRODUCTOS)
+            parte_cantidad = Decimal(random.randint(1, 5))
+            parte_valor_unitario = Decimal(random.randint(100, 10_000)) / 100
+            parte = etree.SubElement(concepto, qname('Parte'))
+            parte.set('ClaveProdServ', clave_prod_serv)
+            parte.set('Cantidad', str(parte_cantidad))
+            parte.set('Descripcion', descripcion)
+            parte.set('ValorUnitario', format_amount(parte_valor_unitario))
+            parte.set('Importe', format_amount(parte_cantidad * parte_valor_unitario))
+            if random.random() < 0.5:
+                add_informacion_aduanera(random, parte, fecha)
+
+    return importe, descuento
+
+
+def generate_cfdi(
+    random: Random,
+    /,
+    *,
+    conceptos: int,
+) -> bytes:
+    """
+    Generates a stamped CFDI v4.0 with `conceptos` conceptos, drawing every value from `random`.
+
+    Amounts and taxes add up, catalog keys are taken from the bundled enums, sellos and certificados are random bytes
+    of realistic length.
+    """
+    fecha = datetime(2024, 1, 1) + timedelta(
+        seconds=random.randrange(366 * 24 * 60 * 60)
+    )
+
+    # conceptos go first, the comprobante carries their totals
+    # (impuesto, tipo factor, tasa o cuota) -> [base, importe]
+    traslados: dict[tuple[str, str, Decimal | None], list[Decimal]] = {}
+    retenciones: dict[tuple[str, str, Decimal | None], list[Decimal]] = {}
+    sub_total = Decimal(0)
+    descuento = Decimal(0)
+    conceptos_node = etree.Element(qname('Conceptos'))
+    for _ in range(conceptos):
+        importe, concepto_descuento = add_concepto(
+            random,
+            conceptos_node,
+            fecha,
+            traslados,
+            retenciones,
+        )
+        sub_total += importe
+        descuento += concepto_descuento
+    total_trasladados = sum((importe for _, importe in traslados.values()), Decimal(0))
+    total_retenidos = sum((importe for _, importe in retenciones.values()), Decimal(0))
+    total = sub_total - descuento + total_trasladados - total_retenidos
+
+    metodo_pago = 'PUE' if random.random() < 0.8 else 'PPD'
+    forma_pago = '99'
+    if metodo_pago == 'PUE':
+        forma_pago = random.choice(
+            [key for key in get_keys(catalogos.FormaPago) if key != '99']
+        )
+    moneda = 'MXN' if random.random() < 0.9 else 'USD'
+    sello = get_sello(random)
+
+    # attributes in the order of the anexo 20
+    root = etree.Element(
+        qname('Comprobante'),
+        nsmap={
+            'cfdi': CFDI_NAMESPACE,
+            'xsi': XSI_NAMESPACE,
+        },
+    )
+    root.set(
+        f'{{{XSI_NAMESPACE}}}schemaLocation',
+        f'{CFDI_NAMESPACE} http://www.sat.gob.mx/sitio_internet/cfd/4/cfdv40.xsd',
+    )
+    root.set('Version', '4.0')
+    root.set('Serie', random.choice(('A', 'B', 'F', 'FAC')))
+    root.set('Folio', str(random.randint(1, 999_999)))
+    root.set('Fecha', f'{fecha:%Y-%m-%dT%H:%M:%S}')
+    root.set('Sello', sello)
+    root.set('FormaPago', forma_pago)
+    root.set('NoCertificado', f'{random.randrange(10**20):020d}')
+    root.set('Certificado', b64encode(random.randbytes(1500)).decode())
+    root.set('SubTotal', format_amount(sub_total))
+    if descuento:
+        root.set('Descuento', format_amount(descuento))
+    root.set('Moneda', moneda)
+    if moneda != 'MXN':
+        root.set(
+            'TipoCambio', f'{Decimal(random.randint(160_000, 210_000)) / 10_000:.4f}'
+        )
+    root.set('Total', format_amount(total))
+    root.set('TipoDeComprobante', 'I')
+    root.set('Exportacion', '01')
+    root.set('MetodoPago', metodo_pago)
+    root.set('LugarExpedicion', f'{random.randint(1000, 99999):05d}')
+
+    if random.random() < 0.2:
+        relacionados = etree.SubElement(root, qname('CfdiRelacionados'))
+        relacionados.set(
+            'TipoRelacion', random.choice(get_keys(catalogos.TipoRelacion))
+        )
+        for _ in range(random.randint(1, 3)):
+            etree.SubElement(relacionados, qname('CfdiRelacionado')).set(
+                'UUID', get_uuid(random)
+            )
+
+    emisor = etree.SubElement(root, qname('Emisor'))
+    emisor.set('Rfc', get_rfc(random, fecha, moral=True))
+    emisor.set('Nombre', random.choice(NOMBRES))
+    emisor.set('RegimenFiscal', random.choice(get_keys(catalogos.RegimenFiscal)))
+
+    receptor = etree.SubElement(root, qname('Receptor'))
+    receptor.set('Rfc', get_rfc(random, fecha, moral=random.random() < 0.5))
+    receptor.set('Nombre', random.choice(NOMBRES))
+    receptor.set('DomicilioFiscalReceptor', f'{random.randint(1000, 99999):05d}')
+    receptor.set(
+        'RegimenFiscalReceptor', random.choice(get_keys(catalogos.RegimenFiscal))
+    )
+    receptor.set('UsoCFDI', random.choice(get_keys(catalogos.UsoCFDI)))
+
+    root.append(conceptos_node)
+
+    if traslados or retenciones:
+        impuestos = etree.SubElement(root, qname('Impuestos'))
+        if retenciones:
+            impuestos.set('TotalImpuestosRetenidos', format_amount(total_retenidos))
+            node = etree.SubElement(impuestos, qname('Retenciones'))
+            # retenciones are summarized by impuesto only
+            importes: dict[str, Decimal] = {}
+            for (clave, _, _), (_, importe) in retenciones.items():
+                importes[clave] = importes.get(clave, Decimal(0)) + importe
+            for clave, importe in importes.items():
+                retencion = etree.SubElement(node, qname('Retencion'))
+                retencion.set('Impuesto', clave)
+                retencion.set('Importe', format_amount(importe))
+        if traslados:
+            impuestos.set('TotalImpuestosTrasladados', format_amount(total_trasladados))
+            node = etree.SubElement(impuestos, qname('Traslados'))
+            for (clave, tipo_factor, tasa_o_cuota), (
+                base,
+                importe,
+            ) in traslados.items():
+                traslado = etree.SubElement(node, qname('Traslado'))
+                traslado.set('Base', format_amount(base))
+                traslado.set('Impuesto', clave)
+                traslado.set('TipoFactor', tipo_factor)
+                if tasa_o_cuota is not None:
+                    traslado.set('TasaOCuota', f'{tasa_o_cuota:.6f}')
+                    traslado.set('Importe', format_amount(importe))
+
+    complemento = etree.SubElement(root, qname('Complemento'))
+    tfd = etree.SubElement(
+        complemento,
+        f'{{{TFD_NAMESPACE}}}TimbreFiscalDigital',
+        nsmap={
+            'tfd': TFD_NAMESPACE,
+        },
+    )
+    fecha_timbrado = fecha + timedelta(seconds=random.randint(1, 3600))
+    tfd.set('Version', '1.1')
+    tfd.set('UUID', get_uuid(random))
+    tfd.set('FechaTimbrado', f'{fecha_timbrado:%Y-%m-%dT%H:%M:%S}')
+    tfd.set('RfcProvCertif', 'SAT970701NN3')
+    tfd.set('SelloCFD', sello)
+    tfd.set('NoCertificadoSAT', f'{random.randrange(10**20):020d}')
+    tfd.set('SelloSAT', get_sello(random))
+
+    return etree.tostring(root, xml_declaration=True, encoding='UTF-8')
+
+
+def generate_document(
+    index: int,
+    /,
+    *,
+    seed: int,
+    conceptos: tuple[int, int],
+) -> bytes:
+    # every document has its own generator, so any of them can be rebuilt on its own
+    random = Random(f'{seed}:{index}')
+    return generate_cfdi(random, conceptos=random.randint(*conceptos))
+
+
+def iter_corpus(
+    documents: int | None = None,
+    /,
+    *,
+    seed: int = 0,
+    conceptos: tuple[int, int] = (1, 10),
+    workers: int | None = 1,
+    chunksize: int = 64,
+) -> Iterator[bytes]:
+    """
+    Yields `documents` synthetic documents, or an endless stream when `documents` is `None`.
+
+    The corpus only depends on `seed` and `conceptos`, the number of conceptos of every document is drawn between
+    both bounds. Documents are generated over a process pool with more than one worker, see `pool_map`.
+    """
+    return pool_map(
+        partial(generate_document, seed=seed, conceptos=conceptos),
+        count() if documents is None else range(documents),
+        workers=workers,
+        chunksize=chunksize,
+    )
+
+
+def enlarge(
+    xml: bytes,
+    /,
+    *,
+    times: int,
+) -> etree._Element:
+    """
+    Appends `times` copies of every concepto of `xml`, to build documents of any size out of a real one.
+    """
+    tree = etree.fromstring(xml)
+    conceptos = tree.find(qname('Conceptos'))
+    assert conceptos is not None
+    for concepto in list(conceptos):
+        for _ in range(times):
+            conceptos.append(deepcopy(concepto))
+    return tree
+
+
+def write_document(
+    index: int,
+    /,
+    *,
+    directory: Path,
+    seed: int,
+    conceptos: tuple[int, int],
+) -> None:
+    FileSink(directory / f'{index:08d}.xml').write(
+        generate_document(index, seed=seed, conceptos=conceptos),
+    )
+
+
+def write_corpus(
+    directory: str | Path,
+    documents: int,
+    /,
+    *,
+    seed: int = 0,
+    conceptos: tuple[int, int] = (1, 10),
+    workers: int | None = None,
+    chunksize: int = 64,
+) -> None:
+    """
+    Writes `documents` synthetic documents into `directory` as `00000000.xml`, `00000001.xml` and so on.
+
+    Documents are written by the workers, only their index crosses the process boundary.
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    for _ in pool_map(
+        partial(write_document, directory=directory, seed=seed, conceptos=conceptos),
+        range(documents),
+        workers=workers,
+        chunksize=chunksize,
+    ):
+        pass
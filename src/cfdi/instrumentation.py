@@ -0,0 +1,188 @@
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, nullcontext
+from threading import Lock
+from time import perf_counter
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from logging import Logger
+
+type Recorder = Callable[[str, float], object]
+"""
+Receives the name of every finished span and its duration in seconds, any function with that signature is a recorder.
+"""
+
+# replaced rather than mutated, spans read it without locking
+recorders: tuple[Recorder, ...] = ()
+
+lock = Lock()
+
+DISABLED = nullcontext()
+
+
+class Span:
+    __slots__ = ('name', 'start')
+
+    def __init__(
+        self,
+        name: str,
+        /,
+    ) -> None:
+        self.name = name
+        self.start = 0.0
+
+    def __enter__(
+        self,
+    ) -> None:
+        self.start = perf_counter()
+
+    def __exit__(
+        self,
+        *args: object,
+    ) -> None:
+        elapsed = perf_counter() - self.start
+        for recorder in recorders:
+            recorder(self.name, elapsed)
+
+
+def span(
+    name: str,
+    /,
+) -> Span | nullcontext[None]:
+    """
+    Times the enclosed block as `name` and hands the duration to every recorder, spans that raise are timed too.
+
+    Without recorders it returns a shared no-op context, so instrumented code pays a single check.
+    """
+    if not recorders:
+        return DISABLED
+    return Span(name)
+
+
+def add_recorder(
+    recorder: Recorder,
+    /,
+) -> None:
+    global recorders
+    with lock:
+        recorders = (*recorders, recorder)
+
+
+def remove_recorder(
+    recorder: Recorder,
+    /,
+) -> None:
+    global recorders
+    with lock:
+        index = recorders.index(recorder)
+        recorders = recorders[:index] + recorders[index + 1 :]
+
+
+@contextmanager
+def recording[R: Recorder](
+    recorder: R,
+    /,
+) -> Iterator[R]:
+    """
+    Installs `recorder` for the duration of the block.
+    """
+    add_recorder(recorder)
+    try:
+        yield recorder
+    finally:
+        remove_recorder(recorder)
+
+
+class LoggingRecorder:
+    """
+    Logs every span, by default to the `cfdi` logger at debug level.
+    """
+
+    def __init__(
+        self,
+        logger: 'Logger | None' = None,
+        /,
+        *,
+        level: int | None = None,
+    ) -> None:
+        # logging is only imported when used
+        import logging
+
+        self.logger = logger or logging.getLogger('cfdi')
+        self.level = logging.DEBUG if level is None else level
+
+    def __call__(
+        self,
+        name: str,
+        seconds: float,
+        /,
+    ) -> None:
+        self.logger.log(self.level, '%s took %.3fms', name, seconds * 1e3)
+
+
+class Metric(NamedTuple):
+    calls: int
+    total: float
+    max: float
+
+
+class MetricsRecorder:
+    """
+    Thread-safe registry that counts the spans and adds up their durations, exposed in the Prometheus text format.
+    """
+
+    def __init__(
+        self,
+        *,
+        prefix: str = 'cfdi',
+    ) -> None:
+        self.prefix = prefix
+        self.lock = Lock()
+        # name -> [calls, total, max]
+        self.values: dict[str, list[float]] = {}
+
+    def __call__(
+        self,
+        name: str,
+        seconds: float,
+        /,
+    ) -> None:
+        with self.lock:
+            values = self.values.get(name)
+            if values is None:
+                self.values[name] = [1, seconds, seconds]
+                return
+            values[0] += 1
+            values[1] += seconds
+            values[2] = max(values[2], seconds)
+
+    def metrics(
+        self,
+    ) -> dict[str, Metric]:
+        with self.lock:
+            return {
+                name: Metric(calls=int(calls), total=total, max=maximum)
+                for name, (calls, total, maximum) in self.values.items()
+            }
+
+    def clear(
+        self,
+    ) -> None:
+        with self.lock:
+            self.values.clear()
+
+    def expose(
+        self,
+    ) -> str:
+        """
+        Returns the metrics as a Prometheus summary, ready to be served on a `/metrics` endpoint.
+        """
+        metric = f'{self.prefix}_span_seconds'
+        lines = [
+            f'# HELP {metric} Duration of the instrumented stages.',
+            f'# TYPE {metric} summary',
+        ]
+        for name, value in sorted(self.metrics().items()):
+            lines.append(f'{metric}_count{{span="{name}"}} {value.calls}')
+            lines.append(f'{metric}_sum{{span="{name}"}} {value.total!r}')
+        return '\n'.join(lines) + '\n'
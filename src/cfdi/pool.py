@@ -0,0 +1,125 @@
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from contextvars import copy_context
+from functools import partial
+from itertools import batched
+from os import process_cpu_count
+from typing import Any
+
+from pydantic import ValidationError
+from pydantic_core import ErrorDetails
+
+
+class TaskError(Exception):
+    """
+    Error raised while processing a single document of a batch, be it parsing, sealing or rendering it.
+
+    Exceptions are not always picklable, validation errors never are, so they are flattened into this exception
+    before crossing the process boundary, see `flatten_error`.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        /,
+        *,
+        errors: list[ErrorDetails] | None = None,
+    ) -> None:
+        super().__init__(message)
+        self.errors = errors or []
+
+    def __reduce__(self):
+        return partial(type(self), errors=self.errors), (str(self),)
+
+
+def flatten_error(
+    error: Exception,
+    /,
+) -> TaskError:
+    """
+    Flattens any exception into a `TaskError`, keeping the details of validation errors.
+    """
+    match error:
+        case TaskError():
+            return error
+        case ValidationError():
+            return TaskError(
+                str(error),
+                errors=error.errors(include_url=False, include_context=False),
+            )
+        case _:
+            return TaskError(f'{type(error).__name__}: {error}')
+
+
+def run_chunk[T, R](
+    func: Callable[[T], R],
+    chunk: tuple[T, ...],
+    /,
+) -> list[R]:
+    return [func(item) for item in chunk]
+
+
+def pool_map[T, R](
+    func: Callable[[T], R],
+    items: Iterable[T],
+    /,
+    *,
+    workers: int | None = None,
+    chunksize: int = 1,
+    ordered: bool = True,
+    initializer: Callable[..., Any] | None = None,
+    initargs: tuple[Any, ...] = (),
+) -> Iterator[R]:
+    """
+    Applies `func` to every item over a process pool.
+
+    Items are consumed lazily and only a bounded number of chunks is in flight at any time, so memory does not grow
+    with the number of items. With `workers=1` everything runs in the current process, in a copy of the current
+    context: an `initializer` keeping its state in context variables leaves the caller untouched, as it would in a
+    worker process.
+    """
+    if chunksize < 1:
+        raise ValueError(f'Invalid chunksize: {chunksize}')
+    workers = workers or process_cpu_count() or 1
+    chunks = batched(items, chunksize)
+    # run inline
+    if workers == 1:
+        context = copy_context()
+        if initializer is not None:
+            context.run(initializer, *initargs)
+        for chunk in chunks:
+            yield from context.run(run_chunk, func, chunk)
+        return
+    task = partial(run_chunk, func)
+    window = workers * 2
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=initializer,
+        initargs=initargs,
+    )
+    try:
+        # yield in submission order
+        if ordered:
+            queue: deque[Future[list[R]]] = deque()
+            for chunk in chunks:
+                queue.append(executor.submit(task, chunk))
+                if len(queue) >= window:
+                    yield from queue.popleft().result()
+            while queue:
+                yield from queue.popleft().result()
+            return
+        # yield as completed
+        running: set[Future[list[R]]] = set()
+        for chunk in chunks:
+            running.add(executor.submit(task, chunk))
+            if len(running) >= window:
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield from future.result()
+        while running:
+            done, running = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+    finally:
+        executor.shutdown(cancel_futures=True)
@@ -0,0 +1,112 @@
+import os
+from pathlib import Path
+from secrets import token_hex
+from typing import Any, Protocol
+
+
+class Sink(Protocol):
+    """
+    Destination of a rendered document, any binary file object is a sink.
+    """
+
+    def write(
+        self,
+        data: bytes,
+        /,
+    ) -> Any: ...
+
+
+class FileSink:
+    """
+    Writes the document to a local file.
+
+    The document is written next to `path` and renamed into place, so readers never see a partial file.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        /,
+    ) -> None:
+        self.path = Path(path)
+
+    def write(
+        self,
+        data: bytes,
+        /,
+    ) -> None:
+        temporary = self.path.with_name(f'.{self.path.name}.{token_hex(8)}')
+        # created as open() does, the kernel applies the current umask
+        fd = os.open(temporary, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o666)
+        try:
+            with open(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temporary, self.path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+
+class BufferSink:
+    """
+    Keeps the document in memory, holding the rendered bytes rather than copying them into a `BytesIO`.
+    """
+
+    def __init__(
+        self,
+    ) -> None:
+        self.data = b''
+
+    def write(
+        self,
+        data: bytes,
+        /,
+    ) -> None:
+        self.data = data
+
+    def getbuffer(
+        self,
+    ) -> memoryview:
+        return memoryview(self.data)
+
+
+class S3Client(Protocol):
+    def put_object(
+        self,
+        **kwargs: Any,
+    ) -> Any: ...
+
+
+class S3Sink:
+    """
+    Uploads the document to an S3-compatible store with a single `PutObject`, such as a boto3 S3 client.
+    """
+
+    def __init__(
+        self,
+        client: S3Client,
+        bucket: str,
+        key: str,
+        /,
+        *,
+        content_type: str = 'application/pdf',
+        **extra: Any,
+    ) -> None:
+        self.client = client
+        self.bucket = bucket
+        self.key = key
+        self.content_type = content_type
+        self.extra = extra
+
+    def write(
+        self,
+        data: bytes,
+        /,
+    ) -> None:
+        self.client.put_object(
+            Bucket=self.bucket,
+            Key=self.key,
+            Body=data,
+            ContentType=self.content_type,
+            **self.extra,
+        )
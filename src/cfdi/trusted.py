@@ -0,0 +1,241 @@
+from collections.abc import Callable
+from datetime import datetime
+from decimal import Decimal
+from enum import Enum
+from functools import cache, partial
+from types import NoneType, UnionType
+from typing import (
+    Annotated,
+    Any,
+    Literal,
+    TypeAliasType,
+    Union,
+    cast,
+    get_args,
+    get_origin,
+)
+from uuid import UUID
+
+from lxml import etree
+from pydantic import StringConstraints
+from pydantic_xml import BaseXmlModel
+from pydantic_xml.element.native import XmlElement
+from pydantic_xml.fields import XmlEntityInfo
+from pydantic_xml.typedefs import EntityLocation
+
+type Converter = Callable[[str], Any]
+
+type Step = tuple[
+    str,
+    Literal['attr', 'model', 'models', 'wrapped', 'dict', 'dicts', 'custom'],
+    str,
+    Any,
+]
+
+CONVERTERS: dict[type, Converter] = {
+    str: str,
+    int: int,
+    float: float,
+    Decimal: Decimal,
+    datetime: datetime.fromisoformat,
+    UUID: UUID,
+}
+
+
+def unwrap(
+    annotation: Any,
+    /,
+) -> tuple[Any, list[Any]]:
+    """
+    Strips type aliases, `Annotated` and `Optional` from an annotation, returning the bare type and its metadata.
+    """
+    metadata: list[Any] = []
+    while True:
+        if isinstance(annotation, TypeAliasType):
+            annotation = annotation.__value__
+            continue
+        origin = get_origin(annotation)
+        if origin is Annotated:
+            annotation, *extra = get_args(annotation)
+            metadata.extend(extra)
+            continue
+        if origin is Union or origin is UnionType:
+            args = [arg for arg in get_args(annotation) if arg is not NoneType]
+            if len(args) == 1:
+                [annotation] = args
+                continue
+        return annotation, metadata
+
+
+def get_converter(
+    annotation: Any,
+    metadata: list[Any],
+    /,
+) -> Converter:
+    if get_origin(annotation) is Literal:
+        return str
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return partial(get_member, annotation._value2member_map_, annotation.__name__)
+    converter = CONVERTERS.get(annotation)
+    if converter is None:
+        raise TypeError(f'Unsupported type: {annotation}')
+    # keep the only string transformation used by the models
+    if converter is str and any(
+        isinstance(m, StringConstraints) and m.strip_whitespace for m in metadata
+    ):
+        return str.strip
+    return converter
+
+
+def get_member(
+    members: dict[Any, Enum],
+    name: str,
+    value: str,
+    /,
+) -> Enum:
+    member = members.get(value)
+    # catalog keys newer than the bundled enums, the validated model rejects them too
+    if member is None:
+        raise ValueError(f'Invalid {name}: {value}')
+    return member
+
+
+def get_tag(
+    model: type[BaseXmlModel],
+    /,
+) -> str:
+    assert model.__xml_tag__ is not None
+    return get_qualified_name(model, model.__xml_tag__)
+
+
+def get_qualified_name(
+    model: type[BaseXmlModel],
+    name: str,
+    /,
+) -> str:
+    nsmap = model.__xml_nsmap__ or {}
+    namespace = nsmap.get(model.__xml_ns__) if model.__xml_ns__ else None
+    return etree.QName(namespace, name).text
+
+
+@cache
+def get_defaults(
+    model: type[BaseXmlModel],
+    /,
+) -> tuple[tuple[str, Any], ...]:
+    """
+    Default values of the model, handing every value to `model_construct` saves its per-field default resolution.
+    """
+    return tuple(
+        (name, field.get_default(call_default_factory=True))
+        for name, field in model.model_fields.items()
+        if not field.is_required()
+    )
+
+
+@cache
+def get_plan(
+    model: type[BaseXmlModel],
+    /,
+) -> tuple[Step, ...]:
+    """
+    Compiles, once per model, the list of lookups needed to build it from an element.
+    """
+    plan: list[Step] = []
+    for name, field in model.model_fields.items():
+        annotation, metadata = unwrap(field.annotation)
+        metadata = [*field.metadata, *metadata]
+        entity = next((m for m in metadata if isinstance(m, XmlEntityInfo)), None)
+        is_list = get_origin(annotation) is list
+        item = get_args(annotation)[0] if is_list else annotation
+        is_model = isinstance(item, type) and issubclass(item, BaseXmlModel)
+        is_dict = get_origin(item) is dict
+        # fields with their own xml validator read the element as pydantic-xml hands it to them
+        validator = model.__xml_field_validators__.get(name)
+        if validator is not None:
+            plan.append((name, 'custom', name, validator))
+            continue
+        # entities without a path are named after their field, as pydantic-xml does
+        path = name if entity is None or entity.path is None else entity.path
+        match entity:
+            case XmlEntityInfo(location=EntityLocation.ATTRIBUTE):
+                plan.append((name, 'attr', path, get_converter(annotation, metadata)))
+            case XmlEntityInfo(location=EntityLocation.WRAPPED) if is_model:
+                plan.append(
+                    (
+                        name,
+                        'wrapped',
+                        get_qualified_name(model, path),
+                        (item, get_tag(item)),
+                    ),
+                )
+            case XmlEntityInfo(location=EntityLocation.ELEMENT) if is_dict:
+                plan.append(
+                    (
+                        name,
+                        'dicts' if is_list else 'dict',
+                        get_qualified_name(model, path),
+                        None,
+                    ),
+                )
+            case None if is_model:
+                plan.append(
+                    (name, 'models' if is_list else 'model', get_tag(item), item)
+                )
+            case _:
+                raise TypeError(f'Unsupported field: {model.__name__}.{name}')
+    return tuple(plan)
+
+
+def construct[M: BaseXmlModel](
+    model: type[M],
+    element: etree._Element,
+    /,
+) -> M:
+    """
+    Builds `model` from `element` converting every value to its type but without running any validation.
+
+    Only meant for documents that are already known to be valid, such as XMLs stamped by a PAC. Catalog keys that
+    are not in the bundled enums raise a `ValueError`.
+    """
+    values: dict[str, Any] = {}
+    for name, kind, tag, target in get_plan(model):
+        match kind:
+            case 'attr':
+                value = element.get(tag)
+                if value is not None:
+                    values[name] = target(value)
+            case 'model':
+                child = element.find(tag)
+                if child is not None:
+                    values[name] = construct(target, child)
+            case 'models':
+                children = element.findall(tag)
+                if children:
+                    values[name] = [construct(target, child) for child in children]
+            case 'wrapped':
+                wrapper = element.find(tag)
+                if wrapper is not None:
+                    item, item_tag = target
+                    values[name] = [
+                        construct(item, child)
+                        for child in wrapper.iterchildren(item_tag)
+                    ]
+            case 'dict':
+                child = element.find(tag)
+                if child is not None:
+                    values[name] = dict(child.attrib)
+            case 'dicts':
+                children = element.findall(tag)
+                if children:
+                    values[name] = [dict(child.attrib) for child in children]
+            case 'custom':
+                value = target(model, XmlElement.from_native(element), tag)
+                if value is not None:
+                    values[name] = value
+    fields_set = set(values)
+    for name, default in get_defaults(model):
+        if name not in fields_set:
+            # mutable defaults are copied, as pydantic does
+            values[name] = default.copy() if isinstance(default, list) else default
+    return cast(M, model.model_construct(fields_set, **values))
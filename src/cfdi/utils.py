@@ -1,45 +1,84 @@
+from datetime import datetime
+from decimal import Decimal
 from pathlib import Path
-from typing import overload
+from typing import NamedTuple, overload
+from uuid import UUID
 
 from lxml import etree
 
+from cfdi.instrumentation import span
+from cfdi.trusted import construct
 from cfdi.v40 import CFDI40
 
+TFD_NAMESPACE = 'http://www.sat.gob.mx/TimbreFiscalDigital'
 
-def get_cfdi_version(
-    xml: bytes,
+
+class CFDIHeader(NamedTuple):
+    """
+    Index row of a CFDI, as returned by `scan_cfdi`.
+    """
+
+    version: str
+    fecha: datetime
+    total: Decimal
+    moneda: str
+    tipo_de_comprobante: str
+    emisor_rfc: str
+    receptor_rfc: str
+    uuid: UUID | None
+
+
+def get_comprobante(
+    tree: etree._Element,
     /,
-) -> str | None:
-    # validate valid xml
-    try:
-        tree = etree.fromstring(xml)
-    except etree.XMLSyntaxError:
-        return None
+) -> etree._Element | None:
     # validate contains namspaces
     namespaces = {key: value for key, value in tree.nsmap.items() if key}
     if not namespaces:
         return None
+    # the comprobante is almost always the root element
+    if tree.tag == f'{{{namespaces.get("cfdi")}}}Comprobante':
+        return tree
     # get cfdi
     search = tree.xpath('//cfdi:Comprobante', namespaces=namespaces)
     if not isinstance(search, list):
         return None
-    if len(search) > 1:
+    if len(search) != 1:
         return None
     [cfdi] = search
     # make sure it's an element
     if not isinstance(cfdi, etree._Element):
         return None
-    # check version
-    version = cfdi.get('Version')
-    if not version:
-        return None
-    return version
+    return cfdi
+
+
+def get_cfdi_version(
+    xml: bytes,
+    /,
+) -> str | None:
+    with span('version'):
+        # validate valid xml
+        try:
+            tree = etree.fromstring(xml)
+        except etree.XMLSyntaxError:
+            return None
+        # get cfdi
+        cfdi = get_comprobante(tree)
+        if cfdi is None:
+            return None
+        # check version
+        version = cfdi.get('Version')
+        if not version:
+            return None
+        return version
 
 
 @overload
 def parse_cfdi(
     xml: bytes,
     /,
+    *,
+    trusted: bool = False,
 ) -> CFDI40 | None:
     pass
 
@@ -48,6 +87,8 @@ def parse_cfdi(
 def parse_cfdi(
     xml: Path,
     /,
+    *,
+    trusted: bool = False,
 ) -> CFDI40 | None:
     pass
 
@@ -55,7 +96,16 @@ def parse_cfdi(
 def parse_cfdi(
     xml: bytes | Path,
     /,
+    *,
+    trusted: bool = False,
 ) -> CFDI40 | None:
+    """
+    Parses a CFDI, returns `None` when the document is not a supported CFDI.
+
+    With `trusted=True`, documents that carry a TimbreFiscalDigital are built without running the model validation,
+    only converting values to their types, since the PAC already validated them. Documents without a timbre, or with
+    catalog keys the bundled catalogs do not have, are always validated.
+    """
     # cast input
     match xml:
         case bytes():
@@ -64,8 +114,101 @@ def parse_cfdi(
             xml = xml.read_bytes()
         case _:
             raise TypeError(f'Invalid type: {type(xml)}')
+    # parse once, the same tree is handed to the model
+    try:
+        with span('parse.xml'):
+            tree = etree.fromstring(xml)
+    except etree.XMLSyntaxError:
+        return None
+    cfdi = get_comprobante(tree)
+    if cfdi is None:
+        return None
     # check version
-    version = get_cfdi_version(xml)
-    match version:
+    match cfdi.get('Version'):
         case '4.0':
-            return CFDI40.from_xml(xml)
+            if trusted and is_stamped(cfdi):
+                try:
+                    with span('parse.construct'):
+                        return construct(CFDI40, cfdi)
+                except ValueError:
+                    # values the model does not know, the validation reports them
+                    pass
+            with span('parse.validate'):
+                return CFDI40.from_xml_tree(cfdi)
+
+
+def is_stamped(
+    cfdi: etree._Element,
+    /,
+) -> bool:
+    namespaces = {
+        'cfdi': etree.QName(cfdi).namespace,
+        'tfd': TFD_NAMESPACE,
+    }
+    return cfdi.find('cfdi:Complemento/tfd:TimbreFiscalDigital', namespaces) is not None
+
+
+def get_attribute(
+    element: etree._Element,
+    name: str,
+    /,
+) -> str:
+    value = element.get(name)
+    if value is None:
+        raise ValueError(
+            f'Missing attribute {name} in {etree.QName(element).localname}'
+        )
+    return value
+
+
+def scan_cfdi(
+    xml: bytes | Path,
+    /,
+) -> CFDIHeader | None:
+    """
+    Reads the header of a CFDI without building nor validating the full model, returns `None` when the document is
+    not a CFDI or its header can not be read.
+
+    The whole document is still parsed into a tree, but only the attributes of the Comprobante, the Emisor and
+    Receptor RFCs and the TimbreFiscalDigital UUID are read, the Conceptos are never visited.
+    """
+    # cast input
+    match xml:
+        case bytes():
+            pass
+        case Path():
+            xml = xml.read_bytes()
+        case _:
+            raise TypeError(f'Invalid type: {type(xml)}')
+    try:
+        tree = etree.fromstring(xml)
+    except etree.XMLSyntaxError:
+        return None
+    cfdi = get_comprobante(tree)
+    if cfdi is None:
+        return None
+    namespaces = {
+        'cfdi': etree.QName(cfdi).namespace,
+        'tfd': TFD_NAMESPACE,
+    }
+    # emisor and receptor are direct children, no descendant search
+    emisor = cfdi.find('cfdi:Emisor', namespaces)
+    receptor = cfdi.find('cfdi:Receptor', namespaces)
+    if emisor is None or receptor is None:
+        return None
+    # timbre fiscal digital
+    tfd = cfdi.find('cfdi:Complemento/tfd:TimbreFiscalDigital', namespaces)
+    try:
+        return CFDIHeader(
+            version=get_attribute(cfdi, 'Version'),
+            fecha=datetime.fromisoformat(get_attribute(cfdi, 'Fecha')),
+            total=Decimal(get_attribute(cfdi, 'Total')),
+            moneda=get_attribute(cfdi, 'Moneda'),
+            tipo_de_comprobante=get_attribute(cfdi, 'TipoDeComprobante'),
+            emisor_rfc=get_attribute(emisor, 'Rfc').strip(),
+            receptor_rfc=get_attribute(receptor, 'Rfc').strip(),
+            uuid=UUID(get_attribute(tfd, 'UUID')) if tfd is not None else None,
+        )
+    # missing or malformed attributes, decimal errors are arithmetic errors
+    except (ValueError, ArithmeticError):
+        return None
@@ -1,2 +1,24 @@
+from importlib import import_module as _import_module
+from typing import TYPE_CHECKING as _TYPE_CHECKING
+
 from . import catalogos
-from .cfdi import CFDI40
+
+if _TYPE_CHECKING:
+    from .cfdi import CFDI40
+
+__all__ = [
+    'catalogos',
+    'CFDI40',
+]
+
+
+def __getattr__(
+    name: str,
+    /,
+):
+    # the models are only imported when first used
+    if name != 'CFDI40':
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = _import_module('.cfdi', __name__).CFDI40
+    globals()[name] = value
+    return value
@@ -1,8 +1,42 @@
 from abc import ABC
+from types import UnionType
+from typing import Any, Self, TypeAliasType, Union, get_args, get_origin
 
+from lxml import etree
+from pydantic import ConfigDict
 from pydantic_xml import BaseXmlModel
 
 
+def iter_models(
+    annotation: Any,
+    /,
+) -> list[type[BaseXmlModel]]:
+    """
+    Finds the xml models referenced by an annotation.
+    """
+    if isinstance(annotation, TypeAliasType):
+        return iter_models(annotation.__value__)
+    if isinstance(annotation, type) and issubclass(annotation, BaseXmlModel):
+        return [annotation]
+    if get_origin(annotation) in (Union, UnionType, list):
+        return [model for arg in get_args(annotation) for model in iter_models(arg)]
+    return []
+
+
+def build_model(
+    model: type[BaseXmlModel],
+    /,
+) -> None:
+    """
+    Builds the deferred schema and xml serializer of `model` and of every model nested in it.
+    """
+    if model.__xml_serializer__ is None:
+        model.model_rebuild()
+    for field in model.model_fields.values():
+        for submodel in iter_models(field.annotation):
+            build_model(submodel)
+
+
 class BaseModel(
     BaseXmlModel,
     ABC,
@@ -12,4 +46,36 @@ class BaseModel(
     },
     search_mode='unordered',
 ):
-    pass
+    # schemas are built on first use rather than at import time
+    model_config = ConfigDict(defer_build=True)
+
+    # typed with lxml, which pydantic-xml runs on here, while its annotations name the standard library elements
+    @classmethod
+    def from_xml_tree(  # type: ignore[override]
+        cls,
+        root: etree._Element,
+        context: dict[str, Any] | None = None,
+        empty_as_string: bool = False,
+    ) -> Self:
+        if cls.__xml_serializer__ is None:
+            build_model(cls)
+        return super().from_xml_tree(
+            root,  # type: ignore[arg-type]
+            context=context,
+            empty_as_string=empty_as_string,
+        )
+
+    def to_xml_tree(  # type: ignore[override]
+        self,
+        *,
+        skip_empty: bool = False,
+        exclude_none: bool = False,
+        exclude_unset: bool = False,
+    ) -> etree._Element:
+        if self.__xml_serializer__ is None:
+            build_model(type(self))
+        return super().to_xml_tree(  # type: ignore[return-value]
+            skip_empty=skip_empty,
+            exclude_none=exclude_none,
+            exclude_unset=exclude_unset,
+        )
@@ -0,0 +1,511 @@
+import re
+from collections.abc import Callable
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from threading import local
+from typing import TYPE_CHECKING, Any, Literal
+from uuid import UUID
+
+from lxml import etree
+
+from cfdi.instrumentation import span
+
+if TYPE_CHECKING:
+    from cfdi.v40 import CFDI40
+    from cfdi.v40.complemento.timbre_fiscal_digital import TimbreFiscalDigital
+
+CFDI_NAMESPACE = 'http://www.sat.gob.mx/cfd/4'
+
+TFD_TAG = '{http://www.sat.gob.mx/TimbreFiscalDigital}TimbreFiscalDigital'
+
+# (xml attribute, model field, required), in the order of the anexo 20
+type Atributos = tuple[tuple[str, str, bool], ...]
+
+type Complemento = Callable[[list[str], etree._Element], None]
+
+type Engine = Literal['native', 'xslt']
+
+STYLESHEETS = Path(__file__).parent / 'xslt'
+
+COMPROBANTE: Atributos = (
+    ('Version', 'version', True),
+    ('Serie', 'serie', False),
+    ('Folio', 'folio', False),
+    ('Fecha', 'fecha', True),
+    ('FormaPago', 'forma_pago', False),
+    ('NoCertificado', 'no_certificado', True),
+    ('CondicionesDePago', 'condiciones_de_pago', False),
+    ('SubTotal', 'sub_total', True),
+    ('Descuento', 'descuento', False),
+    ('Moneda', 'moneda', True),
+    ('TipoCambio', 'tipo_cambio', False),
+    ('Total', 'total', True),
+    ('TipoDeComprobante', 'tipo_de_comprobante', True),
+    ('Exportacion', 'exportacion', True),
+    ('MetodoPago', 'metodo_pago', False),
+    ('LugarExpedicion', 'lugar_expedicion', True),
+    ('Confirmacion', 'confirmacion', False),
+)
+
+INFORMACION_GLOBAL: Atributos = (
+    ('Periodicidad', 'periodicidad', True),
+    ('Meses', 'meses', True),
+    ('Año', 'año', True),
+)
+
+CFDI_RELACIONADOS: Atributos = (('TipoRelacion', 'tipo_relacion', True),)
+
+CFDI_RELACIONADO: Atributos = (('UUID', 'uuid', True),)
+
+EMISOR: Atributos = (
+    ('Rfc', 'rfc', True),
+    ('Nombre', 'nombre', True),
+    ('RegimenFiscal', 'regimen_fiscal', True),
+    ('FacAtrAdquirente', 'fac_atr_adquirente', False),
+)
+
+RECEPTOR: Atributos = (
+    ('Rfc', 'rfc', True),
+    ('Nombre', 'nombre', True),
+    ('DomicilioFiscalReceptor', 'domicilio_fiscal_receptor', True),
+    ('ResidenciaFiscal', 'residencia_fiscal', False),
+    ('NumRegIdTrib', 'num_reg_id_trib', False),
+    ('RegimenFiscalReceptor', 'regimen_fiscal_receptor', True),
+    ('UsoCFDI', 'uso_cfdi', True),
+)
+
+CONCEPTO: Atributos = (
+    ('ClaveProdServ', 'clave_prod_serv', True),
+    ('NoIdentificacion', 'no_identificacion', False),
+    ('Cantidad', 'cantidad', True),
+    ('ClaveUnidad', 'clave_unidad', True),
+    ('Unidad', 'unidad', False),
+    ('Descripcion', 'descripcion', True),
+    ('ValorUnitario', 'valor_unitario', True),
+    ('Importe', 'importe', True),
+    ('Descuento', 'descuento', False),
+    ('ObjetoImp', 'objeto_imp', True),
+)
+
+CONCEPTO_TRASLADO: Atributos = (
+    ('Base', 'base', True),
+    ('Impuesto', 'impuesto', True),
+    ('TipoFactor', 'tipo_factor', True),
+    ('TasaOCuota', 'tasa_o_cuota', False),
+    ('Importe', 'importe', False),
+)
+
+CONCEPTO_RETENCION: Atributos = (
+    ('Base', 'base', True),
+    ('Impuesto', 'impuesto', True),
+    ('TipoFactor', 'tipo_factor', True),
+    ('TasaOCuota', 'tasa_o_cuota', True),
+    ('Importe', 'importe', True),
+)
+
+A_CUENTA_TERCEROS: Atributos = (
+    ('RfcACuentaTerceros', 'rfc_a_cuenta_terceros', True),
+    ('NombreACuentaTerceros', 'nombre_a_cuenta_terceros', True),
+    ('RegimenFiscalACuentaTerceros', 'regimen_fiscal_a_cuenta_terceros', True),
+    ('DomicilioFiscalACuentaTerceros', 'domicilio_fiscal_a_cuenta_terceros', True),
+)
+
+INFORMACION_ADUANERA: Atributos = (('NumeroPedimento', 'numero_pedimento', True),)
+
+CUENTA_PREDIAL: Atributos = (('Numero', 'numero', True),)
+
+PARTE: Atributos = (
+    ('ClaveProdServ', 'clave_prod_serv', True),
+    ('NoIdentificacion', 'no_identificacion', False),
+    ('Cantidad', 'cantidad', True),
+    ('Unidad', 'unidad', False),
+    ('Descripcion', 'descripcion', True),
+    ('ValorUnitario', 'valor_unitario', False),
+    ('Importe', 'importe', False),
+)
+
+RETENCION: Atributos = (
+    ('Impuesto', 'impuesto', True),
+    ('Importe', 'importe', True),
+)
+
+TRASLADO: Atributos = (
+    ('Base', 'base', True),
+    ('Impuesto', 'impuesto', True),
+    ('TipoFactor', 'tipo_factor', True),
+    ('TasaOCuota', 'tasa_o_cuota', False),
+    ('Importe', 'importe', False),
+)
+
+TIMBRE_FISCAL_DIGITAL: Atributos = (
+    ('Version', 'version', True),
+    ('UUID', 'uuid', True),
+    ('FechaTimbrado', 'fecha_timbrado', True),
+    ('RfcProvCertif', 'rfc_prov_certif', True),
+    ('Leyenda', 'leyenda', False),
+    ('SelloCFD', 'sello_cfd', True),
+    ('NoCertificadoSAT', 'no_certificado_sat', True),
+)
+
+
+TAGS = {
+    name: f'{{{CFDI_NAMESPACE}}}{name}'
+    for name in (
+        'Comprobante',
+        'InformacionGlobal',
+        'CfdiRelacionados',
+        'CfdiRelacionado',
+        'Emisor',
+        'Receptor',
+        'Conceptos',
+        'Concepto',
+        'Impuestos',
+        'Traslados',
+        'Traslado',
+        'Retenciones',
+        'Retencion',
+        'ACuentaTerceros',
+        'InformacionAduanera',
+        'CuentaPredial',
+        'ComplementoConcepto',
+        'Parte',
+        'Complemento',
+    )
+}
+
+
+def skip(
+    parts: list[str],
+    element: etree._Element,
+    /,
+) -> None:
+    pass
+
+
+COMPLEMENTOS: dict[str, Complemento] = {
+    # the timbre is added after the comprobante is sealed
+    TFD_TAG: skip,
+}
+"""
+Builders of the complements that are part of the cadena original, by qualified tag.
+"""
+
+
+def register_complemento(
+    tag: str,
+    complemento: Complemento,
+    /,
+) -> None:
+    """
+    Registers the builder of a complement, it receives the parts of the cadena original and appends its own values,
+    as written in the document.
+    """
+    COMPLEMENTOS[tag] = complemento
+
+
+# only the xml whitespace, as the xpath normalize-space function
+WHITESPACE = re.compile(r'[ \t\n\r]+')
+
+SEPARATOR = re.compile(r' ?\| ?')
+
+
+def normalize_space(
+    value: str,
+    /,
+) -> str:
+    return WHITESPACE.sub(' ', value).strip(' ')
+
+
+def join(
+    parts: list[str],
+    /,
+) -> str:
+    body = '|'.join(parts)
+    # normalize every value at once, unless a value has a pipe of its own
+    if body.count('|') == len(parts) - 1:
+        body = SEPARATOR.sub('|', WHITESPACE.sub(' ', body)).strip(' ')
+    else:
+        body = '|'.join(normalize_space(part) for part in parts)
+    return f'||{body}||'
+
+
+def add_element(
+    parts: list[str],
+    element: etree._Element,
+    atributos: Atributos,
+    /,
+) -> None:
+    get = element.get
+    for name, _, required in atributos:
+        value = get(name)
+        if value is not None:
+            parts.append(value)
+        elif required:
+            parts.append('')
+
+
+def add_complemento(
+    parts: list[str],
+    element: etree._Element,
+    /,
+) -> None:
+    complemento = COMPLEMENTOS.get(element.tag)  # type: ignore[call-overload]
+    if complemento is None:
+        raise ValueError(f'Unsupported complemento: {element.tag}')
+    complemento(parts, element)
+
+
+def group_children(
+    element: etree._Element,
+    /,
+) -> dict[str, list[etree._Element]]:
+    # a single pass over the children, looking each tag up is slower than reading them all
+    children: dict[str, list[etree._Element]] = {}
+    for child in element.iterchildren(etree.Element):
+        tag: str = child.tag  # type: ignore[assignment]
+        nodes = children.get(tag)
+        if nodes is None:
+            children[tag] = [child]
+        else:
+            nodes.append(child)
+    return children
+
+
+def add_children(
+    parts: list[str],
+    element: etree._Element,
+    tag: str,
+    atributos: Atributos,
+    /,
+) -> None:
+    for child in element:
+        if child.tag == tag:
+            add_element(parts, child, atributos)
+
+
+def add_concepto_element(
+    parts: list[str],
+    concepto: etree._Element,
+    /,
+) -> None:
+    add_element(parts, concepto, CONCEPTO)
+    if not len(concepto):
+        return
+    children = group_children(concepto)
+    impuestos = children.get(TAGS['Impuestos'], ())
+    for node in impuestos:
+        for traslados in node:
+            if traslados.tag == TAGS['Traslados']:
+                add_children(parts, traslados, TAGS['Traslado'], CONCEPTO_TRASLADO)
+    for node in impuestos:
+        for retenciones in node:
+            if retenciones.tag == TAGS['Retenciones']:
+                add_children(parts, retenciones, TAGS['Retencion'], CONCEPTO_RETENCION)
+    for node in children.get(TAGS['ACuentaTerceros'], ()):
+        add_element(parts, node, A_CUENTA_TERCEROS)
+    for node in children.get(TAGS['InformacionAduanera'], ()):
+        add_element(parts, node, INFORMACION_ADUANERA)
+    for node in children.get(TAGS['CuentaPredial'], ()):
+        add_element(parts, node, CUENTA_PREDIAL)
+    for node in children.get(TAGS['ComplementoConcepto'], ()):
+        for complemento in node.iterchildren(etree.Element):
+            add_complemento(parts, complemento)
+    for parte in children.get(TAGS['Parte'], ()):
+        add_element(parts, parte, PARTE)
+        add_children(parts, parte, TAGS['InformacionAduanera'], INFORMACION_ADUANERA)
+
+
+def get_comprobante(
+    xml: bytes | Path | etree._Element,
+    /,
+) -> etree._Element:
+    match xml:
+        case bytes():
+            comprobante = etree.fromstring(xml)
+        case Path():
+            comprobante = etree.fromstring(xml.read_bytes())
+        case _:
+            comprobante = xml
+    if comprobante.tag != TAGS['Comprobante']:
+        raise ValueError(f'Invalid comprobante: {comprobante.tag}')
+    return comprobante
+
+
+def cadena_original_from_xml(
+    xml: bytes | Path | etree._Element,
+    /,
+) -> str:
+    """
+    Builds the cadena original of a comprobante from its xml, as `cadenaoriginal_4_0.xslt` does, in a single pass.
+
+    The values are taken as written in the document, so the result matches the XSLT byte for byte. Complements
+    without a registered builder raise a `ValueError`, see `register_complemento`.
+    """
+    comprobante = get_comprobante(xml)
+    with span('cadena_original'):
+        parts: list[str] = []
+        add_element(parts, comprobante, COMPROBANTE)
+        for node in comprobante.iterchildren(TAGS['InformacionGlobal']):
+            add_element(parts, node, INFORMACION_GLOBAL)
+        for relacionados in comprobante.iterchildren(TAGS['CfdiRelacionados']):
+            add_element(parts, relacionados, CFDI_RELACIONADOS)
+            for node in relacionados.iterchildren(TAGS['CfdiRelacionado']):
+                add_element(parts, node, CFDI_RELACIONADO)
+        for node in comprobante.iterchildren(TAGS['Emisor']):
+            add_element(parts, node, EMISOR)
+        for node in comprobante.iterchildren(TAGS['Receptor']):
+            add_element(parts, node, RECEPTOR)
+        for conceptos in comprobante.iterchildren(TAGS['Conceptos']):
+            for concepto in conceptos.iterchildren(TAGS['Concepto']):
+                add_concepto_element(parts, concepto)
+        for impuestos in comprobante.iterchildren(TAGS['Impuestos']):
+            for retenciones in impuestos.iterchildren(TAGS['Retenciones']):
+                for retencion in retenciones.iterchildren(TAGS['Retencion']):
+                    add_element(parts, retencion, RETENCION)
+            total = impuestos.get('TotalImpuestosRetenidos')
+            if total is not None:
+                parts.append(total)
+            for traslados in impuestos.iterchildren(TAGS['Traslados']):
+                for traslado in traslados.iterchildren(TAGS['Traslado']):
+                    add_element(parts, traslado, TRASLADO)
+            total = impuestos.get('TotalImpuestosTrasladados')
+            if total is not None:
+                parts.append(total)
+        for node in comprobante.iterchildren(TAGS['Complemento']):
+            for complemento in node.iterchildren(etree.Element):
+                add_complemento(parts, complemento)
+        return join(parts)
+
+
+# compiled stylesheets by thread, an XSLT object must not be shared between threads
+transforms = local()
+
+
+def get_transform(
+    name: str = 'cadenaoriginal_4_0.xslt',
+    /,
+) -> etree.XSLT:
+    """
+    Compiled stylesheet of the bundled copy, compiled once per thread.
+    """
+    cache: dict[str, etree.XSLT] | None = getattr(transforms, 'cache', None)
+    if cache is None:
+        cache = transforms.cache = {}
+    transform = cache.get(name)
+    if transform is None:
+        # parsed from its path, so the includes resolve next to it
+        transform = cache[name] = etree.XSLT(etree.parse(STYLESHEETS / name))
+    return transform
+
+
+def cadena_original_from_xslt(
+    xml: bytes | Path | etree._Element,
+    /,
+) -> str:
+    """
+    Builds the cadena original of a comprobante with the SAT stylesheet, the reference for audits and for checking
+    the native builders.
+
+    The bundled copy only includes the timbre stylesheet, other complements raise a `ValueError` rather than being
+    left out of the cadena.
+    """
+    comprobante = get_comprobante(xml)
+    for tag in (TAGS['Complemento'], TAGS['ComplementoConcepto']):
+        for node in comprobante.iter(tag):
+            for complemento in node.iterchildren(etree.Element):
+                if complemento.tag != TFD_TAG:
+                    raise ValueError(f'Unsupported complemento: {complemento.tag}')
+    transform = get_transform()
+    with span('cadena_original.xslt'):
+        return str(transform(comprobante))
+
+
+def cadena_original(
+    xml: bytes | Path | etree._Element,
+    /,
+    *,
+    engine: Engine = 'native',
+) -> str:
+    match engine:
+        case 'native':
+            return cadena_original_from_xml(xml)
+        case 'xslt':
+            return cadena_original_from_xslt(xml)
+        case _:
+            raise ValueError(f'Invalid engine: {engine}')
+
+
+def format_value(
+    value: Any,
+    /,
+) -> str:
+    match value:
+        case str():
+            return value
+        case Decimal():
+            return format(value, 'f')
+        case datetime():
+            return value.isoformat()
+        case UUID():
+            return str(value).upper()
+        case _:
+            return str(value)
+
+
+def add_model(
+    parts: list[str],
+    model: Any,
+    atributos: Atributos,
+    /,
+) -> None:
+    for _, name, required in atributos:
+        value = getattr(model, name)
+        if value is not None:
+            parts.append(format_value(value))
+        elif required:
+            parts.append('')
+
+
+def cadena_original_from_model(
+    cfdi: 'CFDI40',
+    /,
+) -> str:
+    """
+    Builds the cadena original of a comprobante from its model, over the xml `CFDI40.to_xml(exclude_none=True)`
+    writes.
+
+    The result is the one of the serialized document, so a model sealed with it verifies once written, and
+    complements without a registered builder raise a `ValueError` as in `cadena_original_from_xml`.
+    """
+    for concepto in cfdi.conceptos:
+        # kept as plain attributes by the model, their cadena original is unknown
+        if concepto.complemento_concepto:
+            raise ValueError('Unsupported complemento: ComplementoConcepto')
+    # unset optional values are not part of the document, rather than empty attributes
+    return cadena_original_from_xml(cfdi.to_xml_tree(exclude_none=True))
+
+
+def timbre_cadena_original_from_xml(
+    element: etree._Element,
+    /,
+) -> str:
+    """
+    Builds the cadena original of a `tfd:TimbreFiscalDigital` element, as `cadenaoriginal_TFD_1_1.xslt` does.
+    """
+    if element.tag != TFD_TAG:
+        raise ValueError(f'Invalid timbre: {element.tag}')
+    with span('cadena_original.tfd'):
+        parts: list[str] = []
+        add_element(parts, element, TIMBRE_FISCAL_DIGITAL)
+        return join(parts)
+
+
+def timbre_cadena_original_from_model(
+    tfd: 'TimbreFiscalDigital',
+    /,
+) -> str:
+    with span('cadena_original.tfd'):
+        parts: list[str] = []
+        add_model(parts, tfd, TIMBRE_FISCAL_DIGITAL)
+        return join(parts)
@@ -1,16 +1,72 @@
-from .forma_pago import FormaPago
-from .moneda import Moneda
-from .tipo_de_comprobante import TipoDeComprobante
-from .exportacion import Exportacion
-from .metodo_pago import MetodoPago
-from .periodicidad import Periodicidad
-from .meses import Meses
-from .tipo_relacion import TipoRelacion
-from .regimen_fiscal import RegimenFiscal
-from .pais import Pais
-from .uso_cfdi import UsoCFDI
-from .clave_unidad import ClaveUnidad
-from .objeto_imp import ObjetoImp
-from .impuesto import Impuesto
-from .aduana import Aduana
-from .tipo_factor import TipoFactor
+from importlib import import_module as _import_module
+from typing import TYPE_CHECKING as _TYPE_CHECKING
+
+if _TYPE_CHECKING:
+    from .forma_pago import FormaPago
+    from .moneda import Moneda
+    from .tipo_de_comprobante import TipoDeComprobante
+    from .exportacion import Exportacion
+    from .metodo_pago import MetodoPago
+    from .periodicidad import Periodicidad
+    from .meses import Meses
+    from .tipo_relacion import TipoRelacion
+    from .regimen_fiscal import RegimenFiscal
+    from .pais import Pais
+    from .uso_cfdi import UsoCFDI
+    from .clave_unidad import ClaveUnidad
+    from .objeto_imp import ObjetoImp
+    from .impuesto import Impuesto
+    from .aduana import Aduana
+    from .tipo_factor import TipoFactor
+
+_MODULES = {
+    'FormaPago': 'forma_pago',
+    'Moneda': 'moneda',
+    'TipoDeComprobante': 'tipo_de_comprobante',
+    'Exportacion': 'exportacion',
+    'MetodoPago': 'metodo_pago',
+    'Periodicidad': 'periodicidad',
+    'Meses': 'meses',
+    'TipoRelacion': 'tipo_relacion',
+    'RegimenFiscal': 'regimen_fiscal',
+    'Pais': 'pais',
+    'UsoCFDI': 'uso_cfdi',
+    'ClaveUnidad': 'clave_unidad',
+    'ObjetoImp': 'objeto_imp',
+    'Impuesto': 'impuesto',
+    'Aduana': 'aduana',
+    'TipoFactor': 'tipo_factor',
+}
+
+__all__ = [
+    'FormaPago',
+    'Moneda',
+    'TipoDeComprobante',
+    'Exportacion',
+    'MetodoPago',
+    'Periodicidad',
+    'Meses',
+    'TipoRelacion',
+    'RegimenFiscal',
+    'Pais',
+    'UsoCFDI',
+    'ClaveUnidad',
+    'ObjetoImp',
+    'Impuesto',
+    'Aduana',
+    'TipoFactor',
+]
+
+
+def __getattr__(
+    name: str,
+    /,
+) -> type:
+    # catalogs are only imported when first used, some of them are huge
+    try:
+        module = _MODULES[name]
+    except KeyError:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}') from None
+    value = getattr(_import_module(f'.{module}', __name__), name)
+    globals()[name] = value
+    return value
@@ -1,11 +1,12 @@
 from datetime import datetime
 from decimal import Decimal
 from pathlib import Path
-from typing import IO, Annotated, Literal
+from typing import IO, TYPE_CHECKING, Annotated, Literal
 from urllib.parse import urlencode
 
 from pydantic import StringConstraints
-from pydantic_xml import attr, element, wrapped
+from pydantic_xml import attr, element, wrapped, xml_field_serializer
+from pydantic_xml.element import XmlElementWriter
 
 from cfdi import fields
 from cfdi.v40 import catalogos
@@ -18,6 +19,11 @@ from cfdi.v40.impuestos import Impuestos
 from cfdi.v40.informacion_global import InformacionGlobal
 from cfdi.v40.receptor import Receptor
 
+if TYPE_CHECKING:
+    from cfdi.sinks import Sink
+    from cfdi.v40.descriptions import DescriptionProvider
+    from cfdi.v40.sello import CSD
+
 
 class CFDI40(
     BaseModel,
@@ -233,6 +239,18 @@ class CFDI40(
     Atributo requerido para expresar si el comprobante ampara una operación de exportación.
     """
 
+    @xml_field_serializer('descuento')
+    def serialize_descuento(
+        self,
+        element: XmlElementWriter,
+        value: Decimal,
+        field_name: str,
+        /,
+    ) -> None:
+        # optional, written when the document has one or it was set explicitly
+        if value or field_name in self.model_fields_set:
+            element.set_attribute('Descuento', str(value))
+
     @property
     def verifica_cfdi_url(self) -> str | None:
         """
@@ -253,14 +271,43 @@ class CFDI40(
         }
         return f'https://verificacfdi.facturaelectronica.sat.gob.mx?{urlencode(params)}'
 
+    @property
+    def cadena_original(self) -> str:
+        """
+        Cadena original of the comprobante, in the order of the anexo 20 as built by `cadenaoriginal_4_0.xslt`.
+        """
+        from cfdi.v40.cadena import cadena_original_from_model
+
+        return cadena_original_from_model(self)
+
+    def sign(
+        self,
+        csd: 'CSD | None' = None,
+        /,
+    ) -> None:
+        """
+        Seals the comprobante with `csd`, or with the loaded CSD of its `no_certificado`, see `cfdi.v40.sello`.
+        """
+        from cfdi.v40.sello import sign_cfdi
+
+        sign_cfdi(self, csd)
+
+    def verify_sello(
+        self,
+    ) -> bool:
+        from cfdi.v40.sello import verify_sello
+
+        return verify_sello(self)
+
     def save_pdf(
         self,
-        filename: str | IO[bytes],
+        filename: 'str | Path | IO[bytes] | Sink',
         /,
         *,
         logo: str | Path | IO[bytes] | None = None,
         logo_size: tuple[int, int] = (50, 50),
         logo_cords: tuple[int, int] | None = None,
+        provider: 'DescriptionProvider | None' = None,
     ) -> None:
         from cfdi.v40.pdf import generate_pdf
 
@@ -270,4 +317,23 @@ class CFDI40(
             logo=logo,
             logo_size=logo_size,
             logo_cords=logo_cords,
+            provider=provider,
+        )
+
+    def render_pdf(
+        self,
+        *,
+        logo: str | Path | IO[bytes] | None = None,
+        logo_size: tuple[int, int] = (50, 50),
+        logo_cords: tuple[int, int] | None = None,
+        provider: 'DescriptionProvider | None' = None,
+    ) -> bytes:
+        from cfdi.v40.pdf import render_pdf
+
+        return render_pdf(
+            self,
+            logo=logo,
+            logo_size=logo_size,
+            logo_cords=logo_cords,
+            provider=provider,
         )
@@ -1,6 +1,7 @@
 from uuid import UUID
 
-from pydantic_xml import attr
+from pydantic_xml import attr, xml_field_serializer
+from pydantic_xml.element import XmlElementWriter
 
 from cfdi.v40.base import BaseModel
 
@@ -23,3 +24,14 @@ class CFDIRelacionado(
     Si este comprobante es una devolución sobre el comprobante relacionado. Si éste sustituye a una factura
     cancelada.
     """
+
+    @xml_field_serializer('uuid')
+    def serialize_uuid(
+        self,
+        element: XmlElementWriter,
+        value: UUID,
+        field_name: str,
+        /,
+    ) -> None:
+        # folios fiscales are written in uppercase, as the SAT issues them
+        element.set_attribute('UUID', str(value).upper())
@@ -1,4 +1,9 @@
+from lxml import etree
+from pydantic_xml import element, xml_field_serializer, xml_field_validator
+from pydantic_xml.element import XmlElementReader, XmlElementWriter
+
 from cfdi.v40.base import BaseModel
+from cfdi.v40.cadena import TFD_TAG
 from cfdi.v40.complemento.timbre_fiscal_digital import TimbreFiscalDigital
 
 
@@ -7,3 +12,33 @@ class Complemento(
     tag='Complemento',
 ):
     timbre_fiscal_digital: TimbreFiscalDigital | None = None
+    otros: list[str] = element(default_factory=list)
+    """
+    Complementos sin modelo, guardados tal como vienen en el documento para que se serialicen de vuelta
+    """
+
+    @xml_field_validator('otros')
+    @classmethod
+    def validate_otros(
+        cls,
+        element: XmlElementReader,
+        field_name: str,
+        /,
+    ) -> list[str]:
+        # the timbre is bound by its own field
+        return [
+            etree.tostring(child.to_native(), encoding='unicode')
+            for child in element.pop_elements()
+            if child.tag != TFD_TAG
+        ]
+
+    @xml_field_serializer('otros')
+    def serialize_otros(
+        self,
+        element: XmlElementWriter,
+        value: list[str],
+        field_name: str,
+        /,
+    ) -> None:
+        for xml in value:
+            element.append_element(element.from_native(etree.fromstring(xml)))
@@ -1,5 +1,4 @@
 from datetime import datetime
-from re import sub
 from uuid import UUID
 
 from pydantic_xml import BaseXmlModel, attr
@@ -98,25 +97,18 @@ class TimbreFiscalDigital(
         La secuencia de formación será siempre en el orden que se expresa a continuación, tomando en cuenta las reglas generales expresadas en el párrafo anterior.
 
         - Atributos del elemento raíz TimbreFiscalDigital
-            1. versión
+            1. Version
             2. UUID
             3. FechaTimbrado
-            4. selloCFD
-            5. noCertificadoSAT
+            4. RfcProvCertif
+            5. Leyenda
+            6. SelloCFD
+            7. NoCertificadoSAT
 
         # Nota
 
-        El atributo selloCFD será el sello previo del Comprobante Fiscal Digital, el sello del timbre será guardado dentro del atributo selloSAT. Esta cadena original será sellada utilizando el algoritmo de digestión SHA-1.
+        El atributo SelloCFD será el sello previo del Comprobante Fiscal Digital, el sello del timbre será guardado dentro del atributo SelloSAT. Esta cadena original será sellada utilizando el algoritmo de digestión SHA-256.
         """
-        campos = [
-            self.version,
-            str(self.uuid).upper(),
-            self.fecha_timbrado.strftime('%Y-%m-%dT%H:%M:%S'),
-            self.sello_sat,
-            self.no_certificado_sat,
-        ]
-        cadena_original = '|'.join(campos)
-        cadena_original = sub(r'\s', ' ', cadena_original)
-        cadena_original = sub(r'\s+', ' ', cadena_original)
-        cadena_original.strip()
-        return f'||{cadena_original}||'
+        from cfdi.v40.cadena import timbre_cadena_original_from_model
+
+        return timbre_cadena_original_from_model(self)
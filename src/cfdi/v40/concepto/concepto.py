@@ -2,7 +2,8 @@ from decimal import Decimal
 from typing import Annotated
 
 from pydantic import StringConstraints
-from pydantic_xml import attr, element
+from pydantic_xml import attr, element, xml_field_serializer
+from pydantic_xml.element import XmlElementWriter
 
 from cfdi import fields
 from cfdi.v40 import catalogos
@@ -142,3 +143,15 @@ class Concepto(
     """
     Nodo opcional para registrar información del contribuyente Tercero, a cuenta del que se realiza la operación.
     """
+
+    @xml_field_serializer('descuento')
+    def serialize_descuento(
+        self,
+        element: XmlElementWriter,
+        value: Decimal,
+        field_name: str,
+        /,
+    ) -> None:
+        # optional, written when there is one or it was set explicitly
+        if value or field_name in self.model_fields_set:
+            element.set_attribute('Descuento', str(value))
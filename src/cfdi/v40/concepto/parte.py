@@ -1,6 +1,6 @@
 from typing import Annotated
 
-from pydantic import NonNegativeFloat, StringConstraints
+from pydantic import StringConstraints
 from pydantic_xml import attr
 
 from cfdi import fields
@@ -75,7 +75,9 @@ class Parte(
     Atributo requerido para precisar la descripción del bien o servicio cubierto por la presente parte.
     """
 
-    valor_unitario: NonNegativeFloat | None = attr('ValorUnitario', default=None)
+    valor_unitario: fields.NonNegativeSixDecimals | None = attr(
+        'ValorUnitario', default=None
+    )
     """
     Atributo opcional para precisar el valor o precio unitario del bien o servicio cubierto por la presente parte.
     No se permiten valores negativos
@@ -0,0 +1,378 @@
+import sqlite3
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Mapping
+from itertools import batched
+from pathlib import Path
+from threading import Lock
+from time import monotonic, sleep
+from typing import TYPE_CHECKING, Literal, NamedTuple, Protocol, cast
+
+from cfdi import _PACKAGE_ROOT
+from cfdi.instrumentation import span
+
+if TYPE_CHECKING:
+    from mypy_boto3_dynamodb.service_resource import Table as DynamodbTable
+
+
+type Catalogo = Literal[
+    'FORMA_PAGO',
+    'MONEDA',
+    'TIPO_DE_COMPROBANTE',
+    'EXPORTACION',
+    'METODO_PAGO',
+    'CODIGO_POSTAL',
+    'PERIODICIDAD',
+    'MESES',
+    'TIPO_RELACION',
+    'REGIMEN_FISCAL',
+    'PAIS',
+    'USO_CFDI',
+    'CLAVE_PROD_SERV',
+    'CLAVE_UNIDAD',
+    'OBJETO_IMP',
+    'IMPUESTO',
+    'TIPO_FACTOR',
+    'ADUANA',
+    'COLONIA',
+    'ESTADO',
+    'LOCALIDAD',
+    'MUNICIPIO',
+]
+
+CATALOGOS_FILE = _PACKAGE_ROOT / 'v40' / 'catalogos.sqlite3'
+"""
+Bundled catalog file, generated with `scripts/script.py generate-catalog`.
+"""
+
+
+type Key = tuple[Catalogo, str]
+
+
+class DescriptionProvider(Protocol):
+    """
+    Source of the descriptions of the SAT catalog keys.
+    """
+
+    def get_description(
+        self,
+        value: str,
+        catalogo: Catalogo,
+        /,
+    ) -> str: ...
+
+    def get_descriptions(
+        self,
+        keys: Iterable[Key],
+        /,
+    ) -> dict[Key, str]:
+        """
+        Resolves many `(catalogo, value)` pairs at once, keys without a description are left out.
+        """
+        ...
+
+
+class SQLiteDescriptionProvider:
+    """
+    Reads the descriptions from a local, read-only SQLite catalog file, memory mapped by SQLite.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = CATALOGOS_FILE,
+        /,
+        *,
+        mmap_size: int = 256 * 1024 * 1024,
+    ) -> None:
+        path = Path(path)
+        if not path.is_file():
+            raise FileNotFoundError(
+                f'Catalog file {path} not found. You can generate it with "scripts/script.py generate-catalog".'
+            )
+        # immutable skips all locking, the file is never written at runtime
+        self.connection = sqlite3.connect(
+            f'{path.resolve().as_uri()}?mode=ro&immutable=1',
+            uri=True,
+            check_same_thread=False,
+        )
+        self.connection.execute(f'PRAGMA mmap_size = {int(mmap_size)}')
+
+    def get_description(
+        self,
+        value: str,
+        catalogo: Catalogo,
+        /,
+    ) -> str:
+        row = self.connection.execute(
+            'SELECT name FROM catalogos WHERE pk = ? AND sk = ?',
+            (catalogo, value),
+        ).fetchone()
+        if row is None:
+            raise KeyError(f'{catalogo} {value}')
+        return cast(str, row[0])
+
+    def get_descriptions(
+        self,
+        keys: Iterable[Key],
+        /,
+    ) -> dict[Key, str]:
+        descriptions: dict[Key, str] = {}
+        # stay well below the limit of bound parameters
+        for chunk in batched(dict.fromkeys(keys), 500):
+            values = ', '.join('(?, ?)' for _ in chunk)
+            rows = self.connection.execute(
+                f'SELECT pk, sk, name FROM catalogos WHERE (pk, sk) IN (VALUES {values})',
+                [part for key in chunk for part in key],
+            )
+            for catalogo, value, name in rows:
+                descriptions[catalogo, value] = name
+        return descriptions
+
+
+class DynamoDBDescriptionProvider:
+    """
+    Reads the descriptions from the DynamoDB table generated with `scripts/script.py generate-database`.
+
+    Keys left unprocessed by a throttled `batch_get_item` are requested again up to `max_attempts` times, backing
+    off exponentially up to `max_delay` seconds between attempts.
+    """
+
+    def __init__(
+        self,
+        table: 'DynamodbTable',
+        /,
+        *,
+        max_attempts: int = 8,
+        max_delay: float = 1.0,
+    ) -> None:
+        self.table = table
+        self.max_attempts = max_attempts
+        self.max_delay = max_delay
+
+    def get_description(
+        self,
+        value: str,
+        catalogo: Catalogo,
+        /,
+    ) -> str:
+        item = self.table.get_item(
+            Key={
+                'pk': catalogo,
+                'sk': value,
+            },
+        ).get('Item')
+        if item is None:
+            raise KeyError(f'{catalogo} {value}')
+        return cast(str, item['name'])
+
+    def get_descriptions(
+        self,
+        keys: Iterable[Key],
+        /,
+    ) -> dict[Key, str]:
+        descriptions: dict[Key, str] = {}
+        # the client of a resource takes and returns plain python values
+        client = self.table.meta.client
+        # batch_get_item accepts up to 100 keys per request
+        for chunk in batched(dict.fromkeys(keys), 100):
+            request = {
+                self.table.name: {
+                    'Keys': [
+                        {'pk': catalogo, 'sk': value} for catalogo, value in chunk
+                    ],
+                },
+            }
+            attempt = 0
+            while request:
+                response = client.batch_get_item(RequestItems=request)  # type: ignore[arg-type]
+                for item in response['Responses'].get(self.table.name, []):
+                    key = cast(Key, (item['pk'], item['sk']))
+                    descriptions[key] = cast(str, item['name'])
+                request = response.get('UnprocessedKeys') or {}  # type: ignore[assignment]
+                # back off when the table is throttling
+                if request:
+                    attempt += 1
+                    if attempt >= self.max_attempts:
+                        raise RuntimeError(f'Unprocessed keys after {attempt} attempts')
+                    sleep(min(0.05 * 2 ** (attempt - 1), self.max_delay))
+        return descriptions
+
+
+class MappingDescriptionProvider:
+    """
+    Reads the descriptions from an in-memory mapping of `(catalogo, value)` pairs.
+    """
+
+    def __init__(
+        self,
+        descriptions: Mapping[Key, str],
+        /,
+    ) -> None:
+        self.descriptions = descriptions
+
+    def get_description(
+        self,
+        value: str,
+        catalogo: Catalogo,
+        /,
+    ) -> str:
+        try:
+            return self.descriptions[catalogo, value]
+        except KeyError:
+            raise KeyError(f'{catalogo} {value}') from None
+
+    def get_descriptions(
+        self,
+        keys: Iterable[Key],
+        /,
+    ) -> dict[Key, str]:
+        return {key: self.descriptions[key] for key in keys if key in self.descriptions}
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+
+class CachedDescriptionProvider:
+    """
+    Bounded, thread-safe LRU cache in front of another provider.
+
+    Entries expire `ttl` seconds after being fetched, so updates to the SAT catalogs are eventually picked up.
+    Missing keys are never cached.
+    """
+
+    def __init__(
+        self,
+        provider: DescriptionProvider,
+        /,
+        *,
+        maxsize: int = 4096,
+        ttl: float | None = 24 * 60 * 60,
+        clock: Callable[[], float] = monotonic,
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError('maxsize must be greater than zero')
+        self.provider = provider
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.clock = clock
+        self.lock = Lock()
+        # key -> (description, expiration)
+        self.entries: OrderedDict[Key, tuple[str, float | None]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def lookup(
+        self,
+        key: Key,
+        now: float,
+        /,
+    ) -> str | None:
+        # must be called holding the lock
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        description, expiration = entry
+        if expiration is not None and expiration <= now:
+            del self.entries[key]
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return description
+
+    def store(
+        self,
+        descriptions: Mapping[Key, str],
+        /,
+    ) -> None:
+        expiration = None if self.ttl is None else self.clock() + self.ttl
+        with self.lock:
+            for key, description in descriptions.items():
+                self.entries[key] = (description, expiration)
+                self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def get_description(
+        self,
+        value: str,
+        catalogo: Catalogo,
+        /,
+    ) -> str:
+        key: Key = (catalogo, str(value))
+        with self.lock:
+            description = self.lookup(key, self.clock())
+        if description is None:
+            # fetched outside of the lock, concurrent misses may both hit the backend
+            with span('catalog.fetch'):
+                description = self.provider.get_description(value, catalogo)
+            self.store({key: description})
+        return description
+
+    def get_descriptions(
+        self,
+        keys: Iterable[Key],
+        /,
+    ) -> dict[Key, str]:
+        descriptions: dict[Key, str] = {}
+        missing: list[Key] = []
+        with self.lock:
+            now = self.clock()
+            for key in dict.fromkeys(keys):
+                description = self.lookup(key, now)
+                if description is None:
+                    missing.append(key)
+                else:
+                    descriptions[key] = description
+        if missing:
+            with span('catalog.fetch'):
+                fetched = self.provider.get_descriptions(missing)
+            self.store(fetched)
+            descriptions.update(fetched)
+        return descriptions
+
+    def cache_info(
+        self,
+    ) -> CacheInfo:
+        with self.lock:
+            return CacheInfo(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                size=len(self.entries),
+                maxsize=self.maxsize,
+            )
+
+    def cache_clear(
+        self,
+    ) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+
+default_provider: DescriptionProvider | None = None
+
+
+def get_default_provider() -> DescriptionProvider:
+    global default_provider
+    if default_provider is None:
+        default_provider = CachedDescriptionProvider(SQLiteDescriptionProvider())
+    return default_provider
+
+
+def set_default_provider(
+    provider: DescriptionProvider | None,
+    /,
+) -> None:
+    global default_provider
+    default_provider = provider
@@ -1,6 +1,7 @@
 from decimal import Decimal
 
-from pydantic_xml import attr, wrapped
+from pydantic_xml import attr, wrapped, xml_field_serializer
+from pydantic_xml.element import XmlElementWriter
 
 from cfdi import fields
 from cfdi.v40.base import BaseModel
@@ -47,3 +48,27 @@ class Impuestos(
     expresados en el comprobante fiscal digital por Internet. No se permiten valores negativos. Es requerido cuando
     en los conceptos se registren impuestos trasladados.
     """
+
+    @xml_field_serializer('total_impuestos_retenidos')
+    def serialize_total_impuestos_retenidos(
+        self,
+        element: XmlElementWriter,
+        value: Decimal,
+        field_name: str,
+        /,
+    ) -> None:
+        # conditional, written along the retenciones it totals or when it was set explicitly
+        if self.retenciones or value or field_name in self.model_fields_set:
+            element.set_attribute('TotalImpuestosRetenidos', str(value))
+
+    @xml_field_serializer('total_impuestos_trasladados')
+    def serialize_total_impuestos_trasladados(
+        self,
+        element: XmlElementWriter,
+        value: Decimal,
+        field_name: str,
+        /,
+    ) -> None:
+        # conditional, written along the traslados it totals or when it was set explicitly
+        if self.traslados or value or field_name in self.model_fields_set:
+            element.set_attribute('TotalImpuestosTrasladados', str(value))
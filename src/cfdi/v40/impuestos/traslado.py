@@ -1,6 +1,7 @@
 from decimal import Decimal
 
-from pydantic_xml import attr
+from pydantic_xml import attr, xml_field_serializer
+from pydantic_xml.element import XmlElementWriter
 
 from cfdi import fields
 from cfdi.v40 import catalogos
@@ -44,3 +45,16 @@ class Traslado(
     Atributo condicional para señalar la suma del importe del impuesto trasladado, agrupado por impuesto, TipoFactor
     y TasaOCuota. No se permiten valores negativos.
     """
+
+    @xml_field_serializer('tasa_o_cuota', 'importe')
+    def serialize_importe(
+        self,
+        element: XmlElementWriter,
+        value: Decimal,
+        field_name: str,
+        /,
+    ) -> None:
+        # conditional, an exento traslado has neither tasa nor importe unless they were set explicitly
+        if self.tipo_factor != 'Exento' or value or field_name in self.model_fields_set:
+            name = 'TasaOCuota' if field_name == 'tasa_o_cuota' else 'Importe'
+            element.set_attribute(name, str(value))
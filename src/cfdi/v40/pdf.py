@@ -7,20 +7,40 @@ except ModuleNotFoundError as e:
     ) from e
 
 
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable, Iterator
+from contextvars import ContextVar
 from decimal import Decimal
+from functools import cache, partial
+from hashlib import sha256
 from io import BytesIO
 from pathlib import Path
-from typing import IO, TYPE_CHECKING, Literal, cast
+from threading import Lock
+from typing import IO, TYPE_CHECKING, NamedTuple
 
 import qrcode
 import qrcode.constants
-from boto3 import resource
-from num2words import num2words
 from reportlab.lib import colors, enums
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import ParagraphStyle
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfgen.canvas import Canvas
-from reportlab.platypus import Image, Paragraph, Table, TableStyle
+from reportlab.platypus import Flowable, Paragraph, Table, TableStyle
+
+from cfdi.instrumentation import span
+from cfdi.pool import TaskError, flatten_error, pool_map
+from cfdi.sinks import FileSink, Sink
+from cfdi.v40.descriptions import (
+    CachedDescriptionProvider,
+    CacheInfo,
+    Catalogo,
+    DescriptionProvider,
+    DynamoDBDescriptionProvider,
+    Key,
+    get_default_provider,
+)
+from cfdi.words import amount_to_words
 
 if TYPE_CHECKING:
     from mypy_boto3_dynamodb.service_resource import Table as DynamodbTable
@@ -28,34 +48,39 @@ if TYPE_CHECKING:
     from cfdi.v40 import CFDI40
 
 
+FONTS = ('Helvetica', 'Helvetica-Bold')
+
 table: 'None | DynamodbTable' = None
-dynamodb = resource('dynamodb')
-
-
-type Catalogo = Literal[
-    'FORMA_PAGO',
-    'MONEDA',
-    'TIPO_DE_COMPROBANTE',
-    'EXPORTACION',
-    'METODO_PAGO',
-    'CODIGO_POSTAL',
-    'PERIODICIDAD',
-    'MESES',
-    'TIPO_RELACION',
-    'REGIMEN_FISCAL',
-    'PAIS',
-    'USO_CFDI',
-    'CLAVE_PROD_SERV',
-    'CLAVE_UNIDAD',
-    'OBJETO_IMP',
-    'IMPUESTO',
-    'TIPO_FACTOR',
-    'ADUANA',
-    'COLONIA',
-    'ESTADO',
-    'LOCALIDAD',
-    'MUNICIPIO',
-]
+
+table_provider: 'tuple[DynamodbTable, DescriptionProvider] | None' = None
+
+
+def __getattr__(
+    name: str,
+    /,
+):
+    # the dynamodb resource is created on first use rather than at import time
+    if name != 'dynamodb':
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    from boto3 import resource
+
+    value = resource('dynamodb')
+    globals()[name] = value
+    return value
+
+
+def get_provider() -> DescriptionProvider:
+    global table_provider
+    # a table assigned to the module keeps working
+    if table is None:
+        return get_default_provider()
+    # the cache is kept while the same table stays assigned
+    if table_provider is None or table_provider[0] is not table:
+        table_provider = (
+            table,
+            CachedDescriptionProvider(DynamoDBDescriptionProvider(table)),
+        )
+    return table_provider[1]
 
 
 def get_description(
@@ -63,15 +88,33 @@ def get_description(
     catalogo: Catalogo,
     /,
 ) -> str:
-    assert table is not None
-    item = table.get_item(
-        Key={
-            'pk': catalogo,
-            'sk': value,
-        },
-    ).get('Item')
-    assert item
-    return cast(str, item['name'])
+    return get_provider().get_description(value, catalogo)
+
+
+def get_catalog_keys(
+    cfdi: 'CFDI40',
+    /,
+) -> set[Key]:
+    """
+    Collects every `(catalogo, value)` pair printed by `generate_pdf`.
+    """
+    keys: set[Key] = {
+        ('TIPO_DE_COMPROBANTE', str(cfdi.tipo_de_comprobante)),
+        ('REGIMEN_FISCAL', str(cfdi.emisor.regimen_fiscal)),
+        ('USO_CFDI', str(cfdi.receptor.uso_cfdi)),
+        ('REGIMEN_FISCAL', str(cfdi.receptor.regimen_fiscal_receptor)),
+    }
+    for concepto in cfdi.conceptos:
+        keys.add(('CLAVE_UNIDAD', str(concepto.clave_unidad)))
+        keys.add(('CLAVE_PROD_SERV', str(concepto.clave_prod_serv)))
+        if concepto.impuestos is not None:
+            for traslado in concepto.impuestos.traslados:
+                keys.add(('IMPUESTO', str(traslado.impuesto)))
+    if cfdi.metodo_pago:
+        keys.add(('METODO_PAGO', str(cfdi.metodo_pago)))
+    if cfdi.forma_pago:
+        keys.add(('FORMA_PAGO', str(cfdi.forma_pago)))
+    return keys
 
 
 def format_as_number(
@@ -90,58 +133,551 @@ def format_as_percentage(
 
 def format_as_words(
     decimal: Decimal,
+    moneda: str = 'MXN',
+    /,
 ) -> str:
-    pesos, centavos = divmod(decimal, 1)
-    pesos_as_words = num2words(pesos, lang='es').upper()
-    centavos = int(centavos * 100)
-    resultado = f'{pesos_as_words} PESOS CON {centavos:02d}/100 MXN'
-    return resultado
+    return amount_to_words(decimal, moneda)
+
+
+type LogoSource = str | Path | bytes | IO[bytes]
+
+
+class Logo(NamedTuple):
+    """
+    Logo decoded once by a `LogoRegistry`.
+    """
+
+    key: str
+    image: ImageReader
+
+
+class LogoRegistry:
+    """
+    Bounded, thread-safe LRU of decoded logos.
+
+    Files are keyed by path, modification time and size, so an updated file is decoded again, everything else by the
+    SHA-256 of its content. Each document stores a logo once, as a form XObject shared by all of its pages.
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int = 256,
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError('maxsize must be greater than zero')
+        self.maxsize = maxsize
+        self.lock = Lock()
+        self.entries: OrderedDict[Hashable, Logo] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(
+        self,
+        logo: LogoSource,
+        /,
+    ) -> Logo:
+        data: bytes | None = None
+        match logo:
+            case str() | Path():
+                path = Path(logo).resolve()
+                stat = path.stat()
+                key: Hashable = (str(path), stat.st_mtime_ns, stat.st_size)
+            case bytes():
+                data = logo
+                key = sha256(data).hexdigest()
+            case _:
+                data = logo.read()
+                key = sha256(data).hexdigest()
+
+        with self.lock:
+            cached = self.entries.get(key)
+            if cached is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        # decoded outside of the lock
+        if data is None:
+            data = Path(logo).read_bytes()  # type: ignore[arg-type]
+        image = ImageReader(BytesIO(data))
+        image.getRGBData()
+        value = Logo(sha256(data).hexdigest()[:16], image)
+
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def cache_info(
+        self,
+    ) -> CacheInfo:
+        with self.lock:
+            return CacheInfo(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                size=len(self.entries),
+                maxsize=self.maxsize,
+            )
+
+    def cache_clear(
+        self,
+    ) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+
+logos = LogoRegistry()
+
+
+MX = 40
+MY = 50
+WIDTH, HEIGHT = letter
+FONT_SIZE = 8
+GRAY_COLOR = colors.HexColor(0x666666)
+GRID_COLOR = colors.HexColor(0xC8C8C8)
+
+# the qr, the legends and the sellos are kept on the bottom of the last page
+FOOTER_TOP = MY + 200 + 100
+FOOTER_TEXT_X_OFFSET = MX + 100 + 10
+FOOTER_TEXT_Y_OFFSET = FOOTER_TOP - 15
+
+# static layout of the first page header, see `draw_header`
+HEADER_SEPARATORS_OFFSETS = (HEIGHT - MY - 30, HEIGHT - MY - 110)
+HEADER_LABELS_OFFSET = HEIGHT - MY - 50
+
+CONTINUATION_HEADER_SEPARATOR_OFFSET = HEIGHT - MY - 10
+
+CONCEPTS_TABLE_WIDTH = WIDTH - MX * 2
+CONCEPTS_TABLE_COLUMNS_WIDTH = [
+    # cantidad
+    CONCEPTS_TABLE_WIDTH * 0.09,
+    # unidad
+    CONCEPTS_TABLE_WIDTH * 0.09,
+    # descripcion
+    CONCEPTS_TABLE_WIDTH * 0.40,
+    # valor unitario
+    CONCEPTS_TABLE_WIDTH * 0.12,
+    # impuestos
+    CONCEPTS_TABLE_WIDTH * 0.18,
+    # importe
+    CONCEPTS_TABLE_WIDTH * 0.12,
+]
+CONCEPTS_TABLE_PADDING = (1, 0, 3, 3)
+
+CONCEPTS_TABLE_HEADERS_STYLE = ParagraphStyle(
+    'concepts_table_headers_style',
+    fontName='Helvetica-Bold',
+    fontSize=FONT_SIZE,
+    alignment=enums.TA_CENTER,
+    textColor=colors.white,
+)
+
+CONCEPTS_TABLE_BODY_STYLE = ParagraphStyle(
+    'concepts_table_body_style',
+    fontName='Helvetica',
+    fontSize=FONT_SIZE,
+    textColor=GRAY_COLOR,
+)
+
+CONCEPTS_TABLE_BODY_LEFT_STYLE = ParagraphStyle(
+    'concepts_table_body_left_style',
+    parent=CONCEPTS_TABLE_BODY_STYLE,
+    alignment=enums.TA_LEFT,
+)
+
+CONCEPTS_TABLE_BODY_CENTER_STYLE = ParagraphStyle(
+    'concepts_table_body_center_style',
+    parent=CONCEPTS_TABLE_BODY_STYLE,
+    alignment=enums.TA_CENTER,
+)
+
+CONCEPTS_TABLE_BODY_RIGHT_STYLE = ParagraphStyle(
+    'concepts_table_body_right_style',
+    parent=CONCEPTS_TABLE_BODY_STYLE,
+    alignment=enums.TA_RIGHT,
+)
+
+CONCEPTS_TABLE_BODY_LEFT_BLACK_STYLE = ParagraphStyle(
+    'concepts_table_body_left_black_style',
+    parent=CONCEPTS_TABLE_BODY_LEFT_STYLE,
+    textColor=colors.black,
+)
+
+TRASLADOS_TABLE_HEADERS_STYLE = ParagraphStyle(
+    'traslados_table_headers_style',
+    fontName='Helvetica-Bold',
+    fontSize=FONT_SIZE,
+    alignment=enums.TA_CENTER,
+    textColor=GRAY_COLOR,
+)
+
+TRASLADOS_TABLE_BODY_STYLE = ParagraphStyle(
+    'traslados_table_body_style',
+    fontName='Helvetica',
+    fontSize=FONT_SIZE,
+    textColor=GRAY_COLOR,
+    alignment=enums.TA_CENTER,
+)
+
+SELLOS_TABLE_HEADERS_STYLE = ParagraphStyle(
+    'sellos_table_headers_style',
+    fontName='Helvetica',
+    fontSize=FONT_SIZE,
+    alignment=enums.TA_CENTER,
+    textColor=colors.white,
+)
+
+SELLOS_TABLE_BODY_STYLE = ParagraphStyle(
+    'sellos_table_body_style',
+    fontName='Helvetica',
+    fontSize=FONT_SIZE,
+    textColor=GRAY_COLOR,
+    alignment=enums.TA_CENTER,
+)
+
+CONCEPTS_TABLE_HEADERS_TABLE_STYLE = TableStyle(
+    [
+        ('BACKGROUND', (0, 0), (-1, -1), colors.black),
+        ('GRID', (0, 0), (-1, -1), 1, GRID_COLOR),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('TOPPADDING', (0, 0), (-1, -1), CONCEPTS_TABLE_PADDING[0]),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), CONCEPTS_TABLE_PADDING[1]),
+        ('LEFTPADDING', (0, 0), (-1, -1), CONCEPTS_TABLE_PADDING[2]),
+        ('RIGHTPADDING', (0, 0), (-1, -1), CONCEPTS_TABLE_PADDING[3]),
+    ]
+)
+
+CONCEPTS_TABLE_STYLE = TableStyle(
+    [
+        ('GRID', (0, 0), (-1, -1), 1, GRID_COLOR),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('TOPPADDING', (0, 0), (-1, -1), CONCEPTS_TABLE_PADDING[0]),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), CONCEPTS_TABLE_PADDING[1]),
+        ('LEFTPADDING', (0, 0), (-1, -1), CONCEPTS_TABLE_PADDING[2]),
+        ('RIGHTPADDING', (0, 0), (-1, -1), CONCEPTS_TABLE_PADDING[3]),
+    ]
+)
+
+TOTALES_TABLE_STYLE = TableStyle(
+    [
+        # importe con letra
+        ('BACKGROUND', (0, 0), (3, 0), colors.black),
+        # general
+        ('GRID', (0, 0), (-1, -1), 1, GRID_COLOR),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('TOPPADDING', (0, 0), (-1, -1), CONCEPTS_TABLE_PADDING[0]),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), CONCEPTS_TABLE_PADDING[1]),
+        ('LEFTPADDING', (0, 0), (-1, -1), CONCEPTS_TABLE_PADDING[2]),
+        ('RIGHTPADDING', (0, 0), (-1, -1), CONCEPTS_TABLE_PADDING[3]),
+        # colspan
+        ('SPAN', (0, 0), (3, 0)),
+        ('SPAN', (0, 1), (3, 1)),
+        ('SPAN', (0, 2), (3, 2)),
+        ('SPAN', (0, 3), (3, 3)),
+    ]
+)
+
+TRASLADOS_TABLE_STYLE = TableStyle(
+    [
+        # head
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('TOPPADDING', (0, 0), (-1, -1), 1),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 1),
+        # colspan
+        ('SPAN', (0, 0), (3, 0)),
+    ]
+)
+
+SELLOS_TABLE_STYLE = TableStyle(
+    [
+        # headers
+        ('BACKGROUND', (0, 0), (0, 0), colors.black),
+        ('BACKGROUND', (0, 2), (0, 2), colors.black),
+        ('BACKGROUND', (0, 4), (0, 4), colors.black),
+        # general
+        ('GRID', (0, 0), (-1, -1), 1, GRID_COLOR),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('TOPPADDING', (0, 0), (-1, -1), 0),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 0),
+        ('LEFTPADDING', (0, 0), (-1, -1), 40),
+        ('RIGHTPADDING', (0, 0), (-1, -1), 40),
+    ]
+)
+
+type Describe = Callable[[str, Catalogo], str]
+
+type Row = list[Flowable | list[Flowable] | str]
+
+
+def use_form(
+    pdf: Canvas,
+    name: str,
+    draw: Callable[[Canvas], None],
+    /,
+    *,
+    x: float = 0,
+    y: float = 0,
+) -> None:
+    """
+    Draws the static layer `name` at `(x, y)`.
+
+    The layer is recorded as a form XObject the first time a document uses it, every other page of the document,
+    or of a statement, only references it.
+    """
+    if not pdf.hasForm(name):
+        pdf.beginForm(name)
+        draw(pdf)
+        pdf.endForm()
+    pdf.saveState()
+    pdf.translate(x, y)
+    pdf.doForm(name)
+    pdf.restoreState()
+
+
+def get_describe(
+    cfdi: 'CFDI40',
+    provider: DescriptionProvider,
+    /,
+) -> Describe:
+    # resolve every description in a single round-trip
+    with span('catalog.lookup'):
+        descriptions = provider.get_descriptions(get_catalog_keys(cfdi))
+
+    def describe(
+        value: str,
+        catalogo: Catalogo,
+        /,
+    ) -> str:
+        try:
+            return descriptions[catalogo, value]
+        except KeyError:
+            raise KeyError(f'{catalogo} {value}') from None
+
+    return describe
+
+
+def render_pdf(
+    cfdi: 'CFDI40',
+    /,
+    *,
+    logo: LogoSource | Logo | None = None,
+    logo_size: tuple[int, int] = (50, 50),
+    logo_cords: tuple[int, int] | None = None,
+    provider: DescriptionProvider | None = None,
+) -> bytes:
+    """
+    Renders `cfdi` and returns the PDF document, without writing any intermediate file.
+    """
+    if provider is None:
+        provider = get_provider()
+
+    with span('pdf.render'):
+        pdf = Canvas(None, pagesize=letter)
+        draw_cfdi(
+            pdf,
+            cfdi,
+            describe=get_describe(cfdi, provider),
+            logo=logo,
+            logo_size=logo_size,
+            logo_cords=logo_cords,
+        )
+        with span('pdf.serialize'):
+            return pdf.getpdfdata()
 
 
 def generate_pdf(
     cfdi: 'CFDI40',
-    filename: str | IO[bytes],
+    filename: str | Path | IO[bytes] | Sink,
+    /,
+    *,
+    logo: LogoSource | Logo | None = None,
+    logo_size: tuple[int, int] = (50, 50),
+    logo_cords: tuple[int, int] | None = None,
+    provider: DescriptionProvider | None = None,
+) -> None:
+    """
+    Renders `cfdi` into `filename`, a path or any sink, the document is handed to the sink in a single write.
+    """
+    data = render_pdf(
+        cfdi,
+        logo=logo,
+        logo_size=logo_size,
+        logo_cords=logo_cords,
+        provider=provider,
+    )
+    write_output(data, filename)
+
+
+def write_output(
+    data: bytes,
+    output: str | Path | IO[bytes] | Sink,
+    /,
+) -> None:
+    with span('pdf.write'):
+        match output:
+            case str() | Path():
+                FileSink(output).write(data)
+            case _:
+                output.write(data)
+
+
+def render_statement(
+    cfdis: Iterable['CFDI40'],
+    output: str | Path | IO[bytes] | Sink,
+    /,
+    *,
+    logo: LogoSource | Logo | None = None,
+    logo_size: tuple[int, int] = (50, 50),
+    logo_cords: tuple[int, int] | None = None,
+    provider: DescriptionProvider | None = None,
+) -> int:
+    """
+    Renders every CFDI into a single PDF document, such as a monthly "estado de cuenta", returns the number of CFDIs.
+
+    All the documents share one canvas, so fonts, the static forms and the logo are stored once. CFDIs are drawn as
+    they are read, each one is bookmarked by its serie and folio.
+
+    The document is not streamed: ReportLab keeps every page until the canvas is saved, even when it is given a
+    file, so the whole PDF is held in memory and handed to `output` in a single write. Very large statements are
+    better split, such as by month or by receptor.
+    """
+    if provider is None:
+        provider = get_provider()
+    # descriptions are shared across the documents of the statement
+    if not isinstance(provider, CachedDescriptionProvider):
+        provider = CachedDescriptionProvider(provider)
+    # a file object can only be read once
+    if logo is not None and not isinstance(logo, Logo):
+        logo = logos.get(logo)
+
+    pdf = Canvas(None, pagesize=letter)
+    count = 0
+    for count, cfdi in enumerate(cfdis, 1):
+        key = f'cfdi_{count}'
+        pdf.bookmarkPage(key)
+        pdf.addOutlineEntry(f'{cfdi.serie or ""}-{cfdi.folio or ""}', key)
+        draw_cfdi(
+            pdf,
+            cfdi,
+            describe=get_describe(cfdi, provider),
+            logo=logo,
+            logo_size=logo_size,
+            logo_cords=logo_cords,
+        )
+    with span('pdf.serialize'):
+        data = pdf.getpdfdata()
+    write_output(data, output)
+    return count
+
+
+def draw_cfdi(
+    pdf: Canvas,
+    cfdi: 'CFDI40',
     /,
     *,
-    logo: str | Path | IO[bytes] | None = None,
+    describe: Describe,
+    logo: LogoSource | Logo | None = None,
     logo_size: tuple[int, int] = (50, 50),
     logo_cords: tuple[int, int] | None = None,
 ) -> None:
-    mx = 40
-    my = 50
-    width, height = letter
-    gray_color = colors.HexColor(0x666666)
+    """
+    Draws every page of `cfdi` on `pdf`, closing its last page.
+
+    Conceptos are laid out as they are read, one page at a time, the totals, the QR and the sellos go on the last page.
+    """
+    first_page = pdf.getPageNumber()
+    with span('pdf.header'):
+        y_offset = draw_header(
+            pdf,
+            cfdi,
+            describe=describe,
+            logo=logo,
+            logo_size=logo_size,
+            logo_cords=logo_cords,
+        )
+    with span('pdf.conceptos'):
+        y_offset = draw_conceptos(
+            pdf, cfdi, y_offset, describe=describe, first_page=first_page
+        )
+
+    with span('pdf.totales'):
+        totales_table = get_totales_table(cfdi, describe=describe)
+        traslados_table = get_traslados_table(cfdi)
+        _, totales_table_height = totales_table.wrapOn(pdf, MX, y_offset)
+        _, traslados_table_height = traslados_table.wrapOn(pdf, MX, y_offset)
+
+        # totals that do not fit above the footer start a new page
+        py = 5
+        if y_offset - totales_table_height - py - traslados_table_height < FOOTER_TOP:
+            pdf.showPage()
+            y_offset = draw_continuation_header(pdf, cfdi, first_page)
+
+        y_offset -= totales_table_height
+        totales_table.drawOn(pdf, MX, y_offset)
+
+        y_offset -= py + traslados_table_height
+        traslados_table.drawOn(pdf, MX, y_offset)
 
-    pdf = Canvas(filename, pagesize=letter)
+    with span('pdf.footer'):
+        draw_footer(pdf, cfdi)
+    pdf.showPage()
 
+
+def draw_header(
+    pdf: Canvas,
+    cfdi: 'CFDI40',
+    /,
+    *,
+    describe: Describe,
+    logo: LogoSource | Logo | None,
+    logo_size: tuple[int, int],
+    logo_cords: tuple[int, int] | None,
+) -> float:
+    """
+    Draws the comprobante, emisor and receptor sections of the first page, returns where the conceptos start.
+    """
     # init offsets
-    x_offset = width
-    y_offset = height
+    x_offset = WIDTH
+    y_offset = HEIGHT
 
     # logo
-    if logo:
+    if logo is not None:
+        if not isinstance(logo, Logo):
+            logo = logos.get(logo)
         logo_width, logo_height = logo_size
-        if isinstance(logo, str):
-            with open(logo, 'rb') as f:
-                image = Image(f, logo_width, logo_height)
-        else:
-            image = Image(logo, logo_width, logo_height)
 
         logo_x_offset = 0
-        logo_y_offset = height - logo_height
+        logo_y_offset = HEIGHT - logo_height
         if logo_cords:
             logo_x, logo_y = logo_cords
             logo_x_offset += logo_x
             logo_y_offset -= logo_y
-        image.drawOn(pdf, logo_x_offset, logo_y_offset)
+        use_form(
+            pdf,
+            f'logo_{logo.key}_{logo_width}x{logo_height}',
+            partial(draw_logo_form, logo, logo_width, logo_height),
+            x=logo_x_offset,
+            y=logo_y_offset,
+        )
 
     # comprobante section
     font_size = 12
-    x_offset -= mx
-    y_offset -= my
+    x_offset -= MX
+    y_offset -= MY
 
     # folio
     pdf.setFont('Helvetica', font_size)
+    pdf.setFillColor(colors.black)
     pdf.drawRightString(
         x_offset,
         y_offset,
@@ -154,7 +690,7 @@ def generate_pdf(
     y_offset -= py + font_size
 
     pdf.setFont('Helvetica', font_size)
-    pdf.setFillColor(gray_color)
+    pdf.setFillColor(GRAY_COLOR)
     pdf.drawRightString(
         x_offset,
         y_offset,
@@ -175,47 +711,20 @@ def generate_pdf(
     pdf.drawRightString(
         x_offset,
         y_offset,
-        f'Tipo de Comprobante: {cfdi.tipo_de_comprobante} - {get_description(cfdi.tipo_de_comprobante, 'TIPO_DE_COMPROBANTE')}',
+        f'Tipo de Comprobante: {cfdi.tipo_de_comprobante} - {describe(cfdi.tipo_de_comprobante, "TIPO_DE_COMPROBANTE")}',
     )
 
-    # separador
+    # separador, emisor and receptor labels are part of the header form
     y_offset -= py + font_size
-    pdf.setLineWidth(0.5)
-    pdf.line(
-        mx,
-        y_offset,
-        width - mx,
-        y_offset,
-    )
-
-    # emisor
     py = 12
     font_size = 8
-    x_offset = mx
     y_offset -= py + font_size
-    pdf.setFont('Helvetica-Bold', font_size)
-    pdf.setFillColor(colors.black)
-    pdf.drawString(
-        x_offset,
-        y_offset,
-        'EMISOR',
-    )
-
-    # receptor
-    x_offset = width / 2
-    pdf.drawString(
-        x_offset,
-        y_offset,
-        'RECEPTOR',
-    )
 
     # nombre emisor
     py = 2
     font_size = 8
-    x_offset = mx
+    x_offset = MX
     y_offset -= py + font_size
-    pdf.setFont('Helvetica', font_size)
-    pdf.setFillColor(gray_color)
     pdf.drawString(
         x_offset,
         y_offset,
@@ -223,7 +732,7 @@ def generate_pdf(
     )
 
     # nombre receptor
-    x_offset = width / 2
+    x_offset = WIDTH / 2
     pdf.drawString(
         x_offset,
         y_offset,
@@ -231,7 +740,7 @@ def generate_pdf(
     )
 
     # rfc emisor
-    x_offset = mx
+    x_offset = MX
     y_offset -= py + font_size
     pdf.drawString(
         x_offset,
@@ -240,7 +749,7 @@ def generate_pdf(
     )
 
     # rfc receptor
-    x_offset = width / 2
+    x_offset = WIDTH / 2
     pdf.drawString(
         x_offset,
         y_offset,
@@ -248,21 +757,21 @@ def generate_pdf(
     )
 
     # regimen emisor
-    x_offset = mx
+    x_offset = MX
     y_offset -= py + font_size
 
     pdf.drawString(
         x_offset,
         y_offset,
-        f'{cfdi.emisor.regimen_fiscal} - {get_description(cfdi.emisor.regimen_fiscal, 'REGIMEN_FISCAL')}',
+        f'{cfdi.emisor.regimen_fiscal} - {describe(cfdi.emisor.regimen_fiscal, "REGIMEN_FISCAL")}',
     )
 
     # uso cfdi receptor
-    x_offset = width / 2
+    x_offset = WIDTH / 2
     pdf.drawString(
         x_offset,
         y_offset,
-        f'USO CFDI: {cfdi.receptor.uso_cfdi} - {get_description(cfdi.receptor.uso_cfdi, 'USO_CFDI')}',
+        f'USO CFDI: {cfdi.receptor.uso_cfdi} - {describe(cfdi.receptor.uso_cfdi, "USO_CFDI")}',
     )
 
     # domicilio fiscal receptor
@@ -278,134 +787,162 @@ def generate_pdf(
     pdf.drawString(
         x_offset,
         y_offset,
-        f'Régimen fiscal: {cfdi.receptor.regimen_fiscal_receptor} - {get_description(cfdi.receptor.regimen_fiscal_receptor, 'REGIMEN_FISCAL')}',
+        f'Régimen fiscal: {cfdi.receptor.regimen_fiscal_receptor} - {describe(cfdi.receptor.regimen_fiscal_receptor, "REGIMEN_FISCAL")}',
     )
 
     # separador
     y_offset -= py + font_size
-    pdf.setLineWidth(0.5)
-    pdf.line(
-        mx,
-        y_offset,
-        width - mx,
-        y_offset,
-    )
 
-    # conceptos table
-    concepts_table_width = width - mx * 2
-    cantidad_column_width = concepts_table_width * 0.09
-    unidad_column_width = concepts_table_width * 0.09
-    descripcion_colun_width = concepts_table_width * 0.40
-    v_unitario_column_width = concepts_table_width * 0.12
-    impuestos_column_width = concepts_table_width * 0.18
-    importe_column_width = concepts_table_width * 0.12
-
-    concepts_table_colummns_width = [
-        cantidad_column_width,
-        unidad_column_width,
-        descripcion_colun_width,
-        v_unitario_column_width,
-        impuestos_column_width,
-        importe_column_width,
-    ]
+    use_form(pdf, 'cfdi_header', draw_header_form)
 
-    font_size = 8
-    concepts_table_headers_style = ParagraphStyle(
-        'concepts_table_headers_style',
-        fontName='Helvetica-Bold',
-        fontSize=font_size,
-        alignment=enums.TA_CENTER,
-        textColor=colors.white,
-    )
+    return y_offset - FONT_SIZE
 
-    concepts_table_body_style = ParagraphStyle(
-        'concepts_table_body_style',
-        fontName='Helvetica',
-        fontSize=font_size,
-        textColor=gray_color,
-    )
 
-    concepts_table_body_left_style = ParagraphStyle(
-        'concepts_table_body_left_style',
-        parent=concepts_table_body_style,
-        alignment=enums.TA_LEFT,
+def draw_header_form(
+    pdf: Canvas,
+    /,
+) -> None:
+    # separadores
+    pdf.setLineWidth(0.5)
+    for y_offset in HEADER_SEPARATORS_OFFSETS:
+        pdf.line(
+            MX,
+            y_offset,
+            WIDTH - MX,
+            y_offset,
+        )
+
+    # emisor
+    pdf.setFont('Helvetica-Bold', FONT_SIZE)
+    pdf.setFillColor(colors.black)
+    pdf.drawString(
+        MX,
+        HEADER_LABELS_OFFSET,
+        'EMISOR',
     )
 
-    concepts_table_body_center_style = ParagraphStyle(
-        'concepts_table_body_center_style',
-        parent=concepts_table_body_style,
-        alignment=enums.TA_CENTER,
+    # receptor
+    pdf.drawString(
+        WIDTH / 2,
+        HEADER_LABELS_OFFSET,
+        'RECEPTOR',
     )
 
-    concepts_table_body_right_style = ParagraphStyle(
-        'concepts_table_body_right_style',
-        parent=concepts_table_body_style,
-        alignment=enums.TA_RIGHT,
+
+def draw_logo_form(
+    logo: 'Logo',
+    width: float,
+    height: float,
+    pdf: Canvas,
+    /,
+) -> None:
+    pdf.drawImage(logo.image, 0, 0, width, height, mask='auto')
+
+
+def draw_continuation_header(
+    pdf: Canvas,
+    cfdi: 'CFDI40',
+    first_page: int,
+    /,
+) -> float:
+    """
+    Draws the folio and the page number on top of the pages after the first one, returns where the content starts.
+    """
+    py = 2
+    y_offset = HEIGHT - MY
+
+    pdf.setFont('Helvetica', FONT_SIZE)
+    pdf.setFillColor(GRAY_COLOR)
+    pdf.drawRightString(
+        WIDTH - MX,
+        y_offset,
+        f'Factura: {cfdi.serie}-{cfdi.folio} - Página {pdf.getPageNumber() - first_page + 1}',
     )
 
-    concepts_table_body_left_black_style = ParagraphStyle(
-        'concepts_table_body_left_black_style',
-        parent=concepts_table_body_left_style,
-        textColor=colors.black,
+    # separador
+    y_offset -= py + FONT_SIZE
+    use_form(pdf, 'cfdi_continuation_header', draw_continuation_header_form)
+
+    return y_offset - FONT_SIZE
+
+
+def draw_continuation_header_form(
+    pdf: Canvas,
+    /,
+) -> None:
+    pdf.setLineWidth(0.5)
+    pdf.line(
+        MX,
+        CONTINUATION_HEADER_SEPARATOR_OFFSET,
+        WIDTH - MX,
+        CONTINUATION_HEADER_SEPARATOR_OFFSET,
     )
 
-    concepts_table_headers = [
+
+def get_concepts_table_headers() -> Row:
+    return [
         Paragraph(
             'Cantidad',
-            concepts_table_headers_style,
+            CONCEPTS_TABLE_HEADERS_STYLE,
         ),
         Paragraph(
             'Unidad',
-            concepts_table_headers_style,
+            CONCEPTS_TABLE_HEADERS_STYLE,
         ),
         Paragraph(
             'Descripción',
-            concepts_table_headers_style,
+            CONCEPTS_TABLE_HEADERS_STYLE,
         ),
         Paragraph(
             'V. Unitario',
-            concepts_table_headers_style,
+            CONCEPTS_TABLE_HEADERS_STYLE,
         ),
         Paragraph(
             'Impuestos',
-            concepts_table_headers_style,
+            CONCEPTS_TABLE_HEADERS_STYLE,
         ),
         Paragraph(
             'Importe',
-            concepts_table_headers_style,
+            CONCEPTS_TABLE_HEADERS_STYLE,
         ),
     ]
 
-    conceptos = []
+
+def iter_concepts_table_rows(
+    cfdi: 'CFDI40',
+    /,
+    *,
+    describe: Describe,
+) -> Iterator[Row]:
     for concepto in cfdi.conceptos:
         # cantidad
         cantidad = Paragraph(
             str(concepto.cantidad),
-            concepts_table_body_center_style,
+            CONCEPTS_TABLE_BODY_CENTER_STYLE,
         )
 
         # unidad
         unidad = Paragraph(
-            f'{concepto.clave_unidad} - {get_description(concepto.clave_unidad, 'CLAVE_UNIDAD')}',
-            concepts_table_body_center_style,
+            f'{concepto.clave_unidad} - {describe(concepto.clave_unidad, "CLAVE_UNIDAD")}',
+            CONCEPTS_TABLE_BODY_CENTER_STYLE,
         )
 
         # descripcion
-        descripcion = [
+        descripcion: list[Flowable] = [
             Paragraph(
-                f'{concepto.clave_prod_serv} - {get_description(concepto.clave_prod_serv, 'CLAVE_PROD_SERV')}'.upper(),
-                concepts_table_body_left_black_style,
+                f'{concepto.clave_prod_serv} - {describe(concepto.clave_prod_serv, "CLAVE_PROD_SERV")}'.upper(),
+                CONCEPTS_TABLE_BODY_LEFT_BLACK_STYLE,
             ),
             Paragraph(
                 concepto.descripcion,
-                concepts_table_body_left_style,
+                CONCEPTS_TABLE_BODY_LEFT_STYLE,
             ),
         ]
 
         # valor unitario
         v_unitario = Paragraph(
             format_as_number(concepto.valor_unitario),
-            concepts_table_body_right_style,
+            CONCEPTS_TABLE_BODY_RIGHT_STYLE,
         )
 
         # impuestos
@@ -413,173 +950,244 @@ def generate_pdf(
         [traslado] = concepto.impuestos.traslados
         assert traslado.importe
         assert traslado.tasa_o_cuota
-        tasa_o_cuota = traslado.tasa_o_cuota * 100
 
-        impuestos = [
+        impuestos: list[Flowable] = [
             Paragraph(
-                f'{traslado.impuesto} - {get_description(traslado.impuesto, 'IMPUESTO')} {format_as_percentage(traslado.tasa_o_cuota)}%',
-                concepts_table_body_right_style,
+                f'{traslado.impuesto} - {describe(traslado.impuesto, "IMPUESTO")} {format_as_percentage(traslado.tasa_o_cuota)}%',
+                CONCEPTS_TABLE_BODY_RIGHT_STYLE,
             ),
             Paragraph(
                 format_as_number(traslado.importe),
-                concepts_table_body_right_style,
+                CONCEPTS_TABLE_BODY_RIGHT_STYLE,
             ),
         ]
 
         # importe
         importe = Paragraph(
             format_as_number(concepto.importe),
-            concepts_table_body_right_style,
+            CONCEPTS_TABLE_BODY_RIGHT_STYLE,
         )
 
-        conceptos.append(
-            [
-                cantidad,
-                unidad,
-                descripcion,
-                v_unitario,
-                impuestos,
-                importe,
-            ],
+        yield [
+            cantidad,
+            unidad,
+            descripcion,
+            v_unitario,
+            impuestos,
+            importe,
+        ]
+
+
+def draw_concepts_table_headers_form(
+    pdf: Canvas,
+    /,
+) -> None:
+    concepts_table = Table(
+        [get_concepts_table_headers()],
+        colWidths=CONCEPTS_TABLE_COLUMNS_WIDTH,
+        rowHeights=[get_concepts_table_headers_height()],
+        style=CONCEPTS_TABLE_HEADERS_TABLE_STYLE,
+    )
+    concepts_table.wrapOn(pdf, CONCEPTS_TABLE_WIDTH, HEIGHT)
+    concepts_table.drawOn(pdf, 0, 0)
+
+
+@cache
+def get_concepts_table_headers_height() -> float:
+    return get_row_height(get_concepts_table_headers())
+
+
+def get_row_height(
+    row: Row,
+    /,
+) -> float:
+    """
+    Height of a conceptos table row, measured as `Table` does so every row is only laid out once per page.
+    """
+    top_padding, bottom_padding, left_padding, right_padding = CONCEPTS_TABLE_PADDING
+    height = 0.0
+    for cell, column_width in zip(row, CONCEPTS_TABLE_COLUMNS_WIDTH):
+        available_width = column_width - left_padding - right_padding
+        flowables = cell if isinstance(cell, list) else [cell]
+        height = max(
+            height,
+            sum(
+                f.wrap(available_width, HEIGHT)[1]
+                for f in flowables
+                if isinstance(f, Flowable)
+            ),
         )
+    return height + top_padding + bottom_padding
 
+
+def draw_concepts_table(
+    pdf: Canvas,
+    rows: list[Row],
+    heights: list[float],
+    y_offset: float,
+    /,
+) -> float:
+    # headers
+    y_offset -= get_concepts_table_headers_height()
+    use_form(
+        pdf,
+        'cfdi_concepts_table_headers',
+        draw_concepts_table_headers_form,
+        x=MX,
+        y=y_offset,
+    )
+
+    concepts_table = Table(
+        rows,
+        colWidths=CONCEPTS_TABLE_COLUMNS_WIDTH,
+        rowHeights=heights,
+        style=CONCEPTS_TABLE_STYLE,
+    )
+
+    _, concepts_table_height = concepts_table.wrapOn(pdf, MX, y_offset)
+    y_offset -= concepts_table_height
+    concepts_table.drawOn(pdf, MX, y_offset)
+    return y_offset
+
+
+def draw_conceptos(
+    pdf: Canvas,
+    cfdi: 'CFDI40',
+    y_offset: float,
+    /,
+    *,
+    describe: Describe,
+    first_page: int,
+) -> float:
+    """
+    Draws the conceptos table starting at `y_offset`, returns where the last page of the table ends.
+
+    Rows are built and measured one at a time and only the rows of the current page are kept, every page repeats
+    the table headers form.
+    """
+    headers_height = get_concepts_table_headers_height()
+
+    rows: list[Row] = []
+    heights: list[float] = []
+    available_height = y_offset - MY - headers_height
+    for row in iter_concepts_table_rows(cfdi, describe=describe):
+        height = get_row_height(row)
+        # flush the page, a row taller than a page is drawn alone
+        if rows and height > available_height:
+            draw_concepts_table(pdf, rows, heights, y_offset)
+            pdf.showPage()
+            y_offset = draw_continuation_header(pdf, cfdi, first_page)
+            rows.clear()
+            heights.clear()
+            available_height = y_offset - MY - headers_height
+        rows.append(row)
+        heights.append(height)
+        available_height -= height
+
+    return draw_concepts_table(pdf, rows, heights, y_offset)
+
+
+def get_totales_table(
+    cfdi: 'CFDI40',
+    /,
+    *,
+    describe: Describe,
+) -> Table:
     # subtotal
     subtotal_header = Paragraph(
         'Subtotal',
-        concepts_table_body_right_style,
+        CONCEPTS_TABLE_BODY_RIGHT_STYLE,
     )
 
     subtotal = Paragraph(
         format_as_number(cfdi.sub_total),
-        concepts_table_body_right_style,
+        CONCEPTS_TABLE_BODY_RIGHT_STYLE,
     )
 
     # iva
     iva_header = Paragraph(
         'IVA',
-        concepts_table_body_right_style,
+        CONCEPTS_TABLE_BODY_RIGHT_STYLE,
     )
 
     assert cfdi.impuestos is not None
     iva = Paragraph(
         format_as_number(cfdi.impuestos.total_impuestos_trasladados),
-        concepts_table_body_right_style,
+        CONCEPTS_TABLE_BODY_RIGHT_STYLE,
     )
 
     # descuento
     descuento_header = Paragraph(
         'Descuento',
-        concepts_table_body_right_style,
+        CONCEPTS_TABLE_BODY_RIGHT_STYLE,
     )
 
     descuento = Paragraph(
         format_as_number(cfdi.descuento),
-        concepts_table_body_right_style,
+        CONCEPTS_TABLE_BODY_RIGHT_STYLE,
     )
 
     # total
     total_header = Paragraph(
         'Total',
-        concepts_table_body_right_style,
+        CONCEPTS_TABLE_BODY_RIGHT_STYLE,
     )
 
     total = Paragraph(
         format_as_number(cfdi.total),
-        concepts_table_body_right_style,
+        CONCEPTS_TABLE_BODY_RIGHT_STYLE,
     )
 
     # importe con letra
     importe_con_letra_header = Paragraph(
         'Importe con letra',
-        concepts_table_headers_style,
+        CONCEPTS_TABLE_HEADERS_STYLE,
     )
 
     importe_con_letra = Paragraph(
-        format_as_words(cfdi.total),
-        concepts_table_body_center_style,
+        format_as_words(cfdi.total, str(cfdi.moneda)),
+        CONCEPTS_TABLE_BODY_CENTER_STYLE,
     )
 
     # metodo de pago
     assert cfdi.metodo_pago
     metodo_de_pago = Paragraph(
-        f'Método de Pago: {cfdi.metodo_pago} - {get_description(cfdi.metodo_pago, 'METODO_PAGO')}',
-        concepts_table_body_center_style,
+        f'Método de Pago: {cfdi.metodo_pago} - {describe(cfdi.metodo_pago, "METODO_PAGO")}',
+        CONCEPTS_TABLE_BODY_CENTER_STYLE,
     )
 
     # forma de pago
     assert cfdi.forma_pago
     forma_de_pago = Paragraph(
-        f'Forma de Pago: {cfdi.forma_pago} - {get_description(cfdi.forma_pago, 'FORMA_PAGO')}',
-        concepts_table_body_center_style,
+        f'Forma de Pago: {cfdi.forma_pago} - {describe(cfdi.forma_pago, "FORMA_PAGO")}',
+        CONCEPTS_TABLE_BODY_CENTER_STYLE,
     )
 
-    concepts_data = [
-        concepts_table_headers,
-        *conceptos,
+    totales_data = [
         [importe_con_letra_header, '', '', '', subtotal_header, subtotal],
         [importe_con_letra, '', '', '', iva_header, iva],
         [metodo_de_pago, '', '', '', descuento_header, descuento],
         [forma_de_pago, '', '', '', total_header, total],
     ]
 
-    concepts_table_style = TableStyle(
-        [
-            # header
-            ('BACKGROUND', (0, 0), (-1, 0), colors.black),
-            # importe con letra
-            ('BACKGROUND', (0, 2), (3, 2), colors.black),
-            # general
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor(0xC8C8C8)),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('TOPPADDING', (0, 0), (-1, -1), 1),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 0),
-            ('LEFTPADDING', (0, 0), (-1, -1), 3),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 3),
-            # colspan
-            ('SPAN', (0, 2), (3, 2)),
-            ('SPAN', (0, 3), (3, 3)),
-            ('SPAN', (0, 4), (3, 4)),
-            ('SPAN', (0, 5), (3, 5)),
-        ]
-    )
-
-    concepts_table = Table(
-        concepts_data,
-        colWidths=concepts_table_colummns_width,
-        style=concepts_table_style,
+    return Table(
+        totales_data,
+        colWidths=CONCEPTS_TABLE_COLUMNS_WIDTH,
+        style=TOTALES_TABLE_STYLE,
     )
 
-    x_offset = mx
-    y_offset -= font_size
-    _, concepts_table_height = concepts_table.wrapOn(pdf, x_offset, y_offset)
-    y_offset -= concepts_table_height
 
-    concepts_table.drawOn(pdf, x_offset, y_offset)
-
-    # traslados table
-    traslados_table_width = (width - mx * 2) / 2
+def get_traslados_table(
+    cfdi: 'CFDI40',
+    /,
+) -> Table:
+    traslados_table_width = (WIDTH - MX * 2) / 2
     traslados_table_columns_width = traslados_table_width / 4
 
-    traslados_table_headers_style = ParagraphStyle(
-        'traslados_table_headers_style',
-        fontName='Helvetica-Bold',
-        fontSize=font_size,
-        alignment=enums.TA_CENTER,
-        textColor=gray_color,
-    )
-
-    traslados_table_body_style = ParagraphStyle(
-        'traslados_table_body_style',
-        fontName='Helvetica',
-        fontSize=font_size,
-        textColor=gray_color,
-        alignment=enums.TA_CENTER,
-    )
-
     traslados_table_head = [
         Paragraph(
             'Traslados',
-            traslados_table_headers_style,
+            TRASLADOS_TABLE_HEADERS_STYLE,
         ),
         '',
         '',
@@ -589,46 +1197,47 @@ def generate_pdf(
     traslados_table_headers = [
         Paragraph(
             'Impuesto',
-            traslados_table_headers_style,
+            TRASLADOS_TABLE_HEADERS_STYLE,
         ),
         Paragraph(
             'Tipo Factor',
-            traslados_table_headers_style,
+            TRASLADOS_TABLE_HEADERS_STYLE,
         ),
         Paragraph(
             'Tasa o cuota',
-            traslados_table_headers_style,
+            TRASLADOS_TABLE_HEADERS_STYLE,
         ),
         Paragraph(
             'Importe',
-            traslados_table_headers_style,
+            TRASLADOS_TABLE_HEADERS_STYLE,
         ),
     ]
 
+    assert cfdi.impuestos is not None
     traslados = []
     for traslado in cfdi.impuestos.traslados:
         # impuesto
         impuesto = Paragraph(
             traslado.impuesto,
-            traslados_table_body_style,
+            TRASLADOS_TABLE_BODY_STYLE,
         )
 
         # tipo factor
         tipo_factor = Paragraph(
             traslado.tipo_factor,
-            traslados_table_body_style,
+            TRASLADOS_TABLE_BODY_STYLE,
         )
 
         # tasa o cuota
         tasa_o_cuota = Paragraph(
             format_as_percentage(traslado.tasa_o_cuota),
-            traslados_table_body_style,
+            TRASLADOS_TABLE_BODY_STYLE,
         )
 
         # importe
         importe = Paragraph(
             format_as_number(traslado.importe),
-            traslados_table_body_style,
+            TRASLADOS_TABLE_BODY_STYLE,
         )
 
         traslados.append(
@@ -646,80 +1255,44 @@ def generate_pdf(
         *traslados,
     ]
 
-    traslados_table_style = TableStyle(
-        [
-            # head
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('TOPPADDING', (0, 0), (-1, -1), 1),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 1),
-            # colspan
-            ('SPAN', (0, 0), (3, 0)),
-        ]
-    )
-
-    traslados_table = Table(
+    return Table(
         traslados_data,
         colWidths=traslados_table_columns_width,
-        style=traslados_table_style,
+        style=TRASLADOS_TABLE_STYLE,
     )
 
-    _, traslados_table_height = traslados_table.wrapOn(pdf, x_offset, y_offset)
 
-    py = 5
-    y_offset -= py
-    y_offset -= traslados_table_height
-    traslados_table.drawOn(pdf, x_offset, y_offset)
+def draw_footer(
+    pdf: Canvas,
+    cfdi: 'CFDI40',
+    /,
+) -> None:
+    """
+    Draws the QR, the legends and the sellos below `FOOTER_TOP`.
+    """
+    font_size = FONT_SIZE
+    pdf.setFont('Helvetica', font_size)
+    pdf.setFillColor(GRAY_COLOR)
 
     # qr
     py = 200
-    y_offset = my + py
-    x_offset = mx
+    y_offset = MY + py
+    x_offset = MX
 
     qr_width = 100
-    qr_height = 100
 
     assert cfdi.verifica_cfdi_url
-    with BytesIO() as buffer:
-        qr = qrcode.QRCode(
-            version=10,
-            error_correction=qrcode.constants.ERROR_CORRECT_L,
-            box_size=10,
-            border=4,
-        )
-        qr.add_data(cfdi.verifica_cfdi_url)
-        qr.make()
-
-        m = qr.make_image()
-        m.save(buffer, 'PNG')
-
-        image = Image(buffer, qr_width, qr_height)
-        image.drawOn(pdf, x_offset, y_offset)
+    draw_qr(pdf, cfdi.verifica_cfdi_url, x_offset, y_offset, qr_width)
 
-    # qr text
-    px = 10
-    py = 15
-    x_offset += qr_width + px
-    y_offset += qr_height - py
+    # qr text, the legends and the separador are part of the footer form
+    use_form(pdf, 'cfdi_footer', draw_footer_form)
+    x_offset = FOOTER_TEXT_X_OFFSET
+    y_offset = FOOTER_TEXT_Y_OFFSET - font_size * 2
 
-    pdf.drawString(
-        x_offset, y_offset, 'Este documento es una representación impresa de un CFDI'
-    )
-
-    y_offset -= font_size
-    pdf.drawString(x_offset, y_offset, 'Efectos fiscales al pago')
-
-    y_offset -= font_size
     pdf.drawString(x_offset, y_offset, f'Moneda: {cfdi.moneda}')
 
     # separador
     y_offset -= font_size
-    pdf.setLineWidth(0.5)
-    pdf.line(
-        x_offset,
-        y_offset,
-        x_offset + (width / 2),
-        y_offset,
-    )
 
     # numero de certificado
     py = 8
@@ -754,51 +1327,36 @@ def generate_pdf(
     py = 20
     y_offset -= py + font_size
 
-    sellos_table_width = width - (mx * 2)
-    sellos_table_headers_style = ParagraphStyle(
-        'sellos_table_headers_style',
-        fontName='Helvetica',
-        fontSize=font_size,
-        alignment=enums.TA_CENTER,
-        textColor=colors.white,
-    )
-
-    sellos_table_body_style = ParagraphStyle(
-        'sellos_table_body_style',
-        fontName='Helvetica',
-        fontSize=font_size,
-        textColor=gray_color,
-        alignment=enums.TA_CENTER,
-    )
+    sellos_table_width = WIDTH - (MX * 2)
 
     # sello sat
     sello_sat_header = Paragraph(
         'Sello del SAT',
-        sellos_table_headers_style,
+        SELLOS_TABLE_HEADERS_STYLE,
     )
     sello_sat = Paragraph(
         cfdi.complemento.timbre_fiscal_digital.sello_sat,
-        sellos_table_body_style,
+        SELLOS_TABLE_BODY_STYLE,
     )
 
     # sello digital del cfdi
     sello_cfdi_header = Paragraph(
         'Sello digital del CFDI',
-        sellos_table_headers_style,
+        SELLOS_TABLE_HEADERS_STYLE,
     )
     sello_cfdi = Paragraph(
         cfdi.complemento.timbre_fiscal_digital.sello_cfd,
-        sellos_table_body_style,
+        SELLOS_TABLE_BODY_STYLE,
     )
 
     # cadena original del complemento de certificación digital del sat
     cadena_header = Paragraph(
         'Cadena original del complemento de certificación digital del SAT',
-        sellos_table_headers_style,
+        SELLOS_TABLE_HEADERS_STYLE,
     )
     cadena = Paragraph(
         cfdi.complemento.timbre_fiscal_digital.cadena_original,
-        sellos_table_body_style,
+        SELLOS_TABLE_BODY_STYLE,
     )
 
     sellos_table_data = (
@@ -810,31 +1368,159 @@ def generate_pdf(
         [cadena],
     )
 
-    sellos_table_style = TableStyle(
-        [
-            # headers
-            ('BACKGROUND', (0, 0), (0, 0), colors.black),
-            ('BACKGROUND', (0, 2), (0, 2), colors.black),
-            ('BACKGROUND', (0, 4), (0, 4), colors.black),
-            # general
-            ('GRID', (0, 0), (-1, -1), 1, colors.HexColor(0xC8C8C8)),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('TOPPADDING', (0, 0), (-1, -1), 0),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 0),
-            ('LEFTPADDING', (0, 0), (-1, -1), 40),
-            ('RIGHTPADDING', (0, 0), (-1, -1), 40),
-        ]
-    )
-
     sellos_table = Table(
         sellos_table_data,
         colWidths=sellos_table_width,
-        style=sellos_table_style,
+        style=SELLOS_TABLE_STYLE,
     )
 
     _, sellos_table_height = sellos_table.wrapOn(pdf, x_offset, y_offset)
-    x_offset = mx
+    x_offset = MX
     y_offset -= sellos_table_height
     sellos_table.drawOn(pdf, x_offset, y_offset)
 
-    pdf.save()
+
+def draw_qr(
+    pdf: Canvas,
+    data: str,
+    x_offset: float,
+    y_offset: float,
+    size: float,
+    /,
+) -> None:
+    """
+    Draws the QR code of `data` as vector rectangles, the smallest version that fits the data is used.
+    """
+    qr = qrcode.QRCode(
+        version=None,
+        error_correction=qrcode.constants.ERROR_CORRECT_L,
+        border=4,
+    )
+    qr.add_data(data)
+    qr.make(fit=True)
+    matrix = qr.get_matrix()
+
+    # rows are drawn top to bottom, joining runs of dark modules in a single rectangle
+    module_size = size / len(matrix)
+    path = pdf.beginPath()
+    for i, row in enumerate(matrix):
+        y = y_offset + size - (i + 1) * module_size
+        start = None
+        for j, dark in enumerate([*row, False]):
+            if dark and start is None:
+                start = j
+            elif not dark and start is not None:
+                path.rect(
+                    x_offset + start * module_size,
+                    y,
+                    (j - start) * module_size,
+                    module_size,
+                )
+                start = None
+
+    pdf.saveState()
+    pdf.setFillColor(colors.black)
+    pdf.drawPath(path, stroke=0, fill=1)
+    pdf.restoreState()
+
+
+def draw_footer_form(
+    pdf: Canvas,
+    /,
+) -> None:
+    x_offset = FOOTER_TEXT_X_OFFSET
+    y_offset = FOOTER_TEXT_Y_OFFSET
+    font_size = FONT_SIZE
+
+    pdf.setFont('Helvetica', font_size)
+    pdf.setFillColor(GRAY_COLOR)
+    pdf.drawString(
+        x_offset, y_offset, 'Este documento es una representación impresa de un CFDI'
+    )
+
+    y_offset -= font_size
+    pdf.drawString(x_offset, y_offset, 'Efectos fiscales al pago')
+
+    # separador
+    y_offset -= font_size * 2
+    pdf.setLineWidth(0.5)
+    pdf.line(
+        x_offset,
+        y_offset,
+        x_offset + (WIDTH / 2),
+        y_offset,
+    )
+
+
+# state of the workers of render_pdfs, context variables so running inline leaves the caller untouched
+worker_provider: ContextVar[DescriptionProvider] = ContextVar('worker_provider')
+
+worker_logo: ContextVar[Logo | None] = ContextVar('worker_logo', default=None)
+
+
+def init_worker(
+    provider: Callable[[], DescriptionProvider] | None,
+    logo: LogoSource | None,
+    /,
+) -> None:
+    """
+    Loads, once per worker, everything shared by the documents it renders.
+    """
+    for font in FONTS:
+        pdfmetrics.getFont(font)
+    worker_provider.set(provider() if provider is not None else get_provider())
+    worker_logo.set(logos.get(logo) if logo is not None else None)
+
+
+def render_keyed(
+    item: tuple[int, tuple['CFDI40', str | Path]],
+    /,
+    *,
+    logo_size: tuple[int, int],
+    logo_cords: tuple[int, int] | None,
+) -> tuple[int, TaskError | None]:
+    index, (cfdi, output) = item
+    try:
+        generate_pdf(
+            cfdi,
+            str(output),
+            logo=worker_logo.get(),
+            logo_size=logo_size,
+            logo_cords=logo_cords,
+            provider=worker_provider.get(),
+        )
+    except Exception as e:
+        return index, flatten_error(e)
+    return index, None
+
+
+def render_pdfs(
+    cfdis: Iterable['CFDI40'],
+    outputs: Iterable[str | Path],
+    /,
+    *,
+    workers: int | None = None,
+    chunksize: int = 1,
+    ordered: bool = True,
+    logo: LogoSource | None = None,
+    logo_size: tuple[int, int] = (50, 50),
+    logo_cords: tuple[int, int] | None = None,
+    provider: Callable[[], DescriptionProvider] | None = None,
+) -> Iterator[tuple[int, TaskError | None]]:
+    """
+    Renders every CFDI to its output file with `generate_pdf` over a process pool.
+
+    Yields `(index, error)` pairs, where `error` is `None` once the document was written or a `TaskError` with the
+    error raised while rendering it. Errors are returned, never raised. Each worker loads the fonts, the logo and the
+    catalog provider once, `provider` is a picklable callable returning the provider to use, by default the one of
+    `get_provider`.
+    """
+    return pool_map(
+        partial(render_keyed, logo_size=logo_size, logo_cords=logo_cords),
+        enumerate(zip(cfdis, outputs, strict=True)),
+        workers=workers,
+        chunksize=chunksize,
+        ordered=ordered,
+        initializer=init_worker,
+        initargs=(provider, logo),
+    )
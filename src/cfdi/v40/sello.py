@@ -0,0 +1,656 @@
+from base64 import b64decode, b64encode
+from binascii import Error as Base64Error
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
+from contextvars import ContextVar
+from functools import partial
+from os import getpid
+from pathlib import Path
+from threading import Lock
+from typing import TYPE_CHECKING, NamedTuple
+
+from cryptography import x509
+from cryptography.exceptions import InvalidSignature
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+from lxml import etree
+
+from cfdi.instrumentation import span
+from cfdi.pool import TaskError, flatten_error, pool_map
+from cfdi.v40.cadena import (
+    TAGS,
+    TFD_TAG,
+    cadena_original_from_model,
+    cadena_original_from_xml,
+    get_comprobante,
+    timbre_cadena_original_from_model,
+    timbre_cadena_original_from_xml,
+)
+from cfdi.v40.descriptions import CacheInfo
+
+if TYPE_CHECKING:
+    from cfdi.v40 import CFDI40
+
+type Source = str | Path | bytes
+
+
+def read(
+    source: Source,
+    /,
+) -> bytes:
+    match source:
+        case bytes():
+            return source
+        case _:
+            return Path(source).read_bytes()
+
+
+def load_certificate(
+    cer: bytes,
+    /,
+) -> x509.Certificate:
+    # the .cer files of the SAT are DER, PEM is accepted too
+    if cer.startswith(b'-----'):
+        return x509.load_pem_x509_certificate(cer)
+    return x509.load_der_x509_certificate(cer)
+
+
+def load_private_key(
+    key: bytes,
+    /,
+    *,
+    password: bytes | None,
+) -> rsa.RSAPrivateKey:
+    # the .key files of the SAT are encrypted PKCS#8 DER, PEM is accepted too
+    if key.startswith(b'-----'):
+        private_key = serialization.load_pem_private_key(key, password)
+    else:
+        private_key = serialization.load_der_private_key(key, password)
+    if not isinstance(private_key, rsa.RSAPrivateKey):
+        raise ValueError(f'Unsupported key: {type(private_key).__name__}')
+    return private_key
+
+
+def get_no_certificado(
+    certificate: x509.Certificate,
+    /,
+) -> str:
+    # the serial number of a SAT certificate is the ascii of its 20 digits
+    serial = certificate.serial_number
+    return serial.to_bytes((serial.bit_length() + 7) // 8).decode('ascii')
+
+
+class CSDFiles(NamedTuple):
+    """
+    What a CSD is loaded from: the `.key`, still encrypted, the `.cer` and the password of the key.
+    """
+
+    key: bytes
+    cer: bytes
+    password: bytes
+
+
+class CSD:
+    """
+    Certificado de sello digital: the certificate of the emisor and its private key, already decrypted.
+
+    Instances can not be pickled, the key would be written unencrypted. Process pool workers load their own copy from
+    `files`, only set for CSDs loaded with `CSD.load` or `CSDStore.load`.
+    """
+
+    __slots__ = ('certificate', 'private_key', 'no_certificado', 'certificado', 'files')
+
+    def __init__(
+        self,
+        private_key: rsa.RSAPrivateKey,
+        certificate: x509.Certificate,
+        /,
+        *,
+        files: CSDFiles | None = None,
+    ) -> None:
+        public_key = certificate.public_key()
+        if (
+            not isinstance(public_key, rsa.RSAPublicKey)
+            or private_key.public_key() != public_key
+        ):
+            raise ValueError('The key does not belong to the certificate')
+        self.certificate = certificate
+        self.private_key = private_key
+        self.no_certificado = get_no_certificado(certificate)
+        self.certificado = b64encode(
+            certificate.public_bytes(serialization.Encoding.DER)
+        ).decode()
+        self.files = files
+
+    @classmethod
+    def load(
+        cls,
+        key: Source,
+        cer: Source,
+        /,
+        *,
+        password: str | bytes,
+    ) -> 'CSD':
+        if isinstance(password, str):
+            password = password.encode()
+        files = CSDFiles(read(key), read(cer), password)
+        return cls(
+            load_private_key(files.key, password=password),
+            load_certificate(files.cer),
+            files=files,
+        )
+
+    def sign(
+        self,
+        cadena_original: str,
+        /,
+    ) -> str:
+        """
+        Sello of a cadena original: its RSA-SHA256 signature, in base 64.
+        """
+        signature = self.private_key.sign(
+            cadena_original.encode(), padding.PKCS1v15(), hashes.SHA256()
+        )
+        return b64encode(signature).decode()
+
+    def __reduce__(self):
+        raise TypeError('CSD objects can not be pickled, send their files instead')
+
+
+class CSDStore:
+    """
+    Thread-safe store of the loaded CSDs by número de certificado.
+
+    The certificate is read first, so the key of a CSD already in the store is never decrypted again.
+    """
+
+    def __init__(
+        self,
+    ) -> None:
+        self.lock = Lock()
+        self.entries: dict[str, CSD] = {}
+
+    def add(
+        self,
+        csd: CSD,
+        /,
+    ) -> CSD:
+        with self.lock:
+            return self.entries.setdefault(csd.no_certificado, csd)
+
+    def load(
+        self,
+        key: Source,
+        cer: Source,
+        /,
+        *,
+        password: str | bytes,
+    ) -> CSD:
+        cer = read(cer)
+        certificate = load_certificate(cer)
+        with self.lock:
+            cached = self.entries.get(get_no_certificado(certificate))
+        if cached is not None:
+            return cached
+        # decrypted outside of the lock
+        if isinstance(password, str):
+            password = password.encode()
+        files = CSDFiles(read(key), cer, password)
+        return self.add(
+            CSD(
+                load_private_key(files.key, password=password), certificate, files=files
+            )
+        )
+
+    def get(
+        self,
+        no_certificado: str,
+        /,
+    ) -> CSD:
+        with self.lock:
+            csd = self.entries.get(no_certificado)
+        if csd is None:
+            raise KeyError(f'Unknown certificado: {no_certificado}')
+        return csd
+
+    def values(
+        self,
+    ) -> list[CSD]:
+        with self.lock:
+            return list(self.entries.values())
+
+    def clear(
+        self,
+    ) -> None:
+        with self.lock:
+            self.entries.clear()
+
+
+csds = CSDStore()
+
+# store of the workers of sign_many, a context variable so running inline leaves `csds` untouched
+worker_csds: ContextVar[CSDStore] = ContextVar('worker_csds')
+
+
+def sign_cfdi(
+    cfdi: 'CFDI40',
+    csd: CSD | None = None,
+    /,
+) -> 'CFDI40':
+    """
+    Seals the comprobante in place: sets `no_certificado` and `certificado` from the CSD, then the `sello` of its
+    cadena original. The cadena is the one of the xml `to_xml(exclude_none=True)` writes, so the document
+    written that way verifies.
+
+    Without a CSD, the one of `cfdi.no_certificado` is taken from `csds`.
+    """
+    if csd is None:
+        csd = csds.get(cfdi.no_certificado)
+    cfdi.no_certificado = csd.no_certificado
+    cfdi.certificado = csd.certificado
+    cadena_original = cadena_original_from_model(cfdi)
+    with span('sello.sign'):
+        cfdi.sello = csd.sign(cadena_original)
+    return cfdi
+
+
+def init_worker(
+    entries: tuple[CSDFiles, ...],
+    /,
+) -> None:
+    """
+    Loads and decrypts the CSDs once per worker.
+    """
+    store = CSDStore()
+    for key, cer, password in entries:
+        store.load(key, cer, password=password)
+    worker_csds.set(store)
+
+
+def sign_keyed(
+    item: tuple[int, 'CFDI40'],
+    /,
+    *,
+    no_certificado: str | None,
+    caller: int,
+) -> tuple[int, 'CFDI40 | TaskError']:
+    index, cfdi = item
+    try:
+        csd = worker_csds.get().get(no_certificado or cfdi.no_certificado)
+        # documents sent to a worker process are already copies
+        if getpid() == caller:
+            cfdi = cfdi.model_copy(deep=True)
+        return index, sign_cfdi(cfdi, csd)
+    except Exception as e:
+        return index, flatten_error(e)
+
+
+def sign_many(
+    cfdis: Iterable['CFDI40'],
+    /,
+    *,
+    csd: CSD | None = None,
+    workers: int | None = None,
+    chunksize: int = 1,
+    ordered: bool = True,
+) -> Iterator[tuple[int, 'CFDI40 | TaskError']]:
+    """
+    Seals copies of many comprobantes with `sign_cfdi` over a process pool, the originals are left untouched.
+
+    Every document is sealed with `csd`, or with the CSD of its `no_certificado` in `csds`. In that case the
+    documents are read upfront, to send the workers only the CSDs they need. The CSDs must have been loaded from
+    their files, the workers decrypt their own copy once. Yields `(index, result)` pairs, where `result` is the
+    sealed `CFDI40` or a `TaskError` with the error raised while sealing it.
+    """
+    if csd is not None:
+        entries = [csd]
+    else:
+        cfdis = list(cfdis)
+        needed = {cfdi.no_certificado for cfdi in cfdis}
+        entries = [entry for entry in csds.values() if entry.no_certificado in needed]
+    files = []
+    for entry in entries:
+        if entry.files is None:
+            raise ValueError(
+                f'The CSD {entry.no_certificado} was not loaded from its files'
+            )
+        files.append(entry.files)
+    return pool_map(
+        partial(
+            sign_keyed,
+            no_certificado=None if csd is None else csd.no_certificado,
+            caller=getpid(),
+        ),
+        enumerate(cfdis),
+        workers=workers,
+        chunksize=chunksize,
+        ordered=ordered,
+        initializer=init_worker,
+        initargs=(tuple(files),),
+    )
+
+
+class CertificadoCache:
+    """
+    Bounded, thread-safe LRU of the public keys of the certificados, by número de certificado.
+
+    A certificado is decoded once, documents carrying the same número de certificado with a different certificado
+    are decoded again and never replace the cached one.
+    """
+
+    def __init__(
+        self,
+        *,
+        maxsize: int = 4096,
+    ) -> None:
+        if maxsize < 1:
+            raise ValueError('maxsize must be greater than zero')
+        self.maxsize = maxsize
+        self.lock = Lock()
+        # no_certificado -> (certificado, public key)
+        self.entries: OrderedDict[str, tuple[str, rsa.RSAPublicKey]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(
+        self,
+        no_certificado: str,
+        certificado: str,
+        /,
+    ) -> rsa.RSAPublicKey:
+        """
+        Public key of `certificado`, raises a `ValueError` when it is not the certificado `no_certificado`.
+        """
+        with self.lock:
+            cached = self.entries.get(no_certificado)
+            if cached is not None and cached[0] == certificado:
+                self.entries.move_to_end(no_certificado)
+                self.hits += 1
+                return cached[1]
+            self.misses += 1
+
+        # decoded outside of the lock
+        certificate = load_certificate(b64decode(certificado))
+        if get_no_certificado(certificate) != no_certificado:
+            raise ValueError(f'The certificado is not {no_certificado}')
+        public_key = certificate.public_key()
+        if not isinstance(public_key, rsa.RSAPublicKey):
+            raise ValueError(f'Unsupported key: {type(public_key).__name__}')
+
+        with self.lock:
+            if no_certificado not in self.entries:
+                self.entries[no_certificado] = (certificado, public_key)
+                while len(self.entries) > self.maxsize:
+                    self.entries.popitem(last=False)
+                    self.evictions += 1
+        return public_key
+
+    def cache_info(
+        self,
+    ) -> CacheInfo:
+        with self.lock:
+            return CacheInfo(
+                hits=self.hits,
+                misses=self.misses,
+                evictions=self.evictions,
+                size=len(self.entries),
+                maxsize=self.maxsize,
+            )
+
+    def cache_clear(
+        self,
+    ) -> None:
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+
+certificados = CertificadoCache()
+
+
+def verify(
+    sello: str,
+    cadena_original: str,
+    public_key: rsa.RSAPublicKey,
+    /,
+) -> bool:
+    try:
+        signature = b64decode(sello, validate=True)
+        public_key.verify(
+            signature, cadena_original.encode(), padding.PKCS1v15(), hashes.SHA256()
+        )
+    except (InvalidSignature, Base64Error):
+        return False
+    return True
+
+
+def verify_sello(
+    cfdi: 'CFDI40 | bytes | Path | etree._Element',
+    /,
+) -> bool:
+    """
+    Checks that the `sello` of a comprobante is the signature of its cadena original under its `certificado`.
+
+    Documents given as xml are checked straight from the tree, without building the model. For a model the cadena
+    original is the one of its serialization, which for a parsed document keeps the attributes it was written with.
+
+    Certificados that can not be decoded, or whose número de certificado is not `no_certificado`, raise a
+    `ValueError`. Neither the validity period of the certificado nor its issuer are checked.
+    """
+    match cfdi:
+        case bytes() | Path() | etree._Element():
+            comprobante = get_comprobante(cfdi)
+            sello = comprobante.get('Sello', '')
+            no_certificado = comprobante.get('NoCertificado', '')
+            certificado = comprobante.get('Certificado', '')
+            cadena_original = cadena_original_from_xml(comprobante)
+        case _:
+            sello = cfdi.sello
+            no_certificado = cfdi.no_certificado
+            certificado = cfdi.certificado
+            cadena_original = cadena_original_from_model(cfdi)
+    public_key = certificados.get(no_certificado, certificado)
+    with span('sello.verify'):
+        return verify(sello, cadena_original, public_key)
+
+
+def verify_keyed(
+    item: tuple[int, 'CFDI40 | bytes | Path'],
+    /,
+) -> tuple[int, bool | TaskError]:
+    index, cfdi = item
+    try:
+        return index, verify_sello(cfdi)
+    except Exception as e:
+        return index, flatten_error(e)
+
+
+def verify_many(
+    cfdis: Iterable['CFDI40 | bytes | Path'],
+    /,
+    *,
+    workers: int | None = None,
+    chunksize: int = 1,
+    ordered: bool = True,
+) -> Iterator[tuple[int, bool | TaskError]]:
+    """
+    Checks the sello of many comprobantes with `verify_sello` over a process pool.
+
+    Yields `(index, result)` pairs, where `result` is whether the sello is valid or a `TaskError` with the error
+    raised while checking it. Paths are read by the workers, every worker keeps its own cache of certificados.
+    """
+    return pool_map(
+        verify_keyed,
+        enumerate(cfdis),
+        workers=workers,
+        chunksize=chunksize,
+        ordered=ordered,
+    )
+
+
+class CertificadoSATStore:
+    """
+    Thread-safe store of the certificados of the SAT in a local directory, by número de certificado.
+
+    The directory is indexed on first use: files named after their número de certificado, as the SAT publishes
+    them, are indexed by name and any other `.cer` file by its serial number. The public keys are loaded once, on
+    demand, and the directory is indexed again when a número de certificado is missing and it changed since.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        /,
+    ) -> None:
+        self.directory = Path(directory)
+        self.lock = Lock()
+        self.index: dict[str, Path] = {}
+        self.indexed: int | None = None
+        self.public_keys: dict[str, rsa.RSAPublicKey] = {}
+
+    def refresh(
+        self,
+    ) -> None:
+        """
+        Indexes the directory again.
+        """
+        indexed = self.directory.stat().st_mtime_ns
+        index: dict[str, Path] = {}
+        for path in self.directory.iterdir():
+            if path.suffix.lower() not in ('.cer', '.pem'):
+                continue
+            if len(path.stem) == 20 and path.stem.isdigit():
+                index[path.stem] = path
+            else:
+                index[get_no_certificado(load_certificate(path.read_bytes()))] = path
+        with self.lock:
+            self.index = index
+            self.indexed = indexed
+
+    def get(
+        self,
+        no_certificado: str,
+        /,
+    ) -> rsa.RSAPublicKey:
+        """
+        Public key of the certificado `no_certificado`, raises a `KeyError` when it is not in the directory.
+        """
+        with self.lock:
+            cached = self.public_keys.get(no_certificado)
+            if cached is not None:
+                return cached
+            path = self.index.get(no_certificado)
+            indexed = self.indexed
+        if path is None:
+            if indexed is not None and indexed == self.directory.stat().st_mtime_ns:
+                raise KeyError(f'Unknown certificado SAT: {no_certificado}')
+            self.refresh()
+            with self.lock:
+                path = self.index.get(no_certificado)
+            if path is None:
+                raise KeyError(f'Unknown certificado SAT: {no_certificado}')
+
+        certificate = load_certificate(path.read_bytes())
+        if get_no_certificado(certificate) != no_certificado:
+            raise ValueError(f'The certificado {path.name} is not {no_certificado}')
+        public_key = certificate.public_key()
+        if not isinstance(public_key, rsa.RSAPublicKey):
+            raise ValueError(f'Unsupported key: {type(public_key).__name__}')
+        with self.lock:
+            return self.public_keys.setdefault(no_certificado, public_key)
+
+
+def verify_sello_sat(
+    cfdi: 'CFDI40 | bytes | Path | etree._Element',
+    /,
+    *,
+    store: CertificadoSATStore,
+) -> bool:
+    """
+    Checks the timbre of a comprobante offline: that its `SelloSAT` is the signature of the cadena original of the
+    timbre under the certificado `NoCertificadoSAT` of `store`, and that its `SelloCFD` is the `Sello` of the
+    comprobante.
+
+    Comprobantes without a timbre raise a `ValueError` and certificados missing from the store a `KeyError`. The
+    `Sello` itself is checked by `verify_sello`.
+    """
+    match cfdi:
+        case bytes() | Path() | etree._Element():
+            comprobante = get_comprobante(cfdi)
+            element = None
+            for complemento in comprobante.iterchildren(TAGS['Complemento']):
+                element = next(complemento.iterchildren(TFD_TAG), None)
+                if element is not None:
+                    break
+            if element is None:
+                raise ValueError('The comprobante has no TimbreFiscalDigital')
+            sello = comprobante.get('Sello', '')
+            sello_cfd = element.get('SelloCFD', '')
+            sello_sat = element.get('SelloSAT', '')
+            no_certificado_sat = element.get('NoCertificadoSAT', '')
+            cadena_original = timbre_cadena_original_from_xml(element)
+        case _:
+            tfd = cfdi.complemento.timbre_fiscal_digital if cfdi.complemento else None
+            if tfd is None:
+                raise ValueError('The comprobante has no TimbreFiscalDigital')
+            sello = cfdi.sello
+            sello_cfd = tfd.sello_cfd
+            sello_sat = tfd.sello_sat
+            no_certificado_sat = tfd.no_certificado_sat
+            cadena_original = timbre_cadena_original_from_model(tfd)
+    if sello_cfd != sello:
+        return False
+    public_key = store.get(no_certificado_sat)
+    with span('sello.verify_sat'):
+        return verify(sello_sat, cadena_original, public_key)
+
+
+# store of the workers of verify_sello_sat_many
+worker_store: ContextVar[CertificadoSATStore] = ContextVar('worker_store')
+
+
+def init_sat_worker(
+    directory: Path,
+    /,
+) -> None:
+    worker_store.set(CertificadoSATStore(directory))
+
+
+def verify_sat_keyed(
+    item: tuple[int, 'CFDI40 | bytes | Path'],
+    /,
+) -> tuple[int, bool | TaskError]:
+    index, cfdi = item
+    try:
+        return index, verify_sello_sat(cfdi, store=worker_store.get())
+    except Exception as e:
+        return index, flatten_error(e)
+
+
+def verify_sello_sat_many(
+    cfdis: Iterable['CFDI40 | bytes | Path'],
+    /,
+    *,
+    directory: str | Path,
+    workers: int | None = None,
+    chunksize: int = 1,
+    ordered: bool = True,
+) -> Iterator[tuple[int, bool | TaskError]]:
+    """
+    Checks the timbre of many comprobantes with `verify_sello_sat` over a process pool, with the certificados of
+    the SAT in `directory`.
+
+    Yields `(index, result)` pairs as `verify_many`, every worker indexes the directory once.
+    """
+    return pool_map(
+        verify_sat_keyed,
+        enumerate(cfdis),
+        workers=workers,
+        chunksize=chunksize,
+        ordered=ordered,
+        initializer=init_sat_worker,
+        initargs=(Path(directory),),
+    )
@@ -0,0 +1,204 @@
+from decimal import ROUND_HALF_UP, Decimal
+from functools import lru_cache
+from typing import Literal
+
+type Genero = Literal['masculino', 'femenino']
+
+UNIDADES = (
+    'CERO',
+    'UNO',
+    'DOS',
+    'TRES',
+    'CUATRO',
+    'CINCO',
+    'SEIS',
+    'SIETE',
+    'OCHO',
+    'NUEVE',
+    'DIEZ',
+    'ONCE',
+    'DOCE',
+    'TRECE',
+    'CATORCE',
+    'QUINCE',
+    'DIECISÉIS',
+    'DIECISIETE',
+    'DIECIOCHO',
+    'DIECINUEVE',
+    'VEINTE',
+    'VEINTIUNO',
+    'VEINTIDÓS',
+    'VEINTITRÉS',
+    'VEINTICUATRO',
+    'VEINTICINCO',
+    'VEINTISÉIS',
+    'VEINTISIETE',
+    'VEINTIOCHO',
+    'VEINTINUEVE',
+)
+
+DECENAS = (
+    '',
+    '',
+    '',
+    'TREINTA',
+    'CUARENTA',
+    'CINCUENTA',
+    'SESENTA',
+    'SETENTA',
+    'OCHENTA',
+    'NOVENTA',
+)
+
+CENTENAS = (
+    '',
+    'CIENTO',
+    'DOSCIENTOS',
+    'TRESCIENTOS',
+    'CUATROCIENTOS',
+    'QUINIENTOS',
+    'SEISCIENTOS',
+    'SETECIENTOS',
+    'OCHOCIENTOS',
+    'NOVECIENTOS',
+)
+
+# long scale, as used in spanish
+ESCALAS = (
+    ('MILLÓN', 'MILLONES'),
+    ('BILLÓN', 'BILLONES'),
+    ('TRILLÓN', 'TRILLONES'),
+)
+
+# (singular, plural, grammatical gender)
+MONEDAS: dict[str, tuple[str, str, Genero]] = {
+    'MXN': ('PESO', 'PESOS', 'masculino'),
+    'USD': ('DÓLAR', 'DÓLARES', 'masculino'),
+    'EUR': ('EURO', 'EUROS', 'masculino'),
+    'CAD': ('DÓLAR CANADIENSE', 'DÓLARES CANADIENSES', 'masculino'),
+    'GBP': ('LIBRA ESTERLINA', 'LIBRAS ESTERLINAS', 'femenino'),
+    'JPY': ('YEN', 'YENES', 'masculino'),
+}
+
+CENTAVO = Decimal('0.01')
+
+
+def get_tens(
+    number: int,
+    uno: str,
+    /,
+) -> str:
+    # one agrees with the noun that follows, uno, un or una and veintiuno, veintiún or veintiuna
+    if number < 30:
+        if number == 1:
+            return uno
+        if number == 21:
+            return 'VEINTIÚN' if uno == 'UN' else f'VEINTI{uno}'
+        return UNIDADES[number]
+    decenas, unidades = divmod(number, 10)
+    if not unidades:
+        return DECENAS[decenas]
+    return f'{DECENAS[decenas]} Y {get_tens(unidades, uno)}'
+
+
+def get_hundreds(
+    number: int,
+    uno: str,
+    /,
+) -> str:
+    if number == 100:
+        return 'CIEN'
+    centenas, resto = divmod(number, 100)
+    centena = CENTENAS[centenas]
+    # doscientas libras, ciento stays the same
+    if uno == 'UNA' and centenas > 1:
+        centena = centena.removesuffix('OS') + 'AS'
+    if not resto:
+        return centena
+    if not centenas:
+        return get_tens(resto, uno)
+    return f'{centena} {get_tens(resto, uno)}'
+
+
+def get_thousands(
+    number: int,
+    uno: str,
+    /,
+) -> str:
+    miles, resto = divmod(number, 1000)
+    words = []
+    if miles == 1:
+        words.append('MIL')
+    elif miles:
+        words.append(f'{get_hundreds(miles, "UNA" if uno == "UNA" else "UN")} MIL')
+    if resto:
+        words.append(get_hundreds(resto, uno))
+    return ' '.join(words)
+
+
+def integer_to_words(
+    number: int,
+    /,
+    *,
+    apocope: bool = False,
+    genero: Genero = 'masculino',
+) -> str:
+    """
+    Spells `number` in spanish, in uppercase.
+
+    With `apocope=True` the number is spelled to precede a masculine noun, `UN PESO` or `VEINTIÚN PESOS` rather than
+    `UNO` and `VEINTIUNO`. With `genero='femenino'` it agrees with a feminine noun, `UNA LIBRA` or `DOSCIENTAS UNA
+    LIBRAS`; millones are masculine either way.
+    """
+    if number < 0:
+        raise ValueError(f'Invalid number: {number}')
+    if number == 0:
+        return 'CERO'
+    if genero == 'femenino':
+        uno = 'UNA'
+    else:
+        uno = 'UN' if apocope else 'UNO'
+    groups = []
+    number, resto = divmod(number, 1_000_000)
+    if resto:
+        groups.append(get_thousands(resto, uno))
+    for singular, plural in ESCALAS:
+        if not number:
+            break
+        number, resto = divmod(number, 1_000_000)
+        if resto == 1:
+            groups.append(f'UN {singular}')
+        elif resto:
+            groups.append(f'{get_thousands(resto, "UN")} {plural}')
+    if number:
+        raise ValueError('Number too large')
+    return ' '.join(reversed(groups))
+
+
+@lru_cache(maxsize=4096)
+def amount_to_words(
+    amount: Decimal,
+    moneda: str = 'MXN',
+    /,
+) -> str:
+    """
+    Spells an amount the way it is printed on invoices, `CIENTO CINCUENTA Y DOS PESOS CON 80/100 MXN`.
+
+    The amount is rounded to centavos. Currencies without a known name only print their code.
+    """
+    amount = amount.quantize(CENTAVO, rounding=ROUND_HALF_UP)
+    if amount < 0:
+        raise ValueError(f'Invalid amount: {amount}')
+    enteros, centavos = divmod(amount, 1)
+    unidades = int(enteros)
+    nombres = MONEDAS.get(moneda)
+    if nombres is None:
+        words = integer_to_words(unidades)
+    else:
+        singular, plural, genero = nombres
+        words = integer_to_words(unidades, apocope=True, genero=genero)
+        # un millón de pesos
+        if unidades >= 1_000_000 and not unidades % 1_000_000:
+            words = f'{words} DE'
+        words = f'{words} {singular if unidades == 1 else plural}'
+    return f'{words} CON {int(centavos * 100):02d}/100 {moneda}'
@@ -0,0 +1,50 @@
+from decimal import Decimal
+from pathlib import Path
+
+from cfdi import parse_cfdi
+from cfdi.corpus import iter_corpus, write_corpus
+from cfdi.v40 import CFDI40
+
+
+def test_iter_corpus():
+    xmls = list(iter_corpus(200, seed=1, conceptos=(1, 5)))
+    assert xmls == list(iter_corpus(200, seed=1, conceptos=(1, 5)))
+    assert xmls != list(iter_corpus(200, seed=2, conceptos=(1, 5)))
+
+    cfdis: list[CFDI40] = []
+    for xml in xmls:
+        cfdi = parse_cfdi(xml)
+        assert isinstance(cfdi, CFDI40)
+        assert parse_cfdi(xml, trusted=True) == cfdi
+        assert 1 <= len(cfdi.conceptos) <= 5
+        assert cfdi.complemento and cfdi.complemento.timbre_fiscal_digital
+        assert cfdi.complemento.timbre_fiscal_digital.sello_cfd == cfdi.sello
+        assert cfdi.sub_total == sum(concepto.importe for concepto in cfdi.conceptos)
+        trasladados = retenidos = Decimal(0)
+        if cfdi.impuestos is not None:
+            trasladados = cfdi.impuestos.total_impuestos_trasladados
+            retenidos = cfdi.impuestos.total_impuestos_retenidos
+        assert cfdi.total == cfdi.sub_total - cfdi.descuento + trasladados - retenidos
+        cfdis.append(cfdi)
+
+    # every optional node shows up in a corpus of this size
+    conceptos = [concepto for cfdi in cfdis for concepto in cfdi.conceptos]
+    assert any(cfdi.cfdi_relacionados for cfdi in cfdis)
+    assert any(concepto.parte for concepto in conceptos)
+    assert any(concepto.informacion_aduanera for concepto in conceptos)
+    assert any(
+        concepto.impuestos and concepto.impuestos.retenciones for concepto in conceptos
+    )
+
+
+def test_iter_corpus_endless():
+    corpus = iter_corpus(seed=3)
+    xmls = [next(corpus) for _ in range(10)]
+    assert xmls == list(iter_corpus(10, seed=3))
+
+
+def test_write_corpus(tmp_path: Path):
+    write_corpus(tmp_path, 5, seed=4, workers=1)
+    paths = sorted(tmp_path.iterdir())
+    assert [path.name for path in paths] == [f'0000000{i}.xml' for i in range(5)]
+    assert [path.read_bytes() for path in paths] == list(iter_corpus(5, seed=4))
@@ -0,0 +1,86 @@
+import logging
+from pathlib import Path
+
+import pytest
+
+from cfdi import instrumentation, parse_cfdi
+from cfdi.instrumentation import (
+    LoggingRecorder,
+    MetricsRecorder,
+    add_recorder,
+    recording,
+    remove_recorder,
+    span,
+)
+from cfdi.utils import get_cfdi_version
+
+
+def test_span_disabled():
+    assert instrumentation.recorders == ()
+    assert span('a') is span('b')
+
+
+def test_span():
+    spans: list[tuple[str, float]] = []
+
+    def recorder(
+        name: str,
+        seconds: float,
+        /,
+    ) -> None:
+        spans.append((name, seconds))
+
+    add_recorder(recorder)
+    try:
+        with span('a'):
+            pass
+        with pytest.raises(ValueError), span('b'):
+            raise ValueError
+    finally:
+        remove_recorder(recorder)
+    with span('c'):
+        pass
+
+    assert [name for name, _ in spans] == ['a', 'b']
+    assert all(seconds >= 0 for _, seconds in spans)
+    assert instrumentation.recorders == ()
+
+
+def test_metrics_recorder():
+    xml = Path('tests/samples/v40/uber.xml').read_bytes()
+    with recording(MetricsRecorder()) as metrics:
+        get_cfdi_version(xml)
+        cfdi = parse_cfdi(xml)
+        parse_cfdi(xml)
+        parse_cfdi(xml, trusted=True)
+        assert cfdi and cfdi.complemento and cfdi.complemento.timbre_fiscal_digital
+        assert cfdi.complemento.timbre_fiscal_digital.cadena_original
+
+    values = metrics.metrics()
+    assert {name: value.calls for name, value in values.items()} == {
+        'version': 1,
+        'parse.xml': 3,
+        'parse.validate': 2,
+        'parse.construct': 1,
+        'cadena_original.tfd': 1,
+    }
+    assert values['parse.validate'].max <= values['parse.validate'].total
+
+    exposed = metrics.expose()
+    assert '# TYPE cfdi_span_seconds summary' in exposed
+    assert 'cfdi_span_seconds_count{span="parse.xml"} 3' in exposed
+
+    metrics.clear()
+    assert metrics.metrics() == {}
+
+
+def test_logging_recorder(caplog: pytest.LogCaptureFixture):
+    with (
+        caplog.at_level(logging.DEBUG, logger='cfdi'),
+        recording(LoggingRecorder()),
+        span('a'),
+    ):
+        pass
+    [record] = caplog.records
+    assert record.name == 'cfdi'
+    assert record.getMessage().startswith('a took ')
@@ -0,0 +1,78 @@
+import os
+import stat
+
+import pytest
+
+from cfdi.sinks import BufferSink, FileSink, S3Sink
+
+
+class S3:
+    """
+    Local stand-in of an S3 client.
+    """
+
+    def __init__(
+        self,
+    ) -> None:
+        self.objects: dict[tuple[str, str], dict] = {}
+
+    def put_object(
+        self,
+        *,
+        Bucket: str,
+        Key: str,
+        **kwargs,
+    ) -> dict:
+        self.objects[Bucket, Key] = kwargs
+        return {}
+
+
+def test_file_sink(
+    tmp_path,
+):
+    path = tmp_path / 'cfdi.pdf'
+    path.write_bytes(b'old')
+    FileSink(path).write(b'%PDF')
+    assert path.read_bytes() == b'%PDF'
+    # no temporary files are left behind
+    assert list(tmp_path.iterdir()) == [path]
+
+    # same permissions as a file written in place
+    other = tmp_path / 'other.pdf'
+    other.write_bytes(b'%PDF')
+    assert stat.S_IMODE(path.stat().st_mode) == stat.S_IMODE(other.stat().st_mode)
+
+    # the umask in effect when writing
+    umask = os.umask(0o077)
+    try:
+        FileSink(path).write(b'%PDF')
+    finally:
+        os.umask(umask)
+    assert stat.S_IMODE(path.stat().st_mode) == 0o600
+
+    # the temporary file is removed when it can not be moved into place
+    directory = tmp_path / 'directory'
+    (directory / 'cfdi.pdf').mkdir(parents=True)
+    with pytest.raises(OSError):
+        FileSink(directory / 'cfdi.pdf').write(b'%PDF')
+    assert list(directory.iterdir()) == [directory / 'cfdi.pdf']
+
+
+def test_buffer_sink():
+    data = b'%PDF'
+    sink = BufferSink()
+    sink.write(data)
+    assert sink.data is data
+    assert sink.getbuffer() == data
+
+
+def test_s3_sink():
+    client = S3()
+    S3Sink(client, 'bucket', 'cfdi.pdf', CacheControl='no-cache').write(b'%PDF')
+    assert client.objects == {
+        ('bucket', 'cfdi.pdf'): {
+            'Body': b'%PDF',
+            'ContentType': 'application/pdf',
+            'CacheControl': 'no-cache',
+        },
+    }
@@ -0,0 +1,67 @@
+from pathlib import Path
+
+import pytest
+from lxml import etree
+from pydantic import ValidationError
+
+from cfdi import parse_cfdi
+from cfdi.corpus import enlarge, iter_corpus
+from cfdi.trusted import construct
+from cfdi.v40 import CFDI40
+
+
+@pytest.mark.parametrize(
+    'sample',
+    [
+        'base.xml',
+        'uber.xml',
+    ],
+)
+@pytest.mark.parametrize(
+    'times',
+    [
+        0,
+        50,
+    ],
+)
+def test_construct_parity(
+    sample,
+    times,
+):
+    tree = enlarge(Path(f'tests/samples/v40/{sample}').read_bytes(), times=times)
+
+    validated = CFDI40.from_xml_tree(tree)
+    trusted = construct(CFDI40, tree)
+
+    assert trusted == validated
+    assert trusted.model_dump(exclude_unset=True) == validated.model_dump(
+        exclude_unset=True
+    )
+    assert trusted.to_xml() == validated.to_xml()
+
+
+def test_construct_parity_corpus():
+    for xml in iter_corpus(1000, seed=11, conceptos=(1, 10)):
+        tree = etree.fromstring(xml)
+        assert construct(CFDI40, tree) == CFDI40.from_xml_tree(tree)
+
+
+def test_parse_cfdi_trusted():
+    # stamped, built without validation
+    uber = Path('tests/samples/v40/uber.xml')
+    assert parse_cfdi(uber, trusted=True) == parse_cfdi(uber)
+
+    # not stamped, still validated
+    base = Path('tests/samples/v40/base.xml')
+    cfdi = parse_cfdi(base, trusted=True)
+    assert cfdi == parse_cfdi(base)
+
+    # stamped, catalog keys outside of the enums are rejected as without trusted
+    signed = Path('tests/samples/v40/signed-tfd.xml')
+    with pytest.raises(ValueError, match='Invalid TipoRelacion: 09'):
+        construct(CFDI40, etree.fromstring(signed.read_bytes()))
+    with pytest.raises(ValidationError) as validated:
+        parse_cfdi(signed)
+    with pytest.raises(ValidationError) as trusted:
+        parse_cfdi(signed, trusted=True)
+    assert trusted.value.errors() == validated.value.errors()
@@ -0,0 +1,112 @@
+from pathlib import Path
+from zipfile import ZIP_DEFLATED, ZipFile
+
+from lxml import etree
+
+from cfdi import (
+    CFDIHeader,
+    ParseError,
+    TaskError,
+    parse_cfdi,
+    parse_many,
+    parse_zip,
+    scan_cfdi,
+)
+from cfdi.utils import get_cfdi_version
+from cfdi.v40 import CFDI40
+
+
+def test_parse_cfdi():
+    xml = Path('tests/samples/v40/uber.xml').read_bytes()
+    assert get_cfdi_version(xml) == '4.0'
+
+    cfdi = parse_cfdi(xml)
+    assert isinstance(cfdi, CFDI40)
+    assert cfdi == CFDI40.from_xml(xml)
+
+
+def test_parse_cfdi_invalid():
+    assert parse_cfdi(b'<invalid') is None
+    assert parse_cfdi(b'<Comprobante Version="4.0"/>') is None
+    assert (
+        parse_cfdi(
+            b'<cfdi:Comprobante xmlns:cfdi="http://www.sat.gob.mx/cfd/3" Version="3.3"/>'
+        )
+        is None
+    )
+
+
+def test_parse_many():
+    paths = [
+        Path('tests/samples/v40/base.xml'),
+        Path('tests/samples/v40/min.xml'),
+        Path('tests/samples/v40/uber.xml'),
+    ]
+    xmls = [paths[0], paths[1].read_bytes(), paths[2], b'<invalid']
+
+    for workers in (1, 2):
+        results = list(parse_many(xmls, workers=workers))
+        assert [index for index, _ in results] == [0, 1, 2, 3]
+        assert results[0][1] == parse_cfdi(paths[0])
+        assert isinstance(results[1][1], ParseError)
+        assert results[1][1].errors
+        assert results[2][1] == parse_cfdi(paths[2])
+        assert results[3][1] is None
+
+    results = dict(parse_many(xmls, workers=2, chunksize=2, ordered=False))
+    assert sorted(results) == [0, 1, 2, 3]
+    assert isinstance(results[1], ParseError)
+    # the error of every batch helper, under the name parse_many has always used
+    assert ParseError is TaskError
+
+
+def test_parse_zip(tmp_path):
+    package = tmp_path / 'package.zip'
+    with ZipFile(package, 'w', compression=ZIP_DEFLATED) as f:
+        f.write('tests/samples/v40/base.xml', 'base.xml')
+        f.write('tests/samples/v40/min.xml', 'min.xml')
+        f.writestr('README.txt', 'ignored')
+        f.write('tests/samples/v40/uber.xml', 'uber/uber.xml')
+
+    for workers in (1, 2):
+        results = list(parse_zip(package, workers=workers))
+        assert [name for name, _ in results] == ['base.xml', 'min.xml', 'uber/uber.xml']
+        assert results[0][1] == parse_cfdi(Path('tests/samples/v40/base.xml'))
+        assert isinstance(results[1][1], ParseError)
+        assert results[2][1] == parse_cfdi(Path('tests/samples/v40/uber.xml'))
+
+
+def test_scan_cfdi():
+    path = Path('tests/samples/v40/uber.xml')
+    cfdi = parse_cfdi(path)
+    assert isinstance(cfdi, CFDI40)
+    assert cfdi.complemento
+    assert cfdi.complemento.timbre_fiscal_digital
+
+    header = scan_cfdi(path)
+    assert isinstance(header, CFDIHeader)
+    assert header.version == cfdi.version
+    assert header.fecha == cfdi.fecha
+    assert header.total == cfdi.total
+    assert header.moneda == cfdi.moneda
+    assert header.tipo_de_comprobante == cfdi.tipo_de_comprobante
+    assert header.emisor_rfc == cfdi.emisor.rfc
+    assert header.receptor_rfc == cfdi.receptor.rfc
+    assert header.uuid == cfdi.complemento.timbre_fiscal_digital.uuid
+
+    # no timbre, invalid receptor still scanned
+    header = scan_cfdi(Path('tests/samples/v40/min.xml'))
+    assert header
+    assert header.uuid is None
+
+    assert scan_cfdi(b'<invalid') is None
+
+    # documents whose header can not be read are skipped as well, never raised
+    xml = path.read_bytes()
+    tree = etree.fromstring(xml)
+    receptor = tree.find('{http://www.sat.gob.mx/cfd/4}Receptor')
+    assert receptor is not None
+    tree.remove(receptor)
+    assert scan_cfdi(etree.tostring(tree)) is None
+    assert scan_cfdi(xml.replace(b'Total="', b'Total="x')) is None
+    assert scan_cfdi(xml.replace(b' Moneda="', b' Divisa="')) is None
@@ -3,6 +3,7 @@ from pathlib import Path
 from uuid import UUID
 
 from dateutil import parser
+from lxml import etree
 
 from cfdi import parse_cfdi
 from cfdi.v40 import CFDI40
@@ -210,3 +211,37 @@ def test_base():
     assert cfdi.impuestos.traslados[0].tipo_factor == 'Tasa'
     assert cfdi.impuestos.traslados[0].tasa_o_cuota == Decimal('1.600000')
     assert cfdi.impuestos.traslados[0].importe == Decimal('360000')
+
+
+def test_parte_valor_unitario():
+    # kept as the decimal it is written with, as every other amount
+    xml = (
+        Path('tests/samples/v40/base.xml')
+        .read_bytes()
+        .replace(b'ValorUnitario="1.00"', b'ValorUnitario="0.10"')
+    )
+    cfdi = parse_cfdi(xml)
+    assert isinstance(cfdi, CFDI40)
+    [parte] = cfdi.conceptos[2].parte
+    assert isinstance(parte.valor_unitario, Decimal)
+    assert parte.valor_unitario == Decimal('0.10')
+    assert b'ValorUnitario="0.10"' in parte.to_xml()
+
+
+def test_complemento_otros():
+    xml = Path('tests/samples/v40/uber.xml').read_bytes()
+    cfdi = parse_cfdi(xml)
+    assert cfdi and cfdi.complemento
+    assert cfdi.complemento.otros == []
+
+    # complementos without a model are kept as they come and written back
+    leyendas = b'<leyendasFisc:LeyendasFiscales xmlns:leyendasFisc="http://www.sat.gob.mx/leyendasFiscales" version="1.0"/>'
+    cfdi = parse_cfdi(
+        xml.replace(b'</cfdi:Complemento>', leyendas + b'</cfdi:Complemento>')
+    )
+    assert cfdi and cfdi.complemento and cfdi.complemento.timbre_fiscal_digital
+    [otro] = cfdi.complemento.otros
+    tag = '{http://www.sat.gob.mx/leyendasFiscales}LeyendasFiscales'
+    assert etree.fromstring(otro).tag == tag
+    [written] = etree.fromstring(cfdi.complemento.to_xml()).iter(tag)
+    assert written.get('version') == '1.0'
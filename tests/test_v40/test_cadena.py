@@ -0,0 +1,217 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from lxml import etree
+
+from cfdi import parse_cfdi
+from cfdi.corpus import iter_corpus
+from cfdi.v40 import CFDI40
+from cfdi.v40.cadena import (
+    COMPLEMENTOS,
+    TFD_TAG,
+    cadena_original,
+    cadena_original_from_xml,
+    get_transform,
+    register_complemento,
+    timbre_cadena_original_from_xml,
+)
+
+XSLT = etree.XSLT(etree.parse('src/cfdi/v40/xslt/cadenaoriginal_4_0.xslt'))
+
+
+def to_xml(
+    cfdi: CFDI40,
+    /,
+) -> bytes:
+    # as the document is sealed, without empty attributes for unset values
+    xml = cfdi.to_xml(exclude_none=True, encoding='UTF-8')
+    assert isinstance(xml, bytes)
+    return xml
+
+
+def get_xmls() -> list[bytes]:
+    samples = [
+        Path(f'tests/samples/v40/{name}.xml').read_bytes() for name in ('base', 'uber')
+    ]
+    return samples + list(iter_corpus(100, seed=6, conceptos=(1, 5)))
+
+
+def test_cadena_original():
+    for xml in get_xmls():
+        tree = etree.fromstring(xml)
+        cadena = str(XSLT(tree))
+        assert cadena_original_from_xml(tree) == cadena
+        assert cadena_original_from_xml(xml) == cadena
+
+
+def test_cadena_original_model():
+    for xml in get_xmls():
+        cfdi = parse_cfdi(xml)
+        assert isinstance(cfdi, CFDI40)
+        trusted = parse_cfdi(xml, trusted=True)
+        assert isinstance(trusted, CFDI40)
+        copy = CFDI40.model_validate(cfdi.model_dump(exclude_unset=True))
+
+        # the cadena of the model is the one of the xml it serializes to
+        cadena = str(XSLT(etree.fromstring(to_xml(cfdi))))
+        assert cfdi.cadena_original == cadena
+        assert trusted.cadena_original == cadena
+        assert copy.cadena_original == cadena
+
+    # the source documents of the corpus serialize back unchanged
+    for xml in get_xmls()[2:]:
+        cfdi = parse_cfdi(xml)
+        assert cfdi and cfdi.cadena_original == cadena_original_from_xml(xml)
+
+
+def test_cadena_original_model_zeros():
+    # explicit zero amounts are written back
+    xml = Path('tests/samples/v40/base.xml').read_bytes()
+    cfdi = parse_cfdi(xml)
+    assert cfdi and cfdi.descuento == 0
+    assert b'Descuento="0.00"' in to_xml(cfdi)
+    assert cfdi.cadena_original == cadena_original_from_xml(xml)
+
+    # and left out when they were never set
+    copy = CFDI40.model_validate(
+        cfdi.model_dump(exclude={'descuento'}, exclude_unset=True)
+    )
+    assert etree.fromstring(to_xml(copy)).get('Descuento') is None
+
+
+def test_cadena_original_uber():
+    cadena = cadena_original_from_xml(Path('tests/samples/v40/uber.xml'))
+    assert cadena.startswith(
+        '||4.0|EATS|2025003150001|2024-03-01T01:42:00|27|12345678901234567890|'
+    )
+    assert cadena.endswith('||')
+
+
+def test_cadena_original_whitespace():
+    tree = etree.fromstring(next(iter_corpus(1, seed=7)))
+    emisor = tree.find('{http://www.sat.gob.mx/cfd/4}Emisor')
+    assert emisor is not None
+    emisor.set('Nombre', '  ACME\t\tSERVICIOS \n SA  ')
+    cadena = cadena_original_from_xml(tree)
+    assert cadena == str(XSLT(tree))
+    assert '|ACME SERVICIOS SA|' in cadena
+
+    # a pipe inside a value is normalized on its own
+    emisor.set('Nombre', ' ACME | SA ')
+    assert cadena_original_from_xml(tree) == str(XSLT(tree))
+
+
+def test_cadena_original_required():
+    tree = etree.fromstring(next(iter_corpus(1, seed=7)))
+    del tree.attrib['Exportacion']
+    assert cadena_original_from_xml(tree) == str(XSLT(tree))
+
+
+def test_cadena_original_complemento():
+    tree = etree.fromstring(next(iter_corpus(1, seed=7)))
+    complemento = tree.find('{http://www.sat.gob.mx/cfd/4}Complemento')
+    assert complemento is not None
+    leyenda = etree.SubElement(
+        complemento, '{http://www.sat.gob.mx/leyendasFiscales}LeyendasFiscales'
+    )
+    leyenda.set('version', '1.0')
+    xml = etree.tostring(tree)
+
+    # the model keeps the complement and serializes it back
+    cfdis = [parse_cfdi(xml), parse_cfdi(xml, trusted=True)]
+    for cfdi in cfdis:
+        assert cfdi and cfdi.complemento and cfdi.complemento.timbre_fiscal_digital
+        [otro] = cfdi.complemento.otros
+        assert etree.fromstring(otro).get('version') == '1.0'
+        assert etree.fromstring(to_xml(cfdi)).find(f'.//{leyenda.tag}') is not None
+
+    with pytest.raises(ValueError, match='Unsupported complemento'):
+        cadena_original_from_xml(tree)
+    # the bundled stylesheet has no templates for it
+    with pytest.raises(ValueError, match='Unsupported complemento'):
+        cadena_original(tree, engine='xslt')
+    for cfdi in cfdis:
+        with pytest.raises(ValueError, match='Unsupported complemento'):
+            assert cfdi.cadena_original
+
+    def add_leyendas(
+        parts: list[str],
+        element: etree._Element,
+        /,
+    ) -> None:
+        parts.append(element.get('version', ''))
+
+    register_complemento(leyenda.tag, add_leyendas)  # type: ignore[arg-type]
+    try:
+        assert cadena_original_from_xml(tree).endswith('|1.0||')
+        with pytest.raises(ValueError, match='Unsupported complemento'):
+            cadena_original(tree, engine='xslt')
+        for cfdi in cfdis:
+            assert cfdi.cadena_original == cadena_original_from_xml(tree)
+    finally:
+        del COMPLEMENTOS[leyenda.tag]  # type: ignore[arg-type]
+
+
+def test_cadena_original_invalid():
+    with pytest.raises(ValueError, match='Invalid comprobante'):
+        cadena_original_from_xml(b'<Comprobante/>')
+
+
+def test_cadena_original_engine():
+    xmls = get_xmls()
+    cadenas = [cadena_original(xml) for xml in xmls]
+    assert [cadena_original(xml, engine='xslt') for xml in xmls] == cadenas
+
+    with ThreadPoolExecutor(4) as executor:
+        assert (
+            list(executor.map(lambda xml: cadena_original(xml, engine='xslt'), xmls))
+            == cadenas
+        )
+
+    with pytest.raises(ValueError, match='Invalid engine'):
+        cadena_original(xmls[0], engine='saxon')  # type: ignore[arg-type]
+
+
+def test_get_transform():
+    transform = get_transform()
+    assert get_transform() is transform
+    with ThreadPoolExecutor(1) as executor:
+        assert executor.submit(get_transform).result() is not transform
+
+
+def test_timbre_cadena_original():
+    transform = get_transform('cadenaoriginal_TFD_1_1.xslt')
+    # base is not stamped
+    for xml in get_xmls()[1:]:
+        tfd = next(etree.fromstring(xml).iter(TFD_TAG))
+        cadena = str(transform(etree.fromstring(etree.tostring(tfd))))
+        assert timbre_cadena_original_from_xml(tfd) == cadena
+
+        cfdi = parse_cfdi(xml)
+        assert cfdi and cfdi.complemento and cfdi.complemento.timbre_fiscal_digital
+        assert cfdi.complemento.timbre_fiscal_digital.cadena_original == cadena
+
+    cfdi = parse_cfdi(Path('tests/samples/v40/uber.xml'))
+    assert cfdi and cfdi.complemento and cfdi.complemento.timbre_fiscal_digital
+    tfd = cfdi.complemento.timbre_fiscal_digital
+    assert tfd.cadena_original == (
+        f'||1.1|B5471F7B-1BB9-4928-A17F-D4C3A1A07E9D|2024-03-01T01:42:00|AAA010101AAA|{tfd.sello_cfd}'
+        '|20001000000300012345||'
+    )
+    tfd.leyenda = '  Leyenda   del SAT '
+    assert '|AAA010101AAA|Leyenda del SAT|' in tfd.cadena_original
+
+
+def test_cadena_original_xslt_complemento_concepto():
+    tree = etree.fromstring(next(iter_corpus(1, seed=7)))
+    concepto = tree.find('.//{http://www.sat.gob.mx/cfd/4}Concepto')
+    assert concepto is not None
+    complemento = etree.SubElement(
+        concepto, '{http://www.sat.gob.mx/cfd/4}ComplementoConcepto'
+    )
+    etree.SubElement(
+        complemento, '{http://www.sat.gob.mx/iedu}instEducativas', version='1.0'
+    )
+    with pytest.raises(ValueError, match='Unsupported complemento'):
+        cadena_original(tree, engine='xslt')
@@ -1,4 +1,5 @@
 import importlib
+from enum import StrEnum
 
 import pytest
 
@@ -29,3 +30,13 @@ def test_import_catalogos(
 ):
     """Verifica que los módulos de catálogo puedan importarse sin errores."""
     importlib.import_module(module_name)
+
+
+def test_lazy_catalogos():
+    """Verifica que los catálogos se carguen al accederlos desde el paquete."""
+    from cfdi.v40 import catalogos
+
+    for name in catalogos.__all__:
+        assert issubclass(getattr(catalogos, name), StrEnum)
+    with pytest.raises(AttributeError):
+        catalogos.NoExiste  # noqa: B018
@@ -0,0 +1,200 @@
+import sqlite3
+
+import pytest
+
+from cfdi.v40.descriptions import (
+    CachedDescriptionProvider,
+    CacheInfo,
+    DynamoDBDescriptionProvider,
+    MappingDescriptionProvider,
+    SQLiteDescriptionProvider,
+)
+
+
+@pytest.fixture
+def catalogos_file(tmp_path):
+    path = tmp_path / 'catalogos.sqlite3'
+    connection = sqlite3.connect(path)
+    with connection:
+        connection.execute(
+            'CREATE TABLE catalogos ('
+            'pk TEXT NOT NULL, '
+            'sk TEXT NOT NULL, '
+            'name TEXT NOT NULL, '
+            'PRIMARY KEY (pk, sk)'
+            ') WITHOUT ROWID'
+        )
+        connection.executemany(
+            'INSERT INTO catalogos (pk, sk, name) VALUES (?, ?, ?)',
+            [
+                ('REGIMEN_FISCAL', '601', 'General de Ley Personas Morales'),
+                ('USO_CFDI', 'G03', 'Gastos en general.'),
+                ('IMPUESTO', '002', 'IVA'),
+            ],
+        )
+    connection.close()
+    return path
+
+
+def test_sqlite_provider(
+    catalogos_file,
+):
+    provider = SQLiteDescriptionProvider(catalogos_file)
+    assert (
+        provider.get_description('601', 'REGIMEN_FISCAL')
+        == 'General de Ley Personas Morales'
+    )
+    assert provider.get_description('G03', 'USO_CFDI') == 'Gastos en general.'
+    assert provider.get_description('002', 'IMPUESTO') == 'IVA'
+    with pytest.raises(KeyError):
+        provider.get_description('002', 'REGIMEN_FISCAL')
+
+
+def test_sqlite_provider_missing_file(
+    tmp_path,
+):
+    with pytest.raises(FileNotFoundError):
+        SQLiteDescriptionProvider(tmp_path / 'missing.sqlite3')
+
+
+def test_mapping_provider():
+    provider = MappingDescriptionProvider({('IMPUESTO', '002'): 'IVA'})
+    assert provider.get_description('002', 'IMPUESTO') == 'IVA'
+    with pytest.raises(KeyError):
+        provider.get_description('001', 'IMPUESTO')
+
+
+class Client:
+    """
+    Stub of the DynamoDB client, leaves the last key of a request unprocessed `throttled` times.
+    """
+
+    def __init__(
+        self,
+        items: dict[tuple[str, str], str],
+        /,
+        *,
+        throttled: int = 0,
+    ) -> None:
+        self.items = items
+        self.throttled = throttled
+        self.requests: list[int] = []
+
+    def batch_get_item(
+        self,
+        *,
+        RequestItems,
+    ):
+        [(name, request)] = RequestItems.items()
+        keys = request['Keys']
+        assert len(keys) <= 100
+        self.requests.append(len(keys))
+        unprocessed = []
+        if self.throttled:
+            self.throttled -= 1
+            *keys, last = keys
+            unprocessed.append(last)
+        responses = [
+            {'pk': key['pk'], 'sk': key['sk'], 'name': self.items[key['pk'], key['sk']]}
+            for key in keys
+            if (key['pk'], key['sk']) in self.items
+        ]
+        return {
+            'Responses': {name: responses},
+            'UnprocessedKeys': {name: {'Keys': unprocessed}} if unprocessed else {},
+        }
+
+
+class Meta:
+    def __init__(
+        self,
+        client: Client,
+        /,
+    ) -> None:
+        self.client = client
+
+
+class Table:
+    name = 'catalogos'
+
+    def __init__(
+        self,
+        client: Client,
+        /,
+    ) -> None:
+        self.meta = Meta(client)
+
+
+def test_dynamodb_provider_get_descriptions():
+    items = {
+        ('CLAVE_PROD_SERV', f'{index:08}'): f'Producto {index}' for index in range(250)
+    }
+    client = Client(items, throttled=2)
+    provider = DynamoDBDescriptionProvider(Table(client), max_delay=0)  # type: ignore[arg-type]
+
+    keys = [*items, ('CLAVE_PROD_SERV', 'missing'), *items]
+    assert provider.get_descriptions(keys) == items
+    # duplicates are requested once, in chunks of 100 keys, the unprocessed key again on its own
+    assert client.requests == [100, 1, 1, 100, 51]
+
+    client = Client(items, throttled=10)
+    provider = DynamoDBDescriptionProvider(Table(client), max_attempts=3, max_delay=0)  # type: ignore[arg-type]
+    with pytest.raises(RuntimeError, match='Unprocessed keys after 3 attempts'):
+        provider.get_descriptions(items)
+    assert client.requests == [100, 1, 1]
+
+
+class Clock:
+    def __init__(
+        self,
+    ) -> None:
+        self.now = 0.0
+
+    def __call__(
+        self,
+    ) -> float:
+        return self.now
+
+
+def test_cached_provider():
+    clock = Clock()
+    backend = MappingDescriptionProvider(
+        {
+            ('IMPUESTO', '002'): 'IVA',
+            ('USO_CFDI', 'G03'): 'Gastos en general.',
+            ('REGIMEN_FISCAL', '601'): 'General de Ley Personas Morales',
+        }
+    )
+    provider = CachedDescriptionProvider(backend, maxsize=2, ttl=60, clock=clock)
+
+    assert provider.get_description('002', 'IMPUESTO') == 'IVA'
+    assert provider.get_description('002', 'IMPUESTO') == 'IVA'
+    assert provider.cache_info() == CacheInfo(
+        hits=1, misses=1, evictions=0, size=1, maxsize=2
+    )
+
+    # the least recently used entry is evicted
+    assert provider.get_descriptions(
+        [('USO_CFDI', 'G03'), ('REGIMEN_FISCAL', '601')]
+    ) == {
+        ('USO_CFDI', 'G03'): 'Gastos en general.',
+        ('REGIMEN_FISCAL', '601'): 'General de Ley Personas Morales',
+    }
+    assert provider.cache_info() == CacheInfo(
+        hits=1, misses=3, evictions=1, size=2, maxsize=2
+    )
+
+    # entries expire after the ttl
+    clock.now = 61
+    assert provider.get_description('G03', 'USO_CFDI') == 'Gastos en general.'
+    assert provider.cache_info().misses == 4
+
+    # missing keys are not cached
+    with pytest.raises(KeyError):
+        provider.get_description('001', 'IMPUESTO')
+    assert provider.get_descriptions([('IMPUESTO', '001')]) == {}
+
+    provider.cache_clear()
+    assert provider.cache_info() == CacheInfo(
+        hits=0, misses=0, evictions=0, size=0, maxsize=2
+    )
@@ -0,0 +1,185 @@
+from functools import partial
+from io import BytesIO
+from pathlib import Path
+
+from PIL import Image
+
+from cfdi import TaskError, parse_cfdi
+from cfdi.corpus import enlarge
+from cfdi.sinks import BufferSink
+from cfdi.trusted import construct
+from cfdi.v40 import CFDI40
+from cfdi.v40.descriptions import CacheInfo, Catalogo, Key, MappingDescriptionProvider
+from cfdi.v40.pdf import (
+    LogoRegistry,
+    generate_pdf,
+    get_catalog_keys,
+    render_pdfs,
+    render_statement,
+    worker_provider,
+)
+
+
+class Provider:
+    """
+    Describes every key and records the bulk lookups.
+    """
+
+    def __init__(
+        self,
+    ) -> None:
+        self.calls: list[list[Key]] = []
+
+    def get_description(
+        self,
+        value: str,
+        catalogo: Catalogo,
+        /,
+    ) -> str:
+        raise AssertionError('unexpected single lookup')
+
+    def get_descriptions(
+        self,
+        keys,
+        /,
+    ) -> dict[Key, str]:
+        keys = list(keys)
+        self.calls.append(keys)
+        return {key: f'{key[0]} {key[1]}' for key in keys}
+
+
+def test_save_pdf(
+    tmp_path,
+):
+    cfdi = parse_cfdi(Path('tests/samples/v40/uber.xml'))
+    assert isinstance(cfdi, CFDI40)
+
+    provider = Provider()
+    output = tmp_path / 'cfdi.pdf'
+    cfdi.save_pdf(str(output), provider=provider)
+    pdf = output.read_bytes()
+    assert pdf.startswith(b'%PDF')
+    # the qr is drawn as vectors, not as an image
+    assert b'/Subtype /Image' not in pdf
+
+    # a single bulk lookup, without duplicated keys
+    [keys] = provider.calls
+    assert len(keys) == len(set(keys))
+    assert ('USO_CFDI', 'G03') in keys
+    assert ('IMPUESTO', '002') in keys
+
+
+def test_render_pdf():
+    cfdi = parse_cfdi(Path('tests/samples/v40/uber.xml'))
+    assert isinstance(cfdi, CFDI40)
+    provider = MappingDescriptionProvider(
+        {key: f'{key[0]} {key[1]}' for key in get_catalog_keys(cfdi)},
+    )
+
+    pdf = cfdi.render_pdf(provider=provider)
+    assert pdf.startswith(b'%PDF')
+
+    # sinks receive the document in a single write
+    sink = BufferSink()
+    cfdi.save_pdf(sink, provider=provider)
+    assert sink.data.startswith(b'%PDF')
+    assert len(sink.data) == len(pdf)
+
+
+def test_render_pdfs(
+    tmp_path,
+):
+    cfdi = parse_cfdi(Path('tests/samples/v40/uber.xml'))
+    assert isinstance(cfdi, CFDI40)
+    provider = partial(
+        MappingDescriptionProvider,
+        {key: f'{key[0]} {key[1]}' for key in get_catalog_keys(cfdi)},
+    )
+    outputs = [tmp_path / f'{i}.pdf' for i in range(3)]
+
+    for workers in (1, 2):
+        results = list(
+            render_pdfs([cfdi] * 3, outputs, workers=workers, provider=provider)
+        )
+        assert results == [(0, None), (1, None), (2, None)]
+        for output in outputs:
+            assert output.read_bytes().startswith(b'%PDF')
+    # the worker state is not left behind when rendering inline
+    assert worker_provider.get(None) is None
+
+    # missing descriptions are returned as errors
+    results = list(
+        render_pdfs(
+            [cfdi],
+            [tmp_path / 'error.pdf'],
+            workers=1,
+            provider=partial(MappingDescriptionProvider, {}),
+        )
+    )
+    [(index, error)] = results
+    assert index == 0
+    assert isinstance(error, TaskError)
+    assert str(error).startswith('KeyError: ')
+
+
+def test_generate_pdf_pages(
+    tmp_path,
+):
+    xml = Path('tests/samples/v40/uber.xml').read_bytes()
+    output = tmp_path / 'cfdi.pdf'
+
+    for times, pages in ((0, 1), (200, 13)):
+        cfdi = construct(CFDI40, enlarge(xml, times=times))
+        provider = MappingDescriptionProvider(
+            {key: f'{key[0]} {key[1]}' for key in get_catalog_keys(cfdi)},
+        )
+        generate_pdf(cfdi, str(output), provider=provider)
+        assert output.read_bytes().count(b'/Type /Page\n') == pages
+
+
+def test_render_statement():
+    xml = Path('tests/samples/v40/uber.xml').read_bytes()
+    cfdis = [construct(CFDI40, enlarge(xml, times=times)) for times in (0, 20, 0)]
+    provider = MappingDescriptionProvider(
+        {key: f'{key[0]} {key[1]}' for cfdi in cfdis for key in get_catalog_keys(cfdi)},
+    )
+    logo = BytesIO()
+    Image.new('RGB', (8, 8), 'red').save(logo, 'PNG')
+    logo.seek(0)
+
+    sink = BufferSink()
+    assert render_statement(iter(cfdis), sink, logo=logo, provider=provider) == 3
+    pdf = sink.data
+    assert pdf.count(b'/Type /Page\n') == 4
+    # the logo and the static forms are stored once
+    assert pdf.count(b'/Subtype /Image') == 1
+    assert pdf.count(b'/Subtype /Form') == 5
+    assert pdf.count(b'/Type /Outlines') == 1
+
+
+def test_logo_registry(
+    tmp_path,
+):
+    logos = LogoRegistry(maxsize=2)
+    red = BytesIO()
+    Image.new('RGB', (8, 8), 'red').save(red, 'PNG')
+    blue = tmp_path / 'blue.png'
+    Image.new('RGB', (8, 8), 'blue').save(blue)
+
+    # same content, same logo
+    logo = logos.get(red.getvalue())
+    assert logos.get(BytesIO(red.getvalue())) is logo
+    assert logo.image.getSize() == (8, 8)
+
+    # files are keyed by path
+    assert logos.get(blue) is logos.get(str(blue))
+    assert logos.cache_info() == CacheInfo(
+        hits=2, misses=2, evictions=0, size=2, maxsize=2
+    )
+
+    # the least recently used logo is evicted
+    green = BytesIO()
+    Image.new('RGB', (8, 8), 'green').save(green, 'PNG')
+    logos.get(green.getvalue())
+    assert logos.cache_info().evictions == 1
+    assert logos.get(red.getvalue()) is not logo
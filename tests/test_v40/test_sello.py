@@ -0,0 +1,392 @@
+import pickle
+from base64 import b64decode
+from collections.abc import Iterator
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import padding, rsa
+from cryptography.x509.oid import NameOID
+from lxml import etree
+
+from cfdi import parse_cfdi
+from cfdi.corpus import iter_corpus
+from cfdi.pool import TaskError
+from cfdi.v40 import CFDI40
+from cfdi.v40.cadena import (
+    TFD_TAG,
+    cadena_original_from_xml,
+    timbre_cadena_original_from_xml,
+)
+from cfdi.v40.sello import (
+    CSD,
+    CertificadoSATStore,
+    certificados,
+    csds,
+    sign_cfdi,
+    sign_many,
+    verify_many,
+    verify_sello,
+    verify_sello_sat,
+    verify_sello_sat_many,
+)
+
+NO_CERTIFICADO = '30001000000500003416'
+
+NO_CERTIFICADO_SAT = '00001000000505142236'
+
+PASSWORD = '12345678a'
+
+
+def generate_csd(
+    no_certificado: str,
+    /,
+) -> tuple[bytes, bytes]:
+    """
+    A self-signed certificate shaped as the ones of the SAT and its encrypted private key, as `.key` and `.cer`.
+    """
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name(
+        [x509.NameAttribute(NameOID.COMMON_NAME, 'ESCUELA KEMPER URGATE SA DE CV')]
+    )
+    now = datetime.now()
+    certificate = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(private_key.public_key())
+        .serial_number(int.from_bytes(no_certificado.encode()))
+        .not_valid_before(now - timedelta(days=1))
+        .not_valid_after(now + timedelta(days=365))
+        .sign(private_key, hashes.SHA256())
+    )
+    key = private_key.private_bytes(
+        serialization.Encoding.DER,
+        serialization.PrivateFormat.PKCS8,
+        serialization.BestAvailableEncryption(PASSWORD.encode()),
+    )
+    return key, certificate.public_bytes(serialization.Encoding.DER)
+
+
+@pytest.fixture(scope='module')
+def files(tmp_path_factory: pytest.TempPathFactory) -> tuple[Path, Path]:
+    directory = tmp_path_factory.mktemp('csd')
+    key, cer = generate_csd(NO_CERTIFICADO)
+    (directory / 'csd.key').write_bytes(key)
+    (directory / 'csd.cer').write_bytes(cer)
+    return directory / 'csd.key', directory / 'csd.cer'
+
+
+@pytest.fixture
+def csd(files: tuple[Path, Path]) -> Iterator[CSD]:
+    yield csds.load(*files, password=PASSWORD)
+    csds.clear()
+
+
+def to_xml(
+    cfdi: CFDI40,
+    /,
+) -> bytes:
+    # as the document is sealed, without empty attributes for unset values
+    xml = cfdi.to_xml(exclude_none=True, encoding='UTF-8')
+    assert isinstance(xml, bytes)
+    return xml
+
+
+def get_cfdis(
+    documents: int,
+    /,
+) -> list[CFDI40]:
+    cfdis = [
+        parse_cfdi(xml) for xml in iter_corpus(documents, seed=8, conceptos=(1, 3))
+    ]
+    assert all(isinstance(cfdi, CFDI40) for cfdi in cfdis)
+    return cfdis  # type: ignore[return-value]
+
+
+def sign_xml(
+    csd: CSD,
+    xml: bytes,
+    /,
+) -> bytes:
+    tree = etree.fromstring(xml)
+    tree.set('NoCertificado', csd.no_certificado)
+    tree.set('Certificado', csd.certificado)
+    tree.set('Sello', csd.sign(cadena_original_from_xml(tree)))
+    return etree.tostring(tree, encoding='UTF-8')
+
+
+def stamp_xml(
+    csd: CSD,
+    sat: CSD,
+    xml: bytes,
+    /,
+) -> bytes:
+    tree = etree.fromstring(sign_xml(csd, xml))
+    tfd = next(tree.iter(TFD_TAG))
+    tfd.set('SelloCFD', tree.get('Sello', ''))
+    tfd.set('NoCertificadoSAT', sat.no_certificado)
+    tfd.set('SelloSAT', sat.sign(timbre_cadena_original_from_xml(tfd)))
+    return etree.tostring(tree)
+
+
+def verify(
+    csd: CSD,
+    cfdi: CFDI40,
+    /,
+) -> None:
+    # checked over the document as written, not over the model
+    tree = etree.fromstring(to_xml(cfdi))
+    certificate = x509.load_der_x509_certificate(b64decode(tree.get('Certificado', '')))
+    public_key = certificate.public_key()
+    assert isinstance(public_key, rsa.RSAPublicKey)
+    public_key.verify(
+        b64decode(tree.get('Sello', '')),
+        cadena_original_from_xml(tree).encode(),
+        padding.PKCS1v15(),
+        hashes.SHA256(),
+    )
+    assert tree.get('NoCertificado') == csd.no_certificado
+
+
+def test_csd(files: tuple[Path, Path]):
+    csd = CSD.load(*files, password=PASSWORD)
+    assert csd.no_certificado == NO_CERTIFICADO
+    assert b64decode(csd.certificado) == files[1].read_bytes()
+
+    assert csd.files == (
+        files[0].read_bytes(),
+        files[1].read_bytes(),
+        PASSWORD.encode(),
+    )
+    # the decrypted key is never written out
+    with pytest.raises(TypeError, match='can not be pickled'):
+        pickle.dumps(csd)
+
+    with pytest.raises(ValueError):
+        CSD.load(files[0], files[1], password='incorrecto')
+
+    other, _ = generate_csd(NO_CERTIFICADO)
+    with pytest.raises(ValueError, match='does not belong'):
+        CSD.load(other, files[1], password=PASSWORD)
+
+
+def test_csd_store(csd: CSD, files: tuple[Path, Path]):
+    assert csds.get(NO_CERTIFICADO) is csd
+    # the key of a loaded certificate is not read again
+    assert csds.load(files[0].with_name('missing.key'), files[1], password='') is csd
+    with pytest.raises(KeyError, match='Unknown certificado'):
+        csds.get('30001000000500000000')
+
+
+def test_sign_cfdi(csd: CSD):
+    cfdis = get_cfdis(5)
+    for cfdi in cfdis:
+        cadena_original = cfdi.cadena_original
+        sign_cfdi(cfdi, csd)
+        verify(csd, cfdi)
+        # the número de certificado is part of the cadena original
+        assert cfdi.cadena_original != cadena_original
+
+    # sealed with the CSD of its número de certificado
+    [cfdi] = get_cfdis(1)
+    cfdi.no_certificado = NO_CERTIFICADO
+    cfdi.sign()
+    verify(csd, cfdi)
+
+
+def test_sign_cfdi_to_xml(csd: CSD):
+    certificados.cache_clear()
+    samples = [Path(f'tests/samples/v40/{name}.xml') for name in ('base', 'uber')]
+    cfdis = [parse_cfdi(sample) for sample in samples] + get_cfdis(10)
+    for cfdi in cfdis:
+        assert isinstance(cfdi, CFDI40)
+        sign_cfdi(cfdi, csd)
+        xml = to_xml(cfdi)
+        assert verify_sello(xml)
+        assert verify_sello(cfdi)
+
+        # a copy serializes to the same document
+        copy = CFDI40.model_validate(cfdi.model_dump(exclude_unset=True))
+        assert to_xml(copy) == xml
+        assert verify_sello(copy)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_sign_many(files: tuple[Path, Path], workers: int):
+    csd = CSD.load(*files, password=PASSWORD)
+    cfdis = get_cfdis(6)
+    sellos = [cfdi.sello for cfdi in cfdis]
+    results = list(sign_many(cfdis, csd=csd, workers=workers, chunksize=2))
+    # the CSD is only loaded by the workers
+    assert csds.values() == []
+    assert [index for index, _ in results] == list(range(6))
+    for (_, result), cfdi in zip(results, get_cfdis(6)):
+        assert isinstance(result, CFDI40)
+        verify(csd, result)
+        assert result.sello == sign_cfdi(cfdi, csd).sello
+    # sealed copies, whatever the number of workers
+    assert [cfdi.sello for cfdi in cfdis] == sellos
+
+    # by número de certificado, unknown ones are returned as errors
+    csds.add(csd)
+    cfdis = get_cfdis(2)
+    cfdis[0].no_certificado = NO_CERTIFICADO
+    [(_, signed), (_, error)] = sign_many(cfdis, workers=workers)
+    assert isinstance(signed, CFDI40)
+    verify(csd, signed)
+    assert isinstance(error, TaskError)
+    assert str(error).startswith('KeyError: ')
+    csds.clear()
+
+
+def test_sign_many_files(csd: CSD, sat: tuple[CSD, Path]):
+    sat_csd, _ = sat
+    [cfdi] = get_cfdis(1)
+    cfdi.no_certificado = NO_CERTIFICADO
+    # only the CSDs of the documents are sent, a CSD without its files is not needed
+    csds.add(CSD(sat_csd.private_key, sat_csd.certificate))
+    [(_, signed)] = sign_many([cfdi], workers=1)
+    assert isinstance(signed, CFDI40)
+    verify(csd, signed)
+
+    with pytest.raises(ValueError, match='was not loaded from its files'):
+        sign_many([cfdi], csd=CSD(csd.private_key, csd.certificate), workers=1)
+
+
+def test_verify_sello(csd: CSD, tmp_path: Path):
+    certificados.cache_clear()
+    xmls = [sign_xml(csd, xml) for xml in iter_corpus(5, seed=9)]
+    for xml in xmls:
+        assert verify_sello(xml)
+        cfdi = parse_cfdi(xml)
+        assert isinstance(cfdi, CFDI40)
+        assert verify_sello(cfdi)
+        assert cfdi.verify_sello()
+    path = tmp_path / 'cfdi.xml'
+    path.write_bytes(xmls[0])
+    assert verify_sello(path)
+    # the certificado is decoded once
+    info = certificados.cache_info()
+    assert (info.misses, info.hits, info.size) == (1, 15, 1)
+
+    tree = etree.fromstring(xmls[0])
+    tree.set('Total', '0.01')
+    assert not verify_sello(tree)
+    tree = etree.fromstring(xmls[0])
+    tree.set('Sello', 'no es base 64')
+    assert not verify_sello(tree)
+
+    # the número de certificado must be the one of the certificado
+    tree = etree.fromstring(xmls[0])
+    tree.set('NoCertificado', '30001000000500000000')
+    with pytest.raises(ValueError, match='The certificado is not'):
+        verify_sello(tree)
+    tree = etree.fromstring(xmls[0])
+    tree.set('Certificado', 'AAAA')
+    with pytest.raises(ValueError):
+        verify_sello(tree)
+
+
+def test_verify_sello_zero_descuento(csd: CSD):
+    # sealed by someone else over explicit zero descuentos
+    xml = sign_xml(csd, Path('tests/samples/v40/base.xml').read_bytes())
+    assert b'Descuento="0.00"' in xml
+    assert verify_sello(xml)
+    for cfdi in (parse_cfdi(xml), parse_cfdi(xml, trusted=True)):
+        assert isinstance(cfdi, CFDI40)
+        assert verify_sello(cfdi)
+        assert cfdi.verify_sello()
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_verify_many(csd: CSD, workers: int):
+    xmls = [sign_xml(csd, xml) for xml in iter_corpus(6, seed=10)]
+    [cfdi] = get_cfdis(1)
+    sign_cfdi(cfdi, csd)
+    tree = etree.fromstring(xmls[1])
+    tree.set('Total', '0.01')
+    tampered = etree.tostring(tree)
+    tree.set('NoCertificado', '30001000000500000000')
+    invalid = etree.tostring(tree)
+
+    results = list(
+        verify_many([*xmls, cfdi, tampered, invalid], workers=workers, chunksize=2)
+    )
+    assert [index for index, _ in results] == list(range(9))
+    assert [result for _, result in results[:8]] == [True] * 7 + [False]
+    assert isinstance(results[8][1], TaskError)
+    assert str(results[8][1]).startswith('ValueError: ')
+
+
+@pytest.fixture(scope='module')
+def sat(tmp_path_factory: pytest.TempPathFactory) -> tuple[CSD, Path]:
+    directory = tmp_path_factory.mktemp('sat')
+    key, cer = generate_csd(NO_CERTIFICADO_SAT)
+    (directory / f'{NO_CERTIFICADO_SAT}.cer').write_bytes(cer)
+    (directory / 'LEEME.txt').write_text('certificados del SAT')
+    return CSD.load(key, cer, password=PASSWORD), directory
+
+
+def test_verify_sello_sat(csd: CSD, sat: tuple[CSD, Path]):
+    sat_csd, directory = sat
+    store = CertificadoSATStore(directory)
+    xmls = [stamp_xml(csd, sat_csd, xml) for xml in iter_corpus(3, seed=11)]
+    for xml in xmls:
+        assert verify_sello_sat(xml, store=store)
+        cfdi = parse_cfdi(xml)
+        assert isinstance(cfdi, CFDI40)
+        assert verify_sello_sat(cfdi, store=store)
+        assert verify_sello(cfdi)
+
+    tree = etree.fromstring(xmls[0])
+    next(tree.iter(TFD_TAG)).set('FechaTimbrado', '2024-01-01T00:00:00')
+    assert not verify_sello_sat(tree, store=store)
+    # the timbre belongs to another comprobante
+    tree = etree.fromstring(xmls[0])
+    tree.set('Sello', etree.fromstring(xmls[1]).get('Sello', ''))
+    assert not verify_sello_sat(tree, store=store)
+
+    with pytest.raises(ValueError, match='no TimbreFiscalDigital'):
+        verify_sello_sat(Path('tests/samples/v40/base.xml').read_bytes(), store=store)
+
+
+def test_certificado_sat_store(csd: CSD, sat: tuple[CSD, Path], tmp_path: Path):
+    sat_csd, directory = sat
+    for path in directory.iterdir():
+        (tmp_path / path.name).write_bytes(path.read_bytes())
+    store = CertificadoSATStore(tmp_path)
+    assert store.get(NO_CERTIFICADO_SAT) is store.get(NO_CERTIFICADO_SAT)
+
+    # certificados added to the directory are found, whatever their name
+    other = '00001000000505142237'
+    with pytest.raises(KeyError, match='Unknown certificado SAT'):
+        store.get(other)
+    _, cer = generate_csd(other)
+    (tmp_path / 'nuevo.cer').write_bytes(cer)
+    assert isinstance(store.get(other), rsa.RSAPublicKey)
+
+    xml = stamp_xml(csd, sat_csd, next(iter_corpus(1, seed=12)))
+    tree = etree.fromstring(xml)
+    next(tree.iter(TFD_TAG)).set('NoCertificadoSAT', '00001000000505149999')
+    with pytest.raises(KeyError):
+        verify_sello_sat(tree, store=store)
+
+
+@pytest.mark.parametrize('workers', [1, 2])
+def test_verify_sello_sat_many(csd: CSD, sat: tuple[CSD, Path], workers: int):
+    sat_csd, directory = sat
+    xmls = [stamp_xml(csd, sat_csd, xml) for xml in iter_corpus(4, seed=13)]
+    tree = etree.fromstring(xmls[0])
+    next(tree.iter(TFD_TAG)).set('UUID', '00000000-0000-4000-8000-000000000000')
+    xmls.append(etree.tostring(tree))
+    xmls.append(Path('tests/samples/v40/base.xml').read_bytes())
+
+    results = list(
+        verify_sello_sat_many(xmls, directory=directory, workers=workers, chunksize=2)
+    )
+    assert [result for _, result in results[:5]] == [True] * 4 + [False]
+    assert isinstance(results[5][1], TaskError)
+    assert str(results[5][1]).startswith('ValueError: ')
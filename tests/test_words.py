@@ -0,0 +1,82 @@
+from decimal import Decimal
+
+import pytest
+
+from cfdi.words import amount_to_words, integer_to_words
+
+
+@pytest.mark.parametrize(
+    'number, words',
+    [
+        (0, 'CERO'),
+        (1, 'UNO'),
+        (16, 'DIECISÉIS'),
+        (21, 'VEINTIUNO'),
+        (31, 'TREINTA Y UNO'),
+        (100, 'CIEN'),
+        (101, 'CIENTO UNO'),
+        (1000, 'MIL'),
+        (1001, 'MIL UNO'),
+        (21000, 'VEINTIÚN MIL'),
+        (101000, 'CIENTO UN MIL'),
+        (1_000_000, 'UN MILLÓN'),
+        (21_000_000, 'VEINTIÚN MILLONES'),
+        (1_000_000_000, 'MIL MILLONES'),
+        (
+            1_234_567_890,
+            'MIL DOSCIENTOS TREINTA Y CUATRO MILLONES QUINIENTOS SESENTA Y SIETE MIL OCHOCIENTOS NOVENTA',
+        ),
+        (2_000_000_000_000, 'DOS BILLONES'),
+    ],
+)
+def test_integer_to_words(
+    number,
+    words,
+):
+    assert integer_to_words(number) == words
+
+
+def test_integer_to_words_apocope():
+    assert integer_to_words(1, apocope=True) == 'UN'
+    assert integer_to_words(21, apocope=True) == 'VEINTIÚN'
+    assert integer_to_words(31, apocope=True) == 'TREINTA Y UN'
+    assert integer_to_words(1021, apocope=True) == 'MIL VEINTIÚN'
+
+
+def test_integer_to_words_femenino():
+    assert integer_to_words(1, genero='femenino') == 'UNA'
+    assert integer_to_words(21, genero='femenino') == 'VEINTIUNA'
+    assert integer_to_words(201, genero='femenino') == 'DOSCIENTAS UNA'
+    assert (
+        integer_to_words(501_500, genero='femenino') == 'QUINIENTAS UNA MIL QUINIENTAS'
+    )
+    assert integer_to_words(200_000_000, genero='femenino') == 'DOSCIENTOS MILLONES'
+
+
+@pytest.mark.parametrize(
+    'amount, moneda, words',
+    [
+        ('152.80', 'MXN', 'CIENTO CINCUENTA Y DOS PESOS CON 80/100 MXN'),
+        ('1', 'MXN', 'UN PESO CON 00/100 MXN'),
+        ('21.5', 'MXN', 'VEINTIÚN PESOS CON 50/100 MXN'),
+        ('0.999', 'MXN', 'UN PESO CON 00/100 MXN'),
+        ('2000000', 'MXN', 'DOS MILLONES DE PESOS CON 00/100 MXN'),
+        ('10.01', 'USD', 'DIEZ DÓLARES CON 01/100 USD'),
+        ('1', 'GBP', 'UNA LIBRA ESTERLINA CON 00/100 GBP'),
+        ('201.10', 'GBP', 'DOSCIENTAS UNA LIBRAS ESTERLINAS CON 10/100 GBP'),
+        ('121000', 'GBP', 'CIENTO VEINTIUNA MIL LIBRAS ESTERLINAS CON 00/100 GBP'),
+        ('1000000', 'GBP', 'UN MILLÓN DE LIBRAS ESTERLINAS CON 00/100 GBP'),
+        ('1', 'XXX', 'UNO CON 00/100 XXX'),
+    ],
+)
+def test_amount_to_words(
+    amount,
+    moneda,
+    words,
+):
+    assert amount_to_words(Decimal(amount), moneda) == words
+
+
+def test_amount_to_words_invalid():
+    with pytest.raises(ValueError):
+        amount_to_words(Decimal('-1'))